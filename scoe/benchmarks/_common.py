@@ -0,0 +1,25 @@
+"""
+Shared helpers for the SCOE micro-benchmarks
+
+Adds the src directory to the import path and provides a simple
+repeat-and-take-best timer.
+"""
+
+import os
+import sys
+import time
+from typing import Callable
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+def best_rate(func: Callable[[], None], iterations: int, repeat: int = 5) -> float:
+    """Run func `iterations` times per round and return the best rate (calls/s)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return iterations / best if best > 0 else float('inf')
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Actuator Torque Benchmark
+
+Compares the body torque computation of the original per-object loop
+(Vector3 sums and cross products per wheel, thruster and rod) with the
+mounting matrix product per actuator class (actuators.py) as extra
+actuators are added, and checks the pseudo-inverse wheel allocation of
+each wheel layout (residual between demanded and produced body torque)
+and that a demand beyond the wheel torque limits is scaled down in the
+same direction instead of commanding more than a wheel can apply.
+
+Usage:
+    python benchmarks/bench_actuators.py [--scale 1,2,4,8] [--json results.json]
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+
+import numpy as np
+
+import _common  # noqa: F401 (import path)
+from actuators import WHEEL_LAYOUTS
+from aocs_simulation import (AOCSSimulation, EquipmentState, ReactionWheel, RWMode, Thruster, TorqueRod,
+                             Vector3)
+
+
+def build(scale: int) -> AOCSSimulation:
+    """Simulation with scale times the default actuators, all active"""
+    sim = AOCSSimulation(seed=1)
+    noise = sim.noise.stream
+    for k in range(1, scale):
+        for i in range(4):
+            n = len(sim.reaction_wheels)
+            sim.reaction_wheels.append(ReactionWheel(
+                n, state=EquipmentState.ON, mode=RWMode.OPERATE, motor_enabled=True,
+                axis=Vector3(*WHEEL_LAYOUTS['pyramid'][i]), noise=noise(f'rw{n}')))
+            n = len(sim.thrusters)
+            angle = 2 * math.pi * (i + k / scale) / 4
+            sim.thrusters.append(Thruster(
+                n, state=EquipmentState.ON, position=Vector3(math.cos(angle), math.sin(angle), 0.5),
+                direction=Vector3(-math.sin(angle), math.cos(angle), 0), noise=noise(f'thr{n}')))
+        for i in range(3):
+            axis = [0.0, 0.0, 0.0]
+            axis[i] = 1.0
+            sim.torque_rods.append(TorqueRod(len(sim.torque_rods), state=EquipmentState.ON, axis=Vector3(*axis)))
+    sim.configure_actuators()
+    for i, rw in enumerate(sim.reaction_wheels):
+        rw.commanded_torque = 0.001 * (i + 1)
+    for thr in sim.thrusters:
+        thr.firing = True
+    for rod in sim.torque_rods:
+        rod.commanded_dipole = 1e-6
+    return sim
+
+
+def loop_torque(sim: AOCSSimulation) -> Vector3:
+    """Original accumulation, one actuator object at a time"""
+    total = Vector3()
+    for rw in sim.reaction_wheels:
+        total.x += rw.get_reaction_torque() * 0.5
+        total.y += rw.get_reaction_torque() * 0.5
+    for thr in sim.thrusters:
+        _, torque = thr.get_force_torque(sim.state.com)
+        total = total + torque
+    for rod in sim.torque_rods:
+        total = total + rod.get_torque(sim.state.magnetic_field_eci)
+    return total
+
+
+def matrix_torque(sim: AOCSSimulation) -> list:
+    field = sim.state.magnetic_field_eci
+    return sim.actuators.body_torque(
+        [rw.get_reaction_torque() for rw in sim.reaction_wheels],
+        [thr.get_actual_thrust() for thr in sim.thrusters],
+        [rod.get_actual_dipole() for rod in sim.torque_rods],
+        (field.x, field.y, field.z)).tolist()
+
+
+def time_us(func, sim: AOCSSimulation, repeat: int) -> float:
+    best = math.inf
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func(sim)
+        best = min(best, (time.perf_counter() - start) / repeat * 1e6)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-object vs matrix actuator torque')
+    parser.add_argument('--scale', default='1,2,4,8', help='Comma-separated actuator multiples')
+    parser.add_argument('--repeat', type=int, default=2000, help='Evaluations per timing')
+    parser.add_argument('--json', metavar='PATH', help='Write results as JSON')
+    args = parser.parse_args()
+
+    results = {'torque': {}, 'allocation': {}}
+    print(f"{'actuators':>10} {'loop us':>8} {'matrix us':>9} {'step us':>8}")
+    for scale in [int(s) for s in args.scale.split(',')]:
+        sim = build(scale)
+        count = len(sim.reaction_wheels) + len(sim.thrusters) + len(sim.torque_rods)
+        loop = time_us(loop_torque, sim, args.repeat)
+        matrix = time_us(matrix_torque, sim, args.repeat)
+        sim.start()
+        step = time_us(lambda s: s.step(), sim, args.repeat // 4)
+        results['torque'][count] = {'loop_us': loop, 'matrix_us': matrix, 'step_us': step}
+        print(f"{count:>10} {loop:>8.1f} {matrix:>9.1f} {step:>8.1f}")
+
+    demand = np.array([0.01, -0.02, 0.005])
+    print(f"\n{'layout':>10} {'rank':>5} {'residual Nm':>12}  produced for {demand.tolist()}")
+    for layout in WHEEL_LAYOUTS:
+        sim = AOCSSimulation(seed=1, wheel_layout=layout)
+        sim.command_torque(demand)
+        produced = sim.actuators.wheels @ [rw.get_reaction_torque() for rw in sim.reaction_wheels]
+        residual = float(np.linalg.norm(produced - demand))
+        rank = int(np.linalg.matrix_rank(sim.actuators.wheels))
+        results['allocation'][layout] = {'rank': rank, 'residual': residual, 'produced': produced.tolist()}
+        print(f"{layout:>10} {rank:>5} {residual:>12.2e}  {np.round(produced, 6).tolist()}")
+
+    demand = np.array([0.0, 0.0, 1.0])
+    results['saturation'] = {}
+    print(f"\n{'layout':>10} {'max command':>12} {'limit':>6} {'off-axis Nm':>12}  produced for {demand.tolist()}")
+    for layout in WHEEL_LAYOUTS:
+        sim = AOCSSimulation(seed=1, wheel_layout=layout)
+        sim.command_torque(demand)
+        command = max(abs(rw.commanded_torque) for rw in sim.reaction_wheels)
+        limit = min(rw.max_torque for rw in sim.reaction_wheels)
+        produced = sim.actuators.wheels @ [rw.get_reaction_torque() for rw in sim.reaction_wheels]
+        off_axis = float(np.linalg.norm(np.cross(produced, demand)))
+        results['saturation'][layout] = {'max_command': command, 'limit': limit, 'off_axis': off_axis,
+                                         'produced': produced.tolist()}
+        print(f"{layout:>10} {command:>12.4f} {limit:>6.2f} {off_axis:>12.2e}  {np.round(produced, 6).tolist()}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    saturated = results['saturation'].values()
+    return 0 if all(r['max_command'] <= r['limit'] + 1e-12 and r['off_axis'] < 1e-9 for r in saturated) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Campaign Runner Benchmark
+
+Runs the same dispersed rate-damping campaign (campaign.Campaign) in
+this process and on process pools of increasing size, and reports runs
+per second and the scaling efficiency against one worker. Results of all
+pool sizes are checked to be identical to the in-process run.
+
+Usage:
+    python benchmarks/bench_campaign.py [--runs N] [--duration S] [--workers 1,2,4]
+        [--out results.npz] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+import _common  # noqa: F401 (import path)
+from campaign import Campaign, Scenario
+
+DISPERSIONS = {
+    'state.angular_rate.x': 0.01,  # rad/s
+    'state.angular_rate.y': 0.01,
+    'state.inertia.x': 5.0,  # kg m^2
+    'state.inertia.y': 5.0,
+    'rate_sensor.bias.x': 0.005,  # deg/s
+    'rate_sensor.bias.y': 0.005,
+}
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description='Process-pool campaign scaling')
+    parser.add_argument('--runs', type=int, default=16, help='Runs per campaign')
+    parser.add_argument('--duration', type=float, default=120.0, help='Simulated seconds per run')
+    parser.add_argument('--workers', default=','.join(str(1 << k) for k in range(cores.bit_length())),
+                        help='Comma-separated pool sizes (default: powers of two up to the core count)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', metavar='PATH', help='Write the campaign results (.npz or .csv)')
+    parser.add_argument('--json', metavar='PATH', help='Write benchmark results as JSON')
+    args = parser.parse_args()
+
+    campaign = Campaign.dispersed(Scenario(duration=args.duration), DISPERSIONS, args.runs, seed=args.seed)
+    print(f"{args.runs} runs of {args.duration:g} s on {cores} core(s)")
+
+    reference = campaign.run(workers=0)
+    results = {'in-process': {'runs_per_s': args.runs / reference.wall_time}}
+    print(f"{'workers':>10} {'wall s':>8} {'runs/s':>8} {'speedup':>8} {'efficiency':>10}  identical")
+    print(f"{'0':>10} {reference.wall_time:>8.2f} {args.runs / reference.wall_time:>8.2f}")
+
+    base = None
+    for workers in [int(w) for w in args.workers.split(',')]:
+        result = campaign.run(workers=workers)
+        rate = args.runs / result.wall_time
+        base = base or rate / workers
+        identical = all(np.array_equal(result.columns[name], reference.columns[name], equal_nan=True)
+                        for name in result.columns if name != 'steps_per_s')
+        r = results[str(workers)] = {'wall_time_s': result.wall_time, 'runs_per_s': rate,
+                                     'speedup': rate / base, 'efficiency': rate / base / workers,
+                                     'identical': identical}
+        print(f"{workers:>10} {result.wall_time:>8.2f} {rate:>8.2f} {r['speedup']:>8.2f} "
+              f"{r['efficiency']:>10.0%}  {identical}")
+
+    print()
+    for name, stats in reference.summary().items():
+        if stats['runs']:
+            print(f"{name:>22}: mean {stats['mean']:.4g}  p95 {stats['p95']:.4g}  max {stats['max']:.4g}")
+        else:
+            print(f"{name:>22}: no runs")
+
+    if args.out:
+        reference.save(args.out)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Simulation Checkpoint Benchmark
+
+Measures checkpoint capture and restore times and the snapshot size for
+each engine configuration, and checks that
+- restoring a checkpoint and continuing gives bit-identical telemetry to
+  the uninterrupted run,
+- a fork without a seed repeats the original continuation,
+- forks with different seeds diverge.
+
+Usage:
+    python benchmarks/bench_checkpoint.py [--steps N] [--repeat N] [--json results.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import _common  # noqa: F401 (import path)
+from aocs_simulation import AOCSSimulation
+
+CONFIGS = {
+    'object': {},
+    'numpy': {'engine': 'numpy'},
+    'rk45': {'integrator': 'rk45'},
+    'multirate': {'multirate': True},
+}
+
+
+def build(config: dict) -> AOCSSimulation:
+    sim = AOCSSimulation(seed=1, **config)
+    sim.start()
+    for i, rw in enumerate(sim.reaction_wheels):
+        rw.commanded_torque = 0.01 * (i + 1)
+    sim.thrusters[0].firing = True
+    sim.sadas[0].commanded_angle = 30.0
+    return sim
+
+
+def advance(sim: AOCSSimulation, steps: int) -> dict:
+    for _ in range(steps):
+        sim.step()
+    return sim.get_all_telemetry()
+
+
+def run(config: dict, steps: int, repeat: int) -> dict:
+    sim = build(config)
+    advance(sim, steps)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        checkpoint = sim.checkpoint()
+    capture_ms = (time.perf_counter() - start) / repeat * 1e3
+
+    reference = advance(sim, steps)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        sim.restore(checkpoint)
+    restore_ms = (time.perf_counter() - start) / repeat * 1e3
+
+    restored = advance(sim, steps)
+    sim.restore(checkpoint)
+    start = time.perf_counter()
+    forks = sim.fork([None, 2, 3])
+    fork_ms = (time.perf_counter() - start) / len(forks) * 1e3
+    same, seed2, seed3 = (advance(fork, steps) for fork in forks)
+
+    return {
+        'bytes': len(checkpoint),
+        'capture_ms': capture_ms,
+        'restore_ms': restore_ms,
+        'fork_ms': fork_ms,
+        'restore_exact': restored == reference,
+        'fork_exact': same == reference,
+        'forks_diverge': seed2 != reference and seed3 != reference and seed2 != seed3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulation checkpoint, restore and fork')
+    parser.add_argument('--steps', type=int, default=2000, help='Steps before and after the checkpoint')
+    parser.add_argument('--repeat', type=int, default=50, help='Timed captures and restores')
+    parser.add_argument('--json', metavar='PATH', help='Write results as JSON')
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'config':>10} {'bytes':>6} {'capture ms':>10} {'restore ms':>10} {'fork ms':>8}  "
+          f"restore exact  fork exact  forks diverge")
+    for label, config in CONFIGS.items():
+        r = results[label] = run(config, args.steps, args.repeat)
+        print(f"{label:>10} {r['bytes']:>6} {r['capture_ms']:>10.3f} {r['restore_ms']:>10.3f} "
+              f"{r['fork_ms']:>8.3f}  {str(r['restore_exact']):>13} {str(r['fork_exact']):>11} "
+              f"{str(r['forks_diverge']):>14}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    ok = all(r['restore_exact'] and r['fork_exact'] and r['forks_diverge'] for r in results.values())
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+CRC-16 Micro-Benchmark
+
+Compares the CRC implementations at HK report sizes and reports the
+packet rate of each engine, plus batch verification of a buffer holding
+many framed packets.
+
+Usage:
+    python benchmarks/bench_crc.py [--iterations N]
+"""
+
+import argparse
+import os
+
+from _common import best_rate
+from crc16 import crc16, crc16_bitwise, crc16_table, crc16_sliced
+from pus_protocol import PUSPacketFactory, EDENProtocol
+
+SIZES = [10, 25, 50, 100, 250, 500]
+
+ENGINES = [
+    ('bitwise', crc16_bitwise),
+    ('table', crc16_table),
+    ('sliced', crc16_sliced),
+    ('native', crc16),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CRC-16 micro-benchmark')
+    parser.add_argument('--iterations', type=int, default=2000, help='Packets per round')
+    args = parser.parse_args()
+
+    print(f"{'size':>6} " + ' '.join(f'{name + " pkt/s":>16}' for name, _ in ENGINES) + f"{'speedup':>10}")
+    for size in SIZES:
+        data = os.urandom(size)
+        rates = []
+        for _, engine in ENGINES:
+            rates.append(best_rate(lambda: engine(data), args.iterations))
+        speedup = rates[-1] / rates[0]
+        print(f'{size:>6} ' + ' '.join(f'{r:>16,.0f}' for r in rates) + f'{speedup:>9.0f}x')
+
+    # Batch verification: 256 HK-sized frames in one buffer
+    factory = PUSPacketFactory()
+    frames = b''.join(
+        EDENProtocol.wrap_packet(factory.create_tm(3, 25, os.urandom(SIZES[i % len(SIZES)])))
+        for i in range(256)
+    )
+    rate = best_rate(lambda: EDENProtocol.verify_crcs(frames), max(1, args.iterations // 100))
+    print(f'\nbatch verify: {rate * 256:,.0f} pkt/s ({len(frames)} bytes, 256 frames per call)')
+
+
+if __name__ == '__main__':
+    main()
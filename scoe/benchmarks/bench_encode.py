@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+PUS TM Encode Benchmark
+
+Compares the dataclass encode path (create_tm + EDENProtocol.wrap_packet)
+with the PUSPacketFactory template/pack_into fast path (encode_tm) for
+verification reports and housekeeping reports. The dataclass path is also
+measured with the bit-by-bit CRC it used originally.
+
+Usage:
+    python benchmarks/bench_encode.py [--iterations N]
+"""
+
+import argparse
+import os
+from unittest import mock
+
+from _common import best_rate
+from crc16 import crc16_bitwise
+from pus_protocol import PUSPacket, PUSPacketFactory, EDENProtocol
+
+CASES = [
+    ('TM[1,1]', 1, 1, b'\x00\x01'),
+    ('TM[1,7]', 1, 7, b'\x00\x01'),
+    ('TM[3,25] 30B', 3, 25, os.urandom(30)),
+    ('TM[3,25] 50B', 3, 25, os.urandom(50)),
+    ('TM[3,25] 250B', 3, 25, os.urandom(250)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PUS TM encode benchmark')
+    parser.add_argument('--iterations', type=int, default=20000, help='Packets per round')
+    args = parser.parse_args()
+
+    factory = PUSPacketFactory()
+    print(f"{'case':<14} {'bitwise crc':>14} {'dataclass':>14} {'fast path':>14} "
+          f"{'vs bitwise':>11} {'vs dataclass':>13}")
+    for name, service, subtype, data in CASES:
+        def legacy():
+            EDENProtocol.wrap_packet(factory.create_tm(service, subtype, data))
+
+        def fast():
+            factory.encode_tm(service, subtype, data)
+
+        with mock.patch.object(PUSPacket, '_calculate_crc', staticmethod(crc16_bitwise)):
+            bitwise_rate = best_rate(legacy, args.iterations // 10)
+        legacy_rate = best_rate(legacy, args.iterations)
+        fast_rate = best_rate(fast, args.iterations)
+        print(f'{name:<14} {bitwise_rate:>14,.0f} {legacy_rate:>14,.0f} {fast_rate:>14,.0f} '
+              f'{fast_rate / bitwise_rate:>10.1f}x {fast_rate / legacy_rate:>12.1f}x')
+
+
+if __name__ == '__main__':
+    main()
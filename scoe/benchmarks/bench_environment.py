@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Environment Ephemeris Benchmark
+
+Compares evaluating the orbit and environment models (environment.py)
+directly at every step with interpolating the precomputed ephemeris
+table, reports the interpolation error against direct evaluation for
+several grid spacings, the simulation step cost with and without the
+orbit, and the environment seen over the run (eclipse fraction, field
+magnitude range, density).
+
+Usage:
+    python benchmarks/bench_environment.py [--orbits F] [--json results.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+import _common  # noqa: F401 (import path)
+from aocs_simulation import AOCSSimulation
+from environment import Ephemeris, OrbitalElements, evaluate
+
+GRID_STEPS = (5.0, 10.0, 30.0, 60.0)
+
+
+def interpolation_error(elements: OrbitalElements, times: np.ndarray, step: float) -> dict:
+    ephemeris = Ephemeris(elements, horizon=times[-1], step=step)
+    start = time.perf_counter()
+    samples = [ephemeris.sample(t) for t in times.tolist()]
+    sample_us = (time.perf_counter() - start) / len(times) * 1e6
+    reference = evaluate(elements, times)
+    columns = list(zip(*samples))
+    position = np.array(columns[0])
+    field = np.array(columns[3])
+    density = np.array(columns[4])
+    eclipse = np.array(columns[5])
+    return {
+        'sample_us': sample_us,
+        'position_m': float(np.linalg.norm(position - reference['position'], axis=1).max()),
+        'field_nT': float(np.linalg.norm(field - reference['magnetic_field'], axis=1).max()),
+        'density_rel': float(np.abs(density / reference['density'] - 1).max()),
+        'eclipse_mismatches': int((eclipse != (reference['shadow'] < 0)).sum()),
+    }
+
+
+def step_cost(orbit, steps: int) -> float:
+    sim = AOCSSimulation(seed=1, orbit=orbit)
+    sim.start()
+    start = time.perf_counter()
+    sim.advance(steps)
+    return (time.perf_counter() - start) / steps * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precomputed environment ephemeris vs direct evaluation')
+    parser.add_argument('--orbits', type=float, default=2.0, help='Orbits to compare over')
+    parser.add_argument('--steps', type=int, default=8000, help='Simulation steps for the step cost')
+    parser.add_argument('--json', metavar='PATH', help='Write results as JSON')
+    args = parser.parse_args()
+
+    elements = OrbitalElements()
+    dt = 1.0 / 80.0
+    times = np.arange(0.0, args.orbits * elements.period, 37 * dt)  # off the grid points
+
+    start = time.perf_counter()
+    for t in times[:2000]:
+        evaluate(elements, [t])
+    direct_us = (time.perf_counter() - start) / 2000 * 1e6
+
+    results = {'direct_us': direct_us, 'grid': {}}
+    print(f"direct evaluation: {direct_us:.1f} us per step")
+    print(f"{'grid s':>7} {'us/step':>8} {'pos err m':>10} {'field err nT':>12} {'density rel':>11} {'eclipse':>8}")
+    for step in GRID_STEPS:
+        r = results['grid'][f'{step:g}'] = interpolation_error(elements, times, step)
+        print(f"{step:>7g} {r['sample_us']:>8.2f} {r['position_m']:>10.2e} {r['field_nT']:>12.3f} "
+              f"{r['density_rel']:>11.2e} {r['eclipse_mismatches']:>8}")
+
+    fixed, orbit = step_cost(None, args.steps), step_cost(elements, args.steps)
+    results['step_us'] = {'fixed': fixed, 'orbit': orbit}
+    print(f"\nsimulation step: {fixed:.1f} us fixed environment, {orbit:.1f} us with orbit")
+
+    table = evaluate(elements, times)
+    field = np.linalg.norm(table['magnetic_field'], axis=1)
+    results['environment'] = {
+        'period_s': elements.period,
+        'eclipse_fraction': float((table['shadow'] < 0).mean()),
+        'field_nT': [float(field.min()), float(field.max())],
+        'density': [float(table['density'].min()), float(table['density'].max())],
+    }
+    env = results['environment']
+    print(f"period {env['period_s']:.0f} s, eclipse {env['eclipse_fraction']:.1%}, "
+          f"|B| {env['field_nT'][0]:.0f}-{env['field_nT'][1]:.0f} nT, "
+          f"density {env['density'][0]:.2e}-{env['density'][1]:.2e} kg/m^3")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
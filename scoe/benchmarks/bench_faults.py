@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Fault Injection Benchmark
+
+Measures what the fault layer costs the simulation:
+- object engine steps per second with no faults, with faults scheduled
+  for later, and with equipment faults (noise, friction, stuck-open
+  thruster) active
+- telemetry refresh time with 0 to 64 active output faults (bias,
+  drift, stuck, dropout) applied as arrays, against applying the same
+  faults one at a time, and that both give the same values
+- the difference between the object and numpy engines over a run with
+  a fault schedule (the numpy engine ends its batches at fault events)
+- that every HK structure still encodes with faults injected by TC on
+  integer-typed parameters (the values saturate at their raw range)
+
+Usage:
+    python benchmarks/bench_faults.py [--steps N] [--faults 4,16,64] [--json results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import struct
+import sys
+import time
+
+import numpy as np
+
+import _common  # noqa: F401 (import path)
+from aocs_simulation import AOCSSimulation
+from faults import Fault, FaultKind
+from mock_aocs_server import MockAOCSServer
+
+OUTPUT_KINDS = (FaultKind.BIAS, FaultKind.DRIFT, FaultKind.STUCK, FaultKind.DROPOUT)
+
+
+def simulation(engine: str = 'object') -> AOCSSimulation:
+    sim = AOCSSimulation(seed=1, engine=engine)
+    sim.start()
+    for i, rw in enumerate(sim.reaction_wheels):
+        rw.commanded_torque = 0.005 * (i + 1)
+    return sim
+
+
+def steps_per_s(sim: AOCSSimulation, steps: int) -> float:
+    best = 0.0
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(steps):
+            sim.step()
+        best = max(best, steps / (time.perf_counter() - start))
+    return best
+
+
+def step_rates(steps: int) -> dict:
+    """Steps per second without faults, with a future schedule and with equipment faults"""
+    rates = {'none': steps_per_s(simulation(), steps)}
+    sim = simulation()
+    for i in range(8):
+        sim.faults.add(Fault(FaultKind.BIAS, 'magnetometer', start=1e6 + i))
+    rates['scheduled'] = steps_per_s(sim, steps)
+    sim = simulation()
+    sim.faults.add(Fault(FaultKind.NOISE, 'rate_sensor', value=5.0))
+    sim.faults.add(Fault(FaultKind.FRICTION, 'rw1', value=0.002))
+    sim.faults.add(Fault(FaultKind.STUCK_OPEN, 'thr0'))
+    rates['equipment'] = steps_per_s(sim, steps)
+    return rates
+
+
+def output_faults(sim: AOCSSimulation, count: int):
+    """count output faults over the sensor telemetry, cycling through the kinds"""
+    names = [name for name in sim.telemetry.names[:sim._telemetry_slots.stop]
+             if name.startswith(('mag_', 'gyro_', 'ss', 'rw'))]
+    for i in range(count):
+        kind = OUTPUT_KINDS[i % len(OUTPUT_KINDS)]
+        value = {FaultKind.BIAS: 1.0 + i, FaultKind.DRIFT: 0.01 * i,
+                 FaultKind.STUCK: float(i), FaultKind.DROPOUT: 1.0}[kind]
+        sim.faults.add(Fault(kind, names[i % len(names)], value=value))
+
+
+def loop_apply(sim: AOCSSimulation, values: np.ndarray):
+    """Reference: the active output faults applied one at a time (offsets, stuck, dropouts)"""
+    engine = sim.faults
+    for kinds in ((FaultKind.BIAS, FaultKind.DRIFT), (FaultKind.STUCK,), (FaultKind.DROPOUT,)):
+        for fault_id in sorted(engine.active):
+            fault = engine.faults[fault_id]
+            if fault.kind not in kinds:
+                continue
+            for slot in engine._slots[fault_id]:
+                if fault.kind == FaultKind.BIAS:
+                    values[slot] += fault.value
+                elif fault.kind == FaultKind.DRIFT:
+                    values[slot] += fault.value * (sim.time - fault.start)
+                elif fault.kind == FaultKind.STUCK:
+                    values[slot] = fault.value
+                else:
+                    values[slot] = 0.0
+
+
+def refresh_us(sim: AOCSSimulation, repeat: int) -> float:
+    """Telemetry refresh time (stopped, so every call rewrites the table)"""
+    best = math.inf
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            sim.refresh_telemetry()
+        best = min(best, (time.perf_counter() - start) / repeat * 1e6)
+    return best
+
+
+def stopped() -> AOCSSimulation:
+    """Simulation after one second, stopped, without noise on telemetry reads"""
+    sim = simulation()
+    sim.advance(80)
+    sim.stop()
+    for rw in sim.reaction_wheels:
+        rw.speed_noise_std = 0.0
+    return sim
+
+
+def output_costs(counts: list, repeat: int) -> dict:
+    results = {0: {'refresh_us': refresh_us(stopped(), repeat)}}
+    for count in counts:
+        sim = stopped()
+        output_faults(sim, count)
+        vector = refresh_us(sim, repeat)
+
+        # Same faults applied one by one, on the nominal values
+        nominal = stopped()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            values = nominal.refresh_telemetry()
+            loop_apply(sim, values)
+        loop = (time.perf_counter() - start) / repeat * 1e6
+
+        expected = nominal.refresh_telemetry().copy()
+        loop_apply(sim, expected)
+        actual = sim.refresh_telemetry()
+        slots = np.arange(sim._telemetry_slots.stop) != sim.telemetry.slot('faults_active')
+        results[count] = {'refresh_us': vector, 'loop_refresh_us': loop,
+                          'max_difference': float(np.abs(actual[:-1][slots] - expected[:-1][slots]).max())}
+    return results
+
+
+def engine_agreement(steps: int) -> float:
+    """Largest telemetry difference between the engines with a fault schedule"""
+    telemetry = []
+    for engine in ('object', 'numpy'):
+        sim = simulation(engine)
+        sim.faults.add(Fault(FaultKind.BIAS, 'magnetometer', start=0.5, duration=1.0, value=200.0))
+        sim.faults.add(Fault(FaultKind.DRIFT, 'gyro_z', start=0.3, value=0.05))
+        sim.faults.add(Fault(FaultKind.NOISE, 'rw2', start=0.7, duration=0.4, value=20.0))
+        sim.faults.add(Fault(FaultKind.FRICTION, 'rw0', start=0.25, value=0.004))
+        sim.faults.add(Fault(FaultKind.STUCK_OPEN, 'thr1', start=1.1))
+        sim.faults.add(Fault(FaultKind.STUCK, 'rw3', start=1.6))
+        sim.advance(steps)
+        telemetry.append(sim.refresh_telemetry()[sim._telemetry_slots].copy())
+    obj, vec = telemetry
+    return float(np.max(np.abs(obj - vec) / np.maximum(1.0, np.abs(obj))))
+
+
+def inject_tc(kind: FaultKind, target: str, value: float = 0.0) -> bytes:
+    """Service 8 function 0x70 data for a fault active now until cleared"""
+    name = target.encode()
+    return bytes([0x70, kind, len(name)]) + name + struct.pack('>fff', 0.0, 0.0, value)
+
+
+def hk_flow() -> dict:
+    """HK reports with faults driving integer-typed parameters out of range"""
+    server = MockAOCSServer()
+    sim = server.simulation
+    sim.start()
+    faults = [(FaultKind.BIAS, 'rw0_temperature', 1000.0), (FaultKind.BIAS, 'rw1_temperature', -1000.0),
+              (FaultKind.STUCK, 'rw2_temperature', math.nan), (FaultKind.DRIFT, 'sim_running', 1e6),
+              (FaultKind.STUCK, 'in_eclipse', -5.0), (FaultKind.STUCK_OPEN, 'thr0', 0.0)]
+    accepted = sum(asyncio.run(server._handle_function_management(inject_tc(*f), None)) for f in faults)
+    sim.advance(80)
+    # A thruster stuck open for a long session (0.5 degC/s without limit)
+    sim.thrusters[0].temperature = 1e4
+    reports = {}
+    for struct_id, structure in server.hk_structures.items():
+        try:
+            frame = server._encode_hk_report(struct_id)
+            reports[struct_id] = structure.codec.decode_dict(frame[-2 - structure.codec.size:-2])
+        except Exception as e:
+            reports[struct_id] = repr(e)
+    encoded = sum(isinstance(r, dict) for r in reports.values())
+    return {'faults_accepted': accepted, 'faults': len(faults), 'structures': len(reports),
+            'structures_encoded': encoded, 'errors': [r for r in reports.values() if not isinstance(r, dict)],
+            'saturated': {name: r[name] for r in reports.values() if isinstance(r, dict)
+                          for name in ('rw0_temperature', 'rw1_temperature', 'rw2_temperature',
+                                       'thr0_temperature', 'in_eclipse') if name in r}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fault injection cost')
+    parser.add_argument('--steps', type=int, default=4000, help='Steps per timing')
+    parser.add_argument('--faults', default='4,16,64', help='Comma-separated active output fault counts')
+    parser.add_argument('--repeat', type=int, default=2000, help='Telemetry refreshes per timing')
+    parser.add_argument('--json', metavar='PATH', help='Write results as JSON')
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    rates = step_rates(args.steps)
+    print(f"{'faults':<12} {'steps/s':>9} {'vs none':>8}")
+    for name, rate in rates.items():
+        print(f"{name:<12} {rate:>9,.0f} {rate / rates['none']:>7.3f}x")
+
+    counts = [int(c) for c in args.faults.split(',')]
+    outputs = output_costs(counts, args.repeat)
+    print(f"\n{'output faults':>13} {'refresh us':>11} {'loop us':>8}  max difference")
+    for count, r in outputs.items():
+        loop = f"{r['loop_refresh_us']:>8.1f}" if 'loop_refresh_us' in r else f"{'':>8}"
+        diff = f"{r['max_difference']:.1e}" if 'max_difference' in r else ''
+        print(f"{count:>13} {r['refresh_us']:>11.1f} {loop}  {diff}")
+
+    agreement = engine_agreement(args.steps // 2)
+    print(f"\nobject vs numpy engine with a fault schedule: max relative difference {agreement:.1e}")
+
+    hk = hk_flow()
+    print(f"\nHK with out-of-range integer faults: {hk['faults_accepted']}/{hk['faults']} faults accepted, "
+          f"{hk['structures_encoded']}/{hk['structures']} structures encoded")
+    for error in hk['errors']:
+        print(f"  {error}")
+    print('  ' + ', '.join(f"{name} {value:g}" for name, value in hk['saturated'].items()))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'step_rates': rates, 'output_faults': outputs, 'engine_difference': agreement,
+                       'hk_flow': hk}, f, indent=2)
+
+    exact = all(r.get('max_difference', 0.0) == 0.0 for r in outputs.values())
+    flowing = hk['faults_accepted'] == hk['faults'] and hk['structures_encoded'] == hk['structures']
+    return 0 if exact and agreement < 1e-9 and flowing else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Attitude Integrator Accuracy vs Cost
+
+Propagates torque-free tumbling and constant-torque slew scenarios with
+every integrator at several step sizes and compares the final attitude
+and rates with a high-resolution RK4 reference trajectory. Cost is
+reported as rate derivative evaluations and wall time per simulated
+second.
+
+The legacy Euler update ignores gyroscopic coupling, so its error
+against the reference includes that model error; 'euler+gyro' is the
+same scheme with the coupling term, for the pure integration error.
+
+Usage:
+    python benchmarks/bench_integrators.py [--duration S] [--json results.json]
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+
+import _common  # noqa: F401 (import path)
+from integrators import EulerIntegrator, RK4Integrator, RK45Integrator
+
+REFERENCE_DT = 1 / 2000
+
+SCENARIOS = {
+    # Spin near the intermediate axis (strong gyroscopic coupling)
+    'tumble': {'inertia': (100.0, 80.0, 50.0), 'torque': (0.0, 0.0, 0.0),
+               'rate': (0.01, 0.3, 0.01)},
+    # Constant torque slew from rest
+    'slew': {'inertia': (100.0, 100.0, 50.0), 'torque': (0.05, -0.02, 0.01),
+             'rate': (0.0, 0.0, 0.0)},
+}
+
+CASES = [
+    ('euler', lambda: EulerIntegrator(), (1 / 80, 0.1)),
+    ('euler+gyro', lambda: EulerIntegrator(gyroscopic=True), (1 / 80, 0.1)),
+    ('rk4', lambda: RK4Integrator(), (1 / 80, 0.1, 0.5, 1.0)),
+    ('rk45 tol=1e-6', lambda: RK45Integrator(rtol=1e-6, atol=1e-9), (1 / 80, 1.0, 10.0)),
+    ('rk45 tol=1e-9', lambda: RK45Integrator(rtol=1e-9, atol=1e-12), (1 / 80, 1.0, 10.0)),
+]
+
+
+def propagate(integrator, scenario: dict, dt: float, duration: float):
+    q, w = (1.0, 0.0, 0.0, 0.0), scenario['rate']
+    inertia, torque = scenario['inertia'], scenario['torque']
+    for _ in range(round(duration / dt)):
+        q, w = integrator.propagate(q, w, inertia, torque, dt)
+    return q, w
+
+
+def attitude_error(q, ref) -> float:
+    """Rotation angle (deg) between two attitudes"""
+    rw, rx, ry, rz = ref[0], -ref[1], -ref[2], -ref[3]
+    qw, qx, qy, qz = q
+    w = rw * qw - rx * qx - ry * qy - rz * qz
+    x = rw * qx + rx * qw + ry * qz - rz * qy
+    y = rw * qy - rx * qz + ry * qw + rz * qx
+    z = rw * qz + rx * qy - ry * qx + rz * qw
+    return 2 * math.degrees(math.atan2(math.sqrt(x * x + y * y + z * z), abs(w)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Attitude integrator accuracy vs cost')
+    parser.add_argument('--duration', type=float, default=120.0, help='Simulated seconds per run')
+    parser.add_argument('--json', metavar='PATH', help='Write results as JSON')
+    args = parser.parse_args()
+
+    results = {}
+    for name, scenario in SCENARIOS.items():
+        ref_q, ref_w = propagate(RK4Integrator(), scenario, REFERENCE_DT, args.duration)
+        print(f"\n{name}: {args.duration:g} s against RK4 at dt={REFERENCE_DT:g} s")
+        print(f"{'integrator':<15} {'dt (s)':>8} {'att err (deg)':>14} {'rate err (deg/s)':>17} "
+              f"{'evals/s':>9} {'wall ms/sim s':>14}")
+        rows = []
+        for label, factory, steps in CASES:
+            for dt in steps:
+                integrator = factory()
+                start = time.perf_counter()
+                q, w = propagate(integrator, scenario, dt, args.duration)
+                elapsed = time.perf_counter() - start
+                rate_err = math.degrees(max(abs(a - b) for a, b in zip(w, ref_w)))
+                row = {
+                    'integrator': label,
+                    'dt': dt,
+                    'attitude_error_deg': attitude_error(q, ref_q),
+                    'rate_error_deg_s': rate_err,
+                    'evaluations_per_s': integrator.evaluations / args.duration,
+                    'wall_ms_per_sim_s': elapsed * 1000 / args.duration,
+                }
+                rows.append(row)
+                print(f"{label:<15} {dt:>8.4g} {row['attitude_error_deg']:>14.3e} {rate_err:>17.3e} "
+                      f"{row['evaluations_per_s']:>9.1f} {row['wall_ms_per_sim_s']:>14.3f}")
+        results[name] = rows
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
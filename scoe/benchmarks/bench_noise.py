@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Sensor Noise Benchmark
+
+Measures the cost per Gaussian value of random.gauss against the
+block-generated sensor_noise streams (scalar gauss() and array
+normals()), the resulting object engine step rate, and checks that two
+simulations with the same seed produce identical telemetry.
+
+Usage:
+    python benchmarks/bench_noise.py [--values N] [--json results.json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+import _common  # noqa: F401 (import path)
+from aocs_simulation import AOCSSimulation
+from sensor_noise import NoiseService
+
+
+def per_value_ns(draw, values: int) -> float:
+    start = time.perf_counter()
+    draw(values)
+    return (time.perf_counter() - start) / values * 1e9
+
+
+def reproducible(seed: int, steps: int = 2000) -> bool:
+    runs = []
+    for _ in range(2):
+        sim = AOCSSimulation(seed=seed)
+        sim.start()
+        sim.thrusters[0].firing = True
+        sim.advance(steps)
+        runs.append(sim.get_all_telemetry())
+    return runs[0] == runs[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Block-generated sensor noise')
+    parser.add_argument('--values', type=int, default=1_000_000, help='Values per measurement')
+    parser.add_argument('--json', metavar='PATH', help='Write results as JSON')
+    args = parser.parse_args()
+
+    gauss = random.gauss
+    stream = NoiseService(1).stream('bench')
+
+    def random_gauss(n):
+        for _ in range(n):
+            gauss(0, 0.5)
+
+    def stream_gauss(n):
+        draw = stream.gauss
+        for _ in range(n):
+            draw(0.5)
+
+    def stream_normals(n):
+        for _ in range(n // 1000):
+            stream.normals(1000)
+
+    results = {
+        'random_gauss_ns': per_value_ns(random_gauss, args.values),
+        'stream_gauss_ns': per_value_ns(stream_gauss, args.values),
+        'stream_normals_ns': per_value_ns(stream_normals, args.values),
+    }
+    print(f"{'source':<26} {'ns/value':>9}")
+    print(f"{'random.gauss':<26} {results['random_gauss_ns']:>9.1f}")
+    print(f"{'NoiseStream.gauss':<26} {results['stream_gauss_ns']:>9.1f}")
+    print(f"{'NoiseStream.normals(1000)':<26} {results['stream_normals_ns']:>9.1f}")
+
+    sim = AOCSSimulation(seed=1)
+    sim.start()
+    steps = 8000
+    start = time.perf_counter()
+    sim.advance(steps)
+    results['object_steps_per_s'] = steps / (time.perf_counter() - start)
+    results['reproducible'] = reproducible(seed=7)
+    print(f"\nobject engine: {results['object_steps_per_s']:,.0f} steps/s, "
+          f"same seed reproduces telemetry: {results['reproducible']}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0 if results['reproducible'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
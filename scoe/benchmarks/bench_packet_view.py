@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+PUS Packet Decode Benchmark
+
+Compares the dataclass decode path (EDENProtocol.unwrap_packet) with the
+zero-copy PUSPacketView (EDENProtocol.unwrap_view) on a TM traffic mix.
+Each decoded packet is routed on service/subtype and its data read, as
+the receive loops do.
+
+Usage:
+    python benchmarks/bench_packet_view.py [--packets N]
+"""
+
+import argparse
+import os
+import tracemalloc
+
+from _common import best_rate
+from pus_protocol import PUSPacketFactory, EDENProtocol
+
+
+def build_traffic(count: int):
+    """Build a realistic mix of EDEN-framed TM packets"""
+    factory = PUSPacketFactory()
+    templates = [
+        factory.create_tm(1, 1, b'\x00\x01'),
+        factory.create_tm(1, 7, b'\x00\x01'),
+        factory.create_tm(3, 25, b'\x00\x01' + os.urandom(28)),
+        factory.create_tm(3, 25, b'\x00\x02' + os.urandom(48)),
+        factory.create_tm(3, 25, b'\x00\x06' + os.urandom(24)),
+        factory.create_tm(17, 2),
+    ]
+    frames = [EDENProtocol.wrap_packet(t) for t in templates]
+    return [frames[i % len(frames)] for i in range(count)]
+
+
+def route(packet) -> int:
+    """Minimal routing: dispatch on service/subtype and touch the data"""
+    if packet.service_type == 3 and packet.service_subtype == 25:
+        return len(packet.data)
+    return packet.service_subtype
+
+
+def blocks_per_packet(decode, frames) -> float:
+    """Memory blocks allocated and held per decoded packet"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [decode(f) for f in frames]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    blocks = sum(s.count_diff for s in stats) - 1  # minus the list itself
+    del kept
+    return blocks / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PUS packet decode benchmark')
+    parser.add_argument('--packets', type=int, default=10000, help='Packets per round')
+    args = parser.parse_args()
+
+    frames = build_traffic(args.packets)
+    paths = [
+        ('dataclass', EDENProtocol.unwrap_packet),
+        ('view', EDENProtocol.unwrap_view),
+    ]
+
+    results = {}
+    for name, decode in paths:
+        def run(decode=decode):
+            for f in frames:
+                route(decode(f))
+        rate = best_rate(run, 1) * len(frames)
+        results[name] = (rate, blocks_per_packet(decode, frames))
+
+    print(f"{'path':<10} {'pkt/s':>12} {'blocks/pkt':>12}")
+    for name, (rate, blocks) in results.items():
+        print(f'{name:<10} {rate:>12,.0f} {blocks:>12.1f}')
+    print(f"\nspeedup: {results['view'][0] / results['dataclass'][0]:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+PUS Protocol Throughput and Fuzz Benchmark
+
+Measures packets per second and memory blocks/bytes held per packet for
+the pus_protocol primitives (CCSDS header, PUS packet, CRC, EDEN
+framing) over a realistic TM traffic mix, then runs a seeded property
+based fuzz pass that feeds truncated and corrupted streams through the
+EDENStreamFramer and checks that
+
+- the framer never raises and only yields length-consistent frames,
+- frames untouched by the corruption are still recovered,
+- throughput on corrupted streams stays within a factor of a clean one,
+- the framer buffer stays bounded.
+
+Results are printed as a table and can be written as JSON (--json) and
+compared against a previous run (--baseline) to track regressions.
+
+Usage:
+    python benchmarks/bench_protocol.py [--packets N] [--fuzz-cases N]
+        [--seed S] [--json results.json] [--baseline old.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import struct
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from _common import best_rate
+from crc16 import crc16, crc16_table, verify_spans
+from pus_protocol import (
+    CCSDSHeader, PUSPacket, PUSPacketFactory, EDENProtocol, EDENStreamFramer
+)
+
+SCHEMA_VERSION = 1
+
+# Traffic mix: (name, service, subtype, data size, weight)
+TRAFFIC_MIX = [
+    ('TM[1,1]', 1, 1, 2, 20),
+    ('TM[1,7]', 1, 7, 2, 20),
+    ('TM[3,25] 30B', 3, 25, 30, 25),
+    ('TM[3,25] 50B', 3, 25, 50, 15),
+    ('TM[3,25] 250B', 3, 25, 250, 15),
+    ('TM[17,2]', 17, 2, 4, 5),
+]
+
+# Receive chunk size used by the TCP receive loops
+CHUNK_SIZE = 4096
+
+# Fuzz thresholds
+MIN_RECOVERY = 0.9  # fraction of intact frames that must be recovered
+MIN_THROUGHPUT_RATIO = 0.25  # corrupted vs clean stream throughput
+
+FUZZ_KINDS = ('clean', 'truncated', 'bitflip', 'garbage', 'bad_length', 'mixed')
+
+
+def build_traffic(count: int, rng: random.Random) -> List[PUSPacket]:
+    """Build `count` TM packets drawn from the traffic mix"""
+    factory = PUSPacketFactory()
+    weights = [w for *_, w in TRAFFIC_MIX]
+    packets = []
+    for name, service, subtype, size, _ in rng.choices(TRAFFIC_MIX, weights, k=count):
+        data = bytes(rng.getrandbits(8) for _ in range(size))
+        packets.append(factory.create_tm(service, subtype, data))
+    return packets
+
+
+def feed_chunks(stream: bytes, sizes: Sequence[int]):
+    """Split a stream into chunks of the given (cycled) sizes"""
+    view = memoryview(stream)
+    offset = 0
+    i = 0
+    while offset < len(stream):
+        size = sizes[i % len(sizes)]
+        yield view[offset:offset + size]
+        offset += size
+        i += 1
+
+
+def find_packet_loop(stream: bytes) -> List[bytes]:
+    """Legacy receive loop: append chunks and drain with find_packet"""
+    frames = []
+    buffer = b''
+    for chunk in feed_chunks(stream, (CHUNK_SIZE,)):
+        buffer += chunk
+        while True:
+            frame, buffer = EDENProtocol.find_packet(buffer)
+            if frame is None:
+                break
+            frames.append(frame)
+    return frames
+
+
+def framer_loop(stream: bytes, sizes: Sequence[int] = (CHUNK_SIZE,),
+                framer: Optional[EDENStreamFramer] = None) -> List[memoryview]:
+    """Current receive loop: feed chunks to an EDENStreamFramer"""
+    if framer is None:
+        framer = EDENStreamFramer()
+    frames = []
+    for chunk in feed_chunks(stream, sizes):
+        framer.feed(chunk)
+        frames.extend(framer.frames())
+    return frames
+
+
+def memory_per_item(func: Callable, items: Sequence) -> Tuple[float, float]:
+    """Memory blocks and bytes held per result of func over items"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [func(item) for item in items]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    blocks = sum(s.count_diff for s in stats) - 1  # minus the list itself
+    size = sum(s.size_diff for s in stats) - sys.getsizeof(kept)
+    del kept
+    return max(blocks, 0) / len(items), max(size, 0) / len(items)
+
+
+def run_operations(packets: List[PUSPacket], repeat: int) -> Dict[str, Dict[str, float]]:
+    """Benchmark the protocol primitives, one entry per operation"""
+    raw = [p.pack() for p in packets]
+    headers = [p.ccsds_header for p in packets]
+    header_bytes = [r[:6] for r in raw]
+    bodies = [r[:-2] for r in raw]
+    frames = [EDENProtocol.wrap_packet(p) for p in packets]
+    stream = b''.join(frames)
+    buffer = b''.join(raw)
+    spans = PUSPacket.packet_spans(buffer)
+    n = len(packets)
+
+    # name -> (per-item function, items) or (whole-batch function, None)
+    operations = {
+        'ccsds_header_pack': (CCSDSHeader.pack, headers),
+        'ccsds_header_unpack': (CCSDSHeader.unpack, header_bytes),
+        'pus_packet_pack': (PUSPacket.pack, packets),
+        'pus_packet_unpack': (PUSPacket.unpack, raw),
+        'crc16': (crc16, bodies),
+        'crc16_table': (crc16_table, bodies),
+        'crc16_verify_spans': (lambda: verify_spans(buffer, spans), None),
+        'eden_wrap_packet': (EDENProtocol.wrap_packet, packets),
+        'eden_unwrap_view': (EDENProtocol.unwrap_view, frames),
+        'eden_find_packet': (lambda: find_packet_loop(stream), None),
+        'eden_stream_framer': (lambda: framer_loop(stream), None),
+    }
+
+    results = {}
+    for name, (func, items) in operations.items():
+        if items is None:
+            rate = best_rate(func, 1, repeat) * n
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            kept = func()
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            stats = after.compare_to(before, 'filename')
+            blocks = max(sum(s.count_diff for s in stats), 0) / n
+            size = max(sum(s.size_diff for s in stats), 0) / n
+            del kept
+        else:
+            def run(func=func, items=items):
+                for item in items:
+                    func(item)
+            rate = best_rate(run, 1, repeat) * n
+            blocks, size = memory_per_item(func, items)
+        results[name] = {
+            'packets_per_s': rate,
+            'blocks_per_packet': blocks,
+            'bytes_per_packet': size,
+        }
+    return results
+
+
+def mutate(frames: List[bytes], kind: str, rng: random.Random) -> Tuple[bytes, List[bool]]:
+    """
+    Build a corrupted stream from frames
+
+    Returns the stream and, per frame, whether it must be recoverable by
+    the framer: the frame is intact and does not start inside the
+    declared extent of a truncated frame (whose length field, still
+    valid, makes the framer consume the bytes that follow it).
+    """
+    out = bytearray()
+    intact = []
+    shadow_end = 0
+    rate = rng.uniform(0.02, 0.1)  # fraction of frames corrupted
+    for frame in frames:
+        k = rng.choice(FUZZ_KINDS[1:-1]) if kind == 'mixed' else kind
+        if k == 'clean' or rng.random() >= rate:
+            intact.append(len(out) >= shadow_end)
+            out += frame
+            continue
+
+        frame = bytearray(frame)
+        ok = False
+        if k == 'truncated':
+            shadow_end = max(shadow_end, len(out) + len(frame))
+            frame = frame[:rng.randrange(1, len(frame))]
+        elif k == 'bitflip':
+            pos = rng.randrange(len(frame))
+            frame[pos] ^= 1 << rng.randrange(8)
+        elif k == 'garbage':
+            junk = bytearray(rng.getrandbits(8) for _ in range(rng.randrange(1, 64)))
+            if rng.random() < 0.5:
+                junk[:2] = EDENProtocol.SYNC_MARKER  # fake sync marker
+            out += junk
+            ok = len(out) >= shadow_end
+        elif k == 'bad_length':
+            struct.pack_into('>H', frame, 2, rng.choice((0, 1, 0xFFFF, rng.randrange(0x10000))))
+        intact.append(ok)
+        out += frame
+    return bytes(out), intact
+
+
+def check_frame(frame: memoryview, max_len: int) -> bool:
+    """Structural property every yielded frame must satisfy"""
+    if len(frame) < 4 or frame[0] != 0xEB or frame[1] != 0x90:
+        return False
+    length = (frame[2] << 8) | frame[3]
+    if length != len(frame) - 4 or not EDENStreamFramer.MIN_PACKET_LEN <= length <= max_len:
+        return False
+    data_length = (frame[8] << 8) | frame[9]
+    return data_length + 7 == length
+
+
+def run_fuzz(packets: List[PUSPacket], cases: int, seed: int) -> Dict[str, Dict]:
+    """Property-based fuzz pass over the stream framer"""
+    frames = [EDENProtocol.wrap_packet(p) for p in packets]
+    results = {}
+    for kind in FUZZ_KINDS:
+        rng = random.Random(f'{seed}-{kind}')
+        total_bytes = total_frames = 0
+        elapsed = 0.0
+        min_recovery = 1.0
+        failures = []
+        for case in range(cases):
+            case_rng = random.Random(rng.getrandbits(64))
+            count = case_rng.randrange(16, min(512, len(frames)) + 1)
+            start = case_rng.randrange(len(frames) - count + 1)
+            selection = frames[start:start + count]
+            stream, intact = mutate(selection, kind, case_rng)
+            sizes = [case_rng.randrange(1, 2 * CHUNK_SIZE) for _ in range(8)]
+
+            framer = EDENStreamFramer()
+            try:
+                t0 = time.perf_counter()
+                recovered = framer_loop(stream, sizes, framer)
+                elapsed += time.perf_counter() - t0
+            except Exception as e:  # property: the framer never raises
+                failures.append({'case': case, 'error': repr(e)})
+                continue
+
+            bad = sum(not check_frame(f, framer.max_packet_len) for f in recovered)
+            got = {bytes(f) for f in recovered}
+            expected = [f for f, ok in zip(selection, intact) if ok]
+            recovery = sum(f in got for f in expected) / len(expected) if expected else 1.0
+            min_recovery = min(min_recovery, recovery)
+            buffered = framer.stats()['buffered']
+
+            if bad or recovery < MIN_RECOVERY or buffered > EDENStreamFramer.HEADER_LEN + 0xFFFF:
+                failures.append({'case': case, 'invalid_frames': bad,
+                                 'recovery': recovery, 'buffered': buffered})
+            total_bytes += len(stream)
+            total_frames += len(recovered)
+
+        results[kind] = {
+            'cases': cases,
+            'mb_per_s': total_bytes / elapsed / 1e6 if elapsed else 0.0,
+            'frames_per_s': total_frames / elapsed if elapsed else 0.0,
+            'min_recovery': min_recovery,
+            'failures': failures[:10],
+            'failure_count': len(failures),
+        }
+
+    clean = results['clean']['mb_per_s']
+    for kind, result in results.items():
+        result['throughput_ratio'] = result['mb_per_s'] / clean if clean else 0.0
+        result['ok'] = (not result['failure_count'] and
+                        result['throughput_ratio'] >= MIN_THROUGHPUT_RATIO)
+    return results
+
+
+def git_revision() -> str:
+    """Short git revision of the working tree, if available"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=os.path.dirname(__file__), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Operations whose throughput dropped below threshold x baseline"""
+    regressions = []
+    for name, old in baseline.get('operations', {}).items():
+        new = results['operations'].get(name)
+        if new and old['packets_per_s'] and new['packets_per_s'] < threshold * old['packets_per_s']:
+            regressions.append(f"{name}: {new['packets_per_s']:,.0f} pkt/s "
+                               f"vs {old['packets_per_s']:,.0f} pkt/s baseline")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PUS protocol throughput and fuzz benchmark')
+    parser.add_argument('--packets', type=int, default=5000, help='Packets in the traffic mix')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing rounds (best is kept)')
+    parser.add_argument('--fuzz-cases', type=int, default=100, help='Fuzz cases per mutation kind')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    parser.add_argument('--json', metavar='PATH', help="Write results as JSON ('-' for stdout)")
+    parser.add_argument('--baseline', metavar='PATH', help='Compare against a previous JSON result')
+    parser.add_argument('--threshold', type=float, default=0.8,
+                        help='Regression threshold as a fraction of the baseline rate')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    packets = build_traffic(args.packets, rng)
+
+    results = {
+        'benchmark': 'pus_protocol',
+        'schema': SCHEMA_VERSION,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'git': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {'packets': args.packets, 'repeat': args.repeat,
+                   'fuzz_cases': args.fuzz_cases, 'seed': args.seed},
+        'mix': [{'name': name, 'data_bytes': size, 'weight': weight}
+                for name, _, _, size, weight in TRAFFIC_MIX],
+        'operations': run_operations(packets, args.repeat),
+        'fuzz': run_fuzz(packets, args.fuzz_cases, args.seed),
+    }
+    results['ok'] = all(r['ok'] for r in results['fuzz'].values())
+
+    out = sys.stderr if args.json == '-' else sys.stdout
+    print(f"{'operation':<22} {'pkt/s':>14} {'blocks/pkt':>11} {'bytes/pkt':>10}", file=out)
+    for name, r in results['operations'].items():
+        print(f"{name:<22} {r['packets_per_s']:>14,.0f} {r['blocks_per_packet']:>11.1f} "
+              f"{r['bytes_per_packet']:>10.0f}", file=out)
+    print(f"\n{'fuzz':<12} {'MB/s':>8} {'ratio':>7} {'recovery':>9} {'failures':>9}", file=out)
+    for kind, r in results['fuzz'].items():
+        print(f"{kind:<12} {r['mb_per_s']:>8.1f} {r['throughput_ratio']:>7.2f} "
+              f"{r['min_recovery']:>9.3f} {r['failure_count']:>9}", file=out)
+
+    status = 0 if results['ok'] else 1
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        results['regressions'] = regressions
+        for line in regressions:
+            print(f'REGRESSION {line}', file=out)
+        if regressions:
+            status = 1
+
+    if args.json == '-':
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    sys.exit(status)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Command Log Replay Benchmark
+
+Runs a recorded mock AOCS session in-process: a client connects over
+TCP and sends a scripted TC sequence (simulation start, wheel, thruster,
+torque rod and SADA commands, one-shot HK and parameter reports,
+checkpoint save and restore with a new seed, fault injection and
+clearing, self-test) spread over the
+session while the server produces its periodic HK. The command log is
+then replayed (command_log.replay) and the replay checked for
+bit-identical telemetry at every recorded read, and timed against the
+session's wall time.
+
+Usage:
+    python benchmarks/bench_replay.py [--duration S] [--clock {realtime,accelerated}]
+        [--json results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import struct
+import sys
+import tempfile
+import time
+
+import _common  # noqa: F401 (import path)
+import command_log
+from aocs_simulation import AOCSSimulation, RWCommandCode
+from faults import FaultKind
+from mock_aocs_server import MockAOCSServer
+from pus_protocol import PUSPacketFactory, PUSServiceType, PUSServiceSubtype
+from sim_clock import SimulationClock, ClockMode
+
+FUNCTION = (PUSServiceType.FUNCTION_MANAGEMENT, PUSServiceSubtype.TC_PERFORM_FUNCTION)
+
+
+def script() -> list:
+    """(fraction of the session, service, subtype, data) of the TC sequence"""
+    f32 = struct.Struct('>f').pack
+
+    def fault(kind: FaultKind, target: bytes, value: float) -> bytes:
+        return bytes([0x70, kind, len(target)]) + target + struct.pack('>fff', 0.0, 0.0, value)
+
+    tcs = [(0.0, *FUNCTION, bytes([1]))]
+    for i in range(4):
+        tcs += [(0.05, *FUNCTION, bytes([0x10 + i, RWCommandCode.MOTOR_CONTROL, 1])),
+                (0.05, *FUNCTION, bytes([0x10 + i, RWCommandCode.MODE_CONTROL, 1])),
+                (0.1 + 0.05 * i, *FUNCTION, bytes([0x10 + i, RWCommandCode.TORQUE_SPEED_CONTROL]) + f32(0.01 * (i + 1)))]
+    tcs += [
+        (0.3, *FUNCTION, bytes([0x20, 1])),
+        (0.35, *FUNCTION, bytes([0x30]) + f32(1e-6)),
+        (0.4, *FUNCTION, bytes([0x40]) + f32(30.0)),
+        (0.42, *FUNCTION, fault(FaultKind.DROPOUT, b'sun_sensor0', 0.5)),
+        (0.45, *FUNCTION, bytes([0x50, 0])),
+        (0.47, *FUNCTION, fault(FaultKind.DRIFT, b'gyro_x', 0.01)),
+        (0.5, PUSServiceType.HOUSEKEEPING, PUSServiceSubtype.TC_ONE_SHOT_HK, struct.pack('>H', 2)),
+        (0.55, PUSServiceType.PARAMETER_MANAGEMENT, PUSServiceSubtype.TC_REPORT_PARAMETERS, struct.pack('>H', 0)),
+        (0.6, *FUNCTION, bytes([0x20, 0])),
+        (0.65, *FUNCTION, bytes([0x52, 0]) + struct.pack('>I', 7)),
+        (0.7, *FUNCTION, bytes([5])),
+        (0.75, *FUNCTION, bytes([0x71])),
+        (0.8, *FUNCTION, bytes([0x11, RWCommandCode.TORQUE_SPEED_CONTROL]) + f32(-0.02)),
+        (0.9, PUSServiceType.CONNECTION_TEST, PUSServiceSubtype.TC_CONNECTION_TEST, b''),
+    ]
+    return sorted(tcs, key=lambda tc: tc[0])
+
+
+async def session(path: str, duration: float, clock: ClockMode) -> dict:
+    """Record a scripted session, returning its wall and simulated time"""
+    server = MockAOCSServer(host='127.0.0.1', port=0, clock=SimulationClock(clock, rate=10.0),
+                            simulation=AOCSSimulation(seed=1), record=path)
+    server_task = asyncio.create_task(server.start())
+    while server.server is None or not server.server.sockets:
+        await asyncio.sleep(0.01)
+    port = server.server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+    async def drain():
+        while await reader.read(65536):
+            pass
+
+    drain_task = asyncio.create_task(drain())
+    factory = PUSPacketFactory(apid=200, source_id=2)
+    start = server.clock.now()
+    for at, service, subtype, data in script():
+        while server.clock.now() - start < at * duration:
+            await asyncio.sleep(0.005)
+        writer.write(factory.encode_tc(service, subtype, data)[1])
+        await writer.drain()
+    while server.clock.now() - start < duration:
+        await asyncio.sleep(0.01)
+
+    writer.close()
+    await server.stop()
+    server_task.cancel()
+    drain_task.cancel()
+    await asyncio.gather(server_task, drain_task, return_exceptions=True)
+    return {'steps': server.steps, 'sim_time': server.simulation.time}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Command log recording and replay')
+    parser.add_argument('--duration', type=float, default=10.0, help='Session length (simulated s)')
+    parser.add_argument('--clock', choices=['realtime', 'accelerated'], default='realtime',
+                        help='Session pacing (accelerated runs 10x real time)')
+    parser.add_argument('--json', metavar='PATH', help='Write results as JSON')
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'session.jsonl')
+        recorded = asyncio.run(session(path, args.duration, ClockMode(args.clock)))
+        records = command_log.load(path)
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        result = command_log.replay(path)
+        total = time.perf_counter() - start
+
+    results = {
+        'session_wall_s': result.session_wall_time,
+        'session_steps': recorded['steps'],
+        'log_records': len(records),
+        'log_bytes': size,
+        'replay_wall_s': result.wall_time,
+        'replay_total_s': total,
+        'speedup': result.speedup,
+        'steps': result.steps,
+        'tcs': result.tcs,
+        'reads': result.reads,
+        'identical': result.identical,
+        'sim_time_match': result.sim_time == recorded['sim_time'],
+    }
+    print(f"session: {results['session_wall_s']:.2f} s wall, {recorded['steps']} steps, "
+          f"{len(records)} log records ({size} bytes)")
+    print(f"replay:  {result.wall_time:.3f} s ({total:.3f} s with set-up), {result.tcs} TCs, "
+          f"{result.reads} reads, {result.speedup:.0f}x the session")
+    print(f"telemetry bit-identical: {result.identical}, simulated time matches: {results['sim_time_match']}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    return 0 if result.identical and results['sim_time_match'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
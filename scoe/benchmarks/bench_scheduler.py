@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Multi-Rate Scheduler Benchmark
+
+Compares object engine steps per second with every model at the base
+rate and with multi-rate scheduling (each model at its declared rate,
+see scheduler.py), optionally with extra sun sensors to stand in for a
+larger equipment configuration, and prints the per rate group execution
+times and budget overruns.
+
+Usage:
+    python benchmarks/bench_scheduler.py [--steps N] [--sun-sensors N] [--json results.json]
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+
+import _common  # noqa: F401 (import path)
+from aocs_simulation import AOCSSimulation, EquipmentState, SunSensor, Vector3
+
+
+def build(multirate: bool, extra_sun_sensors: int) -> AOCSSimulation:
+    sim = AOCSSimulation(seed=1, multirate=multirate)
+    for k in range(extra_sun_sensors):
+        i = len(sim.sun_sensors)
+        angle = 2 * math.pi * k / max(1, extra_sun_sensors)
+        sim.sun_sensors.append(SunSensor(i, state=EquipmentState.ON,
+                                         boresight=Vector3(math.cos(angle), math.sin(angle), 0)))
+    sim.configure_sensors()
+    sim.start()
+    for i, rw in enumerate(sim.reaction_wheels):
+        rw.commanded_torque = 0.01 * (i + 1)
+    sim.thrusters[0].firing = True
+    sim.sadas[0].commanded_angle = 30.0
+    return sim
+
+
+def run(multirate: bool, steps: int, extra_sun_sensors: int) -> dict:
+    sim = build(multirate, extra_sun_sensors)
+    start = time.perf_counter()
+    for _ in range(steps):
+        sim.step()
+    elapsed = time.perf_counter() - start
+    return {'steps_per_s': steps / elapsed, 'us_per_step': elapsed / steps * 1e6,
+            'groups': sim.scheduler.stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Single-rate vs multi-rate model scheduling')
+    parser.add_argument('--steps', type=int, default=8000, help='Steps per run')
+    parser.add_argument('--sun-sensors', type=int, default=0, help='Extra sun sensors')
+    parser.add_argument('--json', metavar='PATH', help='Write results as JSON')
+    args = parser.parse_args()
+
+    results = {}
+    for label, multirate in (('single-rate', False), ('multi-rate', True)):
+        r = results[label] = run(multirate, args.steps, args.sun_sensors)
+        print(f"\n{label}: {r['steps_per_s']:,.0f} steps/s ({r['us_per_step']:.1f} us/step)")
+        print(f"  {'group':>8} {'mean us':>8} {'max us':>8} {'runs':>7} {'overruns':>8}  tasks")
+        for name, g in r['groups'].items():
+            print(f"  {name:>8} {g['mean_us']:>8.1f} {g['max_us']:>8.1f} {g['executions']:>7} "
+                  f"{g['overruns']:>8}  {', '.join(g['tasks'])}")
+    speedup = results['multi-rate']['steps_per_s'] / results['single-rate']['steps_per_s']
+    results['speedup'] = speedup
+    print(f"\nmulti-rate speedup: {speedup:.2f}x")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Simulation Engine Benchmark
+
+Compares the object engine (per-model AOCSSimulation.step) with the
+vectorized NumPy engine (sim_engine.VectorEngine):
+
+- equivalence: both engines run the same command scenario from the same
+  noise seed and every telemetry value is compared at regular intervals
+- throughput: simulation steps per second for single steps and for
+  batches of steps per advance() call
+
+Usage:
+    python benchmarks/bench_sim_engine.py [--steps N] [--json results.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import _common  # noqa: F401 (import path)
+from aocs_simulation import AOCSSimulation, EquipmentState, Vector3
+
+BATCHES = (1, 8, 80, 1024)
+
+
+def scenario(sim: AOCSSimulation):
+    """Commands exercising every model (wheel spin-down, slews, firing)"""
+    sim.start()
+    for i, rw in enumerate(sim.reaction_wheels):
+        rw.commanded_torque = 0.01 * (i + 1) * (-1) ** i
+    sim.reaction_wheels[3].state = EquipmentState.OFF
+    sim.reaction_wheels[3].speed = 50.0
+    sim.thrusters[0].firing = True
+    sim.thrusters[2].firing = True
+    sim.torque_rods[0].commanded_dipole = 10.0
+    sim.torque_rods[2].commanded_dipole = -60.0
+    sim.state.magnetic_field_eci = Vector3(2e-5, -1e-5, 3e-5)
+    sim.sadas[0].commanded_angle = 3.0
+    sim.sadas[1].commanded_angle = -0.5
+
+
+def equivalence(steps: int, batch: int, interval: int = 800) -> dict:
+    """Largest telemetry difference between the engines (relative above 1)"""
+    samples = {}
+    for engine in ('object', 'numpy'):
+        sim = AOCSSimulation(engine=engine, seed=1)
+        scenario(sim)
+        step = 1 if engine == 'object' else batch
+        samples[engine] = []
+        done = 0
+        while done < steps:
+            sim.advance(step)
+            done += step
+            if done % interval == 0:
+                samples[engine].append(sim.get_all_telemetry())
+
+    worst, name = 0.0, None
+    for ref, tm in zip(samples['object'], samples['numpy']):
+        for key, value in ref.items():
+            diff = abs(value - tm[key]) / max(1.0, abs(value))
+            if diff > worst:
+                worst, name = diff, key
+    return {'batch': batch, 'max_difference': worst, 'parameter': name}
+
+
+def steps_per_second(engine: str, batch: int, steps: int) -> float:
+    sim = AOCSSimulation(engine=engine)
+    scenario(sim)
+    rounds = max(1, steps // batch)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        sim.advance(batch)
+    return rounds * batch / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Object vs NumPy simulation engine')
+    parser.add_argument('--steps', type=int, default=8000, help='Steps per object engine run')
+    parser.add_argument('--json', metavar='PATH', help='Write results as JSON')
+    args = parser.parse_args()
+
+    results = {'equivalence': [equivalence(4000, batch) for batch in (1, 80, 800)]}
+    print("Equivalence (same seed):")
+    for r in results['equivalence']:
+        print(f"  batch {r['batch']:>5}: max difference {r['max_difference']:.2e} ({r['parameter']})")
+
+    reference = steps_per_second('object', 1, args.steps)
+    results['object_steps_per_s'] = reference
+    results['numpy'] = {}
+    print(f"\n{'engine':<8} {'batch':>6} {'steps/s':>12} {'speedup':>8}")
+    print(f"{'object':<8} {1:>6} {reference:>12,.0f} {1.0:>7.1f}x")
+    for batch in BATCHES:
+        rate = steps_per_second('numpy', batch, args.steps * 10)
+        results['numpy'][batch] = {'steps_per_s': rate, 'speedup': rate / reference}
+        print(f"{'numpy':<8} {batch:>6} {rate:>12,.0f} {rate / reference:>7.1f}x")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Sun Sensor Array Benchmark
+
+Compares updating the sun sensor heads one SunSensor object at a time
+(normalize, acos and atan2 per head, per-head noise streams) with the
+SunSensorArray (one body-frame rotation and one boresight matrix product
+for all heads) as heads are added on a coarse sun sensor ring, and
+checks that both give the same detections, azimuths and elevations
+without noise over a tumbling attitude.
+
+Usage:
+    python benchmarks/bench_sun_sensors.py [--heads 6,12,24,48] [--json results.json]
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+
+import numpy as np
+
+import _common  # noqa: F401 (import path)
+from aocs_simulation import AOCSSimulation, EquipmentState, Quaternion, SunSensor, SunSensorArray, Vector3
+
+
+def ring(count: int) -> list:
+    """count heads: the six default faces, the rest on two tilted rings"""
+    sim = AOCSSimulation(seed=1)
+    heads = list(sim.sun_sensors)
+    for k in range(count - len(heads)):
+        az = 2 * math.pi * k / max(1, count - 6)
+        el = math.radians(35 if k % 2 else -35)
+        heads.append(SunSensor(len(heads), state=EquipmentState.ON, noise=sim.noise.stream(f'ss{len(heads)}'),
+                               boresight=Vector3(math.cos(el) * math.cos(az), math.cos(el) * math.sin(az),
+                                                 math.sin(el))))
+    for i, head in enumerate(heads):
+        head.noise = sim.noise.stream(f'ss{i}')
+    return heads
+
+
+def attitudes(count: int) -> list:
+    rng = np.random.default_rng(3)
+    q = rng.standard_normal((count, 4))
+    q /= np.linalg.norm(q, axis=1)[:, None]
+    return [Quaternion(*row) for row in q.tolist()]
+
+
+def loop_update(heads: list, sun: Vector3, q: Quaternion):
+    """Original per-head update, with the sun rotated into the body frame"""
+    body = Vector3(*SunSensorArray.sun_body((q.w, q.x, q.y, q.z), (sun.x, sun.y, sun.z)))
+    for head in heads:
+        head.update(body, False)
+
+
+def time_us(func, repeat: int) -> float:
+    best = math.inf
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        best = min(best, (time.perf_counter() - start) / repeat * 1e6)
+    return best
+
+
+def agreement(heads: list, array: SunSensorArray, sun: Vector3, qs: list) -> dict:
+    """Largest difference between the loop and the array without noise"""
+    for head in heads:
+        head.noise_std = 0.0
+    array.configure()
+    array.noise_scale[:, 2] = 0.0
+    mismatched, angle = 0, 0.0
+    for q in qs:
+        loop_update(heads, sun, q)
+        array.update(sun, q, False)
+        for head, (detected, az, el, _) in zip(heads, array.outputs.tolist()):
+            if head.sun_detected != bool(detected):
+                mismatched += 1
+            elif detected:
+                angle = max(angle, abs(head.azimuth - az), abs(head.elevation - el))
+    return {'detection_mismatches': mismatched, 'max_angle_diff_deg': angle}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-head vs array sun sensor update')
+    parser.add_argument('--heads', default='6,12,24,48', help='Comma-separated head counts')
+    parser.add_argument('--repeat', type=int, default=2000, help='Updates per timing')
+    parser.add_argument('--json', metavar='PATH', help='Write results as JSON')
+    args = parser.parse_args()
+
+    sun = Vector3(0.6, 0.64, 0.48)
+    qs = attitudes(64)
+    results = {}
+    print(f"{'heads':>6} {'loop us':>8} {'array us':>9} {'speedup':>8}  detection mismatches  max angle diff")
+    for count in [int(c) for c in args.heads.split(',')]:
+        heads = ring(count)
+        array = SunSensorArray(heads, AOCSSimulation(seed=1).noise.stream('sun_sensors'))
+        it = iter(qs * (args.repeat // len(qs) + 1))
+        loop = time_us(lambda: loop_update(heads, sun, next(it)), args.repeat // 5)
+        it = iter(qs * (args.repeat // len(qs) + 1))
+        vector = time_us(lambda: array.update(sun, next(it), False), args.repeat // 5)
+        r = results[count] = {'loop_us': loop, 'array_us': vector, **agreement(heads, array, sun, qs)}
+        print(f"{count:>6} {loop:>8.1f} {vector:>9.1f} {loop / vector:>7.1f}x  "
+              f"{r['detection_mismatches']:>20} {r['max_angle_diff_deg']:>15.2e}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    return 0 if all(r['detection_mismatches'] == 0 for r in results.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
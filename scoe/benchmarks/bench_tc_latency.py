@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+TC Round-Trip Latency Under HK Load
+
+Runs the mock AOCS server in-process and a client on a rate-limited
+link (the client reads at most --link-rate bytes/s through small socket
+buffers). The client sends TC[17,1] at a fixed rate and measures the
+time until the TM[1,7] execution report arrives, first with the default
+HK load and then with extra HK structures generating more traffic than
+the link can carry. Both phases run with prioritised outbound queues
+and with a single FIFO queue for comparison.
+
+Usage:
+    python benchmarks/bench_tc_latency.py [--duration S] [--link-rate BYTES]
+        [--extra-structures N] [--json results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import sys
+import time
+
+import _common  # noqa: F401 (import path)
+from latency import LatencyHistogram
+from mock_aocs_server import MockAOCSServer, HKReportStructure
+from pus_protocol import PUSPacketFactory, EDENProtocol, EDENStreamFramer
+
+SOCKET_BUFFER = 4096
+
+
+async def run_phase(priorities: bool, extra_structures: int, duration: float,
+                    link_rate: float, tc_interval: float) -> dict:
+    """Run one server/client session and return the TC latency histogram"""
+    server = MockAOCSServer(host='127.0.0.1', port=0, priority_scheduling=priorities)
+    base = server.hk_structures[2]
+    for i in range(extra_structures):
+        sid = 1000 + i
+        server.hk_structures[sid] = HKReportStructure(
+            structure_id=sid, enabled=True, interval=0.0,
+            parameters=base.parameters, types=base.types, calibrations=base.calibrations)
+    server_task = asyncio.create_task(server.start())
+    while server.server is None or not server.server.sockets:
+        await asyncio.sleep(0.01)
+    port = server.server.sockets[0].getsockname()[1]
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER)
+    sock.setblocking(False)
+    await asyncio.get_running_loop().sock_connect(sock, ('127.0.0.1', port))
+    # Small reader limit so unread data stays in the (small) socket buffers
+    reader, writer = await asyncio.open_connection(sock=sock, limit=2048)
+    while not server.channels:
+        await asyncio.sleep(0.01)
+    for client in server.channels:
+        client.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER)
+
+    factory = PUSPacketFactory(apid=200, source_id=2)
+    pending = {}
+    histogram = LatencyHistogram()
+    received = 0
+
+    async def receive():
+        nonlocal received
+        framer = EDENStreamFramer()
+        start = time.monotonic()
+        while True:
+            data = await reader.read(4096)
+            if not data:
+                return
+            received += len(data)
+            framer.feed(data)
+            for frame in framer.frames():
+                tm = EDENProtocol.unwrap_view(frame)
+                if tm and tm.service_type == 1 and tm.service_subtype == 7:
+                    seq = int.from_bytes(tm.data[:2], 'big')
+                    sent = pending.pop(seq, None)
+                    if sent is not None:
+                        histogram.record(time.monotonic() - sent)
+            # Rate limit the link
+            ahead = received / link_rate - (time.monotonic() - start)
+            if ahead > 0:
+                await asyncio.sleep(ahead)
+
+    receive_task = asyncio.create_task(receive())
+    await asyncio.sleep(1.0)  # let the HK backlog build up
+
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        seq, frame = factory.encode_tc(17, 1)
+        pending[seq] = time.monotonic()
+        writer.write(frame)
+        await writer.drain()
+        await asyncio.sleep(tc_interval)
+    await asyncio.sleep(3.0)  # collect the remaining reports
+
+    lost = len(pending)
+    receive_task.cancel()
+    writer.close()
+    await server.stop()
+    server_task.cancel()
+    for task in (receive_task, server_task):
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
+
+    result = histogram.to_dict()
+    result['unanswered'] = lost
+    result['server_latency'] = server.latency_stats()
+    return result
+
+
+async def run(args) -> dict:
+    results = {}
+    for load, extra in (('idle', 0), ('hk_load', args.extra_structures)):
+        for mode, priorities in (('priority', True), ('fifo', False)):
+            results[f'{load}/{mode}'] = await run_phase(
+                priorities, extra, args.duration, args.link_rate, args.tc_interval)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TC round-trip latency under HK load')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per phase')
+    parser.add_argument('--link-rate', type=float, default=32000, help='Client read rate (bytes/s)')
+    parser.add_argument('--extra-structures', type=int, default=80,
+                        help='Extra HK structures reported every tick in the load phase')
+    parser.add_argument('--tc-interval', type=float, default=0.05, help='Seconds between TCs')
+    parser.add_argument('--json', metavar='PATH', help='Write results as JSON')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = asyncio.run(run(args))
+
+    print(f"{'phase':<18} {'TCs':>6} {'lost':>5} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'queue p99 ms':>13}")
+    for name, r in results.items():
+        queued = r['server_latency']['verification']['p99_ms']
+        print(f"{name:<18} {r['count']:>6} {r['unanswered']:>5} {r['p50_ms']:>8.1f} "
+              f"{r['p99_ms']:>8.1f} {r['max_ms']:>8.1f} {queued:>13.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,6 +7,12 @@ It receives telecommands via EDEN/PUS over TCP/IP and generates telemetry respon
 
 Usage:
     python run_mock_aocs.py [--host HOST] [--port PORT]
+        [--clock {realtime,accelerated,afap}] [--rate N]
+        [--integrator {euler,rk4,rk45}] [--dt SECONDS] [--multirate] [--seed N]
+        [--orbit [--altitude KM] [--inclination DEG]] [--wheel-layout LAYOUT]
+        [--record LOG]
+    python run_mock_aocs.py --replay LOG
+    python run_mock_aocs.py --profile N [simulation options]
 
 Default: Listens on 0.0.0.0:10025
 """
@@ -20,14 +26,81 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from mock_aocs_server import MockAOCSServer
+from sim_clock import SimulationClock, ClockMode
+from aocs_simulation import AOCSSimulation
+from integrators import INTEGRATORS
+from environment import OrbitalElements, R_EARTH
+from actuators import WHEEL_LAYOUTS
+import command_log
 
 
 def main():
     parser = argparse.ArgumentParser(description='Mock AOCS Server')
     parser.add_argument('--host', default='0.0.0.0', help='Host to bind to')
     parser.add_argument('--port', type=int, default=10025, help='Port to listen on')
+    parser.add_argument('--max-batch-packets', type=int, default=64,
+                        help='Maximum TM packets per batched write')
+    parser.add_argument('--max-batch-latency', type=float, default=0.0,
+                        help='Maximum time (s) a TM packet waits in a batch')
+    parser.add_argument('--max-segment-data', type=int, default=1024,
+                        help='Segment size (bytes) for bulk reports such as TM[20,2]')
+    parser.add_argument('--clock', choices=[m.value for m in ClockMode], default='realtime',
+                        help='Simulation pacing: real time, accelerated by --rate, or as fast as possible')
+    parser.add_argument('--rate', type=float, default=10.0,
+                        help='Simulated seconds per wall second for --clock accelerated')
+    parser.add_argument('--integrator', choices=sorted(INTEGRATORS), default='euler',
+                        help='Attitude integrator')
+    parser.add_argument('--dt', type=float, default=1.0 / 80.0,
+                        help='Simulation (physics) step in seconds')
+    parser.add_argument('--multirate', action='store_true',
+                        help='Run each model at its own rate instead of every step')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Sensor noise seed (logged at start-up when not given)')
+    parser.add_argument('--orbit', action='store_true',
+                        help='Propagate the orbit and environment instead of holding them fixed')
+    parser.add_argument('--altitude', type=float, default=700.0, help='Circular orbit altitude (km)')
+    parser.add_argument('--inclination', type=float, default=98.2, help='Orbit inclination (deg)')
+    parser.add_argument('--wheel-layout', choices=sorted(WHEEL_LAYOUTS), default='legacy',
+                        help='Reaction wheel mounting')
+    parser.add_argument('--record', metavar='LOG', default=None,
+                        help='Record the received TCs and telemetry reads to a command log')
+    parser.add_argument('--replay', metavar='LOG', default=None,
+                        help='Replay a command log as fast as possible, check the telemetry and exit')
+    parser.add_argument('--profile', metavar='N', type=int, default=None,
+                        help='Run N simulation steps headless, print the per-model time breakdown and exit')
     args = parser.parse_args()
     
+    if args.replay:
+        result = command_log.replay(args.replay)
+        speedup = f", {result.speedup:.0f}x the session" if result.speedup else ""
+        print(f"Replayed {result.tcs} TCs and {result.reads} telemetry reads over {result.steps} steps "
+              f"({result.sim_time:.1f} s simulated) in {result.wall_time:.2f} s{speedup}")
+        if not result.identical:
+            print(f"Telemetry differs from the recording at steps {result.mismatches[:10]}")
+            return 1
+        print("Telemetry bit-identical to the recording")
+        return 0
+    
+    orbit = None
+    if args.orbit:
+        orbit = OrbitalElements(semi_major_axis=R_EARTH + args.altitude * 1000.0, eccentricity=0.0,
+                                inclination=args.inclination)
+    simulation = AOCSSimulation(integrator=args.integrator, dt=args.dt,
+                                multirate=args.multirate, seed=args.seed, orbit=orbit,
+                                wheel_layout=args.wheel_layout)
+    
+    if args.profile:
+        profiler = simulation.enable_profiling()
+        simulation.start()
+        for i, rw in enumerate(simulation.reaction_wheels):
+            rw.commanded_torque = 0.001 * (i + 1)
+        for _ in range(args.profile):
+            simulation.step()
+        print(f"{profiler.steps} steps ({simulation.time:.1f} s simulated), "
+              f"{1e9 / max(profiler.step.mean_ns, 1):,.0f} steps/s\n")
+        print(profiler.report())
+        return 0
+    
     print(f"""
 ╔═══════════════════════════════════════════════════════════════╗
 ║                    MOCK AOCS SERVER                           ║
@@ -48,7 +121,16 @@ def main():
 ╚═══════════════════════════════════════════════════════════════╝
 """)
     
-    server = MockAOCSServer(host=args.host, port=args.port)
+    server = MockAOCSServer(
+        host=args.host,
+        port=args.port,
+        max_batch_packets=args.max_batch_packets,
+        max_batch_latency=args.max_batch_latency,
+        max_segment_data=args.max_segment_data,
+        clock=SimulationClock(ClockMode(args.clock), rate=args.rate),
+        simulation=simulation,
+        record=args.record,
+    )
     
     try:
         asyncio.run(server.start())
@@ -58,6 +140,6 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
 
 
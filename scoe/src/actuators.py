@@ -0,0 +1,116 @@
+"""
+Actuator Configuration
+Mounting matrices and torque allocation for the AOCS actuators
+
+Each actuator class maps its per-unit scalars to body torque through one
+(3, N) matrix, one column per unit:
+- wheels: torque direction of each wheel (its spin axis), so the body
+  torque is wheels @ reaction torques
+- thrusters: (position - centre of mass) x direction, the body torque
+  per newton of thrust
+- rods: dipole axis of each rod; the body torque is (rods @ dipoles) x B
+
+The columns come from the equipment models (ReactionWheel.axis,
+Thruster.position/direction, TorqueRod.axis), so the matrices must be
+rebuilt after changing the mounting or the centre of mass
+(AOCSSimulation.configure_actuators).
+
+allocate_wheels and allocate_rods give the minimum-norm commands for a
+demanded body torque through the pseudo-inverses of the matrices; wheel
+commands beyond the given torque limits are scaled down as one vector.
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Axis = Tuple[float, float, float]
+
+
+def pyramid(count: int = 4, elevation: float = math.degrees(math.asin(1 / math.sqrt(3)))) -> List[Axis]:
+    """Wheel axes evenly spaced in azimuth around +Z, tilted up by elevation (deg)"""
+    el = math.radians(elevation)
+    return [(math.cos(el) * math.cos(az), math.cos(el) * math.sin(az), math.sin(el))
+            for az in (2 * math.pi * (k + 0.5) / count for k in range(count))]
+
+
+# Wheel torque directions per layout (4 wheels)
+WHEEL_LAYOUTS: Dict[str, List[Axis]] = {
+    # Original model: every wheel drives X and Y with half its torque
+    'legacy': [(0.5, 0.5, 0.0)] * 4,
+    # Three orthogonal wheels plus a skewed redundant one
+    'orthogonal': [(1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0),
+                   (1 / math.sqrt(3), 1 / math.sqrt(3), 1 / math.sqrt(3))],
+    # Pyramid with equal authority on all axes
+    'pyramid': pyramid(4),
+}
+
+
+def _columns(vectors: Sequence) -> np.ndarray:
+    """(3, N) matrix from objects with x, y, z"""
+    matrix = np.zeros((3, len(vectors)))
+    for i, v in enumerate(vectors):
+        matrix[:, i] = (v.x, v.y, v.z)
+    return matrix
+
+
+class ActuatorMatrices:
+    """Mounting matrices of the wheels, thrusters and torque rods"""
+
+    def __init__(self, wheels: np.ndarray, thrusters: np.ndarray, rods: np.ndarray):
+        self.wheels = wheels
+        self.thrusters = thrusters
+        self.rods = rods
+        self.wheel_allocation = np.linalg.pinv(wheels) if wheels.size else np.zeros((0, 3))
+        self.rod_allocation = np.linalg.pinv(rods) if rods.size else np.zeros((0, 3))
+
+    @classmethod
+    def from_equipment(cls, wheels: Sequence, thrusters: Sequence, rods: Sequence,
+                       com) -> 'ActuatorMatrices':
+        arms = _columns([t.position for t in thrusters]) - np.array([[com.x], [com.y], [com.z]])
+        directions = _columns([t.direction for t in thrusters])
+        return cls(_columns([w.axis for w in wheels]),
+                   np.cross(arms, directions, axis=0),
+                   _columns([r.axis for r in rods]))
+
+    def body_torque(self, wheel_torque: Sequence[float], thrust: Sequence[float],
+                    dipole: Sequence[float], field: Sequence[float]) -> np.ndarray:
+        """Body torque from wheel reaction torques, thrusts (N), rod dipoles and field"""
+        return self.wheels @ wheel_torque + self.thrusters @ thrust + self.rod_torque(dipole, field)
+
+    def rod_torque(self, dipole: Sequence[float], field: Sequence[float]) -> np.ndarray:
+        """Body torque (rods @ dipoles) x B of the rod dipoles (Am^2) in a field"""
+        mx, my, mz = (self.rods @ dipole).tolist()
+        bx, by, bz = field
+        return np.array((my * bz - mz * by, mz * bx - mx * bz, mx * by - my * bx))
+
+    def allocate_wheels(self, torque: Sequence[float],
+                        limits: Optional[Sequence[float]] = None) -> np.ndarray:
+        """
+        Wheel torque commands (Nm) for a body torque (reaction = -command)
+
+        With per-wheel torque limits, a command vector that exceeds any
+        of them is scaled down as a whole until the largest command is at
+        its limit: the body torque keeps its direction with a smaller
+        magnitude, and every wheel can apply what it is commanded.
+        """
+        commands = -(self.wheel_allocation @ torque)
+        if limits is not None and commands.size:
+            scale = np.max(np.abs(commands) / np.asarray(limits, dtype=float))
+            if scale > 1.0:
+                commands /= scale
+        return commands
+
+    def allocate_rods(self, torque: Sequence[float], field: Sequence[float]) -> np.ndarray:
+        """
+        Rod dipole commands for a body torque in a field
+
+        Only the torque perpendicular to the field can be produced; the
+        minimum dipole for it is m = (B x T) / |B|^2.
+        """
+        b = np.asarray(field, dtype=float)
+        norm = b @ b
+        if norm <= 0:
+            return np.zeros(self.rods.shape[1])
+        return self.rod_allocation @ (np.cross(b, torque) / norm)
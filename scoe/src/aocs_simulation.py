@@ -11,12 +11,22 @@ Simulates:
 
 import math
 import time
-import random
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from enum import IntEnum
 import numpy as np
 
+import checkpoint as checkpoints
+from checkpoint import Checkpoint
+from actuators import ActuatorMatrices, WHEEL_LAYOUTS
+from environment import Ephemeris, OrbitalElements
+from integrators import make_integrator
+from sensor_noise import NoiseService, NoiseStream
+from telemetry_table import TelemetryTable
+from scheduler import RateScheduler
+from profiler import StepProfiler
+from faults import FaultEngine
+
 
 class EquipmentState(IntEnum):
     """Equipment power state"""
@@ -112,6 +122,10 @@ class Quaternion:
 @dataclass
 class ReactionWheel:
     """Reaction Wheel model based on Section 7.6.1"""
+    # Update rates (Hz) with multi-rate scheduling
+    RATE = 80.0
+    THERMAL_RATE = 0.1
+    
     wheel_id: int
     state: EquipmentState = EquipmentState.OFF
     mode: RWMode = RWMode.STANDBY
@@ -121,6 +135,8 @@ class ReactionWheel:
     inertia: float = 0.01  # kg*m^2
     max_speed: float = 6000.0  # RPM
     max_torque: float = 0.2  # Nm
+    # Body torque per Nm of wheel torque (spin axis; see actuators.py)
+    axis: Vector3 = field(default_factory=lambda: Vector3(0.5, 0.5, 0.0))
     
     # Current state
     speed: float = 0.0  # RPM
@@ -132,18 +148,32 @@ class ReactionWheel:
     current: float = 0.0  # Amps
     voltage: float = 28.0  # Volts
     
+    # Bearing friction torque (Nm): friction spins the wheel down while
+    # coasting, drag also acts while the motor drives it (fault injection)
+    friction: float = 0.001
+    drag: float = 0.0
+    
     # Errors/faults
     fault_flags: int = 0
     
     # Noise parameters
     speed_noise_std: float = 0.5  # RPM
     torque_noise_std: float = 0.001  # Nm
+    # Torque noise, and speed measurement noise drawn on telemetry reads
+    # (separate, so polling telemetry does not change the dynamics)
+    noise: NoiseStream = field(default_factory=NoiseStream, repr=False, compare=False)
+    measurement_noise: NoiseStream = field(default_factory=NoiseStream, repr=False, compare=False)
     
     def update(self, dt: float):
         """Update wheel state for timestep dt"""
+        self.update_speed(dt)
+        self.update_thermal(dt)
+    
+    def update_speed(self, dt: float):
+        """Update wheel speed and motor current"""
         if self.state == EquipmentState.OFF or not self.motor_enabled:
             # Spin down due to friction
-            friction_torque = 0.001 * np.sign(self.speed)
+            friction_torque = self.friction * np.sign(self.speed)
             self.speed -= (friction_torque / self.inertia) * dt * 60 / (2 * math.pi)
             if abs(self.speed) < 1:
                 self.speed = 0
@@ -151,8 +181,10 @@ class ReactionWheel:
         
         if self.mode == RWMode.OPERATE:
             # Apply commanded torque with noise
-            actual_torque = self.commanded_torque + random.gauss(0, self.torque_noise_std)
+            actual_torque = self.commanded_torque + self.noise.gauss(self.torque_noise_std)
             actual_torque = max(-self.max_torque, min(self.max_torque, actual_torque))
+            if self.drag and self.speed:
+                actual_torque -= math.copysign(self.drag, self.speed)
             
             # Update speed (RPM)
             angular_accel = actual_torque / self.inertia  # rad/s^2
@@ -161,14 +193,17 @@ class ReactionWheel:
             
             # Update current based on torque
             self.current = abs(self.commanded_torque) * 5.0 + 0.1  # Simplified model
-            
-            # Temperature model
-            power = self.current * self.voltage
-            self.temperature += power * 0.001 * dt - (self.temperature - 25.0) * 0.01 * dt
+    
+    def update_thermal(self, dt: float):
+        """Update motor temperature"""
+        if self.state == EquipmentState.OFF or not self.motor_enabled or self.mode != RWMode.OPERATE:
+            return
+        power = self.current * self.voltage
+        self.temperature += power * 0.001 * dt - (self.temperature - 25.0) * 0.01 * dt
     
     def get_measured_speed(self) -> float:
         """Get speed with measurement noise"""
-        return self.speed + random.gauss(0, self.speed_noise_std)
+        return self.speed + self.measurement_noise.gauss(self.speed_noise_std)
     
     def get_reaction_torque(self) -> float:
         """Get torque applied to spacecraft (opposite of wheel torque)"""
@@ -198,21 +233,37 @@ class ReactionWheel:
             return True
         return False
     
+    def telemetry_names(self) -> Tuple[str, ...]:
+        return (
+            f'rw{self.wheel_id}_speed',
+            f'rw{self.wheel_id}_temperature',
+            f'rw{self.wheel_id}_current',
+            f'rw{self.wheel_id}_cmd_torque',
+            f'rw{self.wheel_id}_mode',
+            f'rw{self.wheel_id}_motor_enabled',
+        )
+    
+    def telemetry_values(self) -> Tuple[float, ...]:
+        """Current values, in telemetry_names() order"""
+        return (
+            self.get_measured_speed(),
+            self.temperature,
+            self.current,
+            self.commanded_torque,
+            float(self.mode),
+            float(self.motor_enabled),
+        )
+    
     def get_telemetry(self) -> Dict[str, float]:
         """Get telemetry dictionary"""
-        return {
-            f'rw{self.wheel_id}_speed': self.get_measured_speed(),
-            f'rw{self.wheel_id}_temperature': self.temperature,
-            f'rw{self.wheel_id}_current': self.current,
-            f'rw{self.wheel_id}_cmd_torque': self.commanded_torque,
-            f'rw{self.wheel_id}_mode': float(self.mode),
-            f'rw{self.wheel_id}_motor_enabled': float(self.motor_enabled),
-        }
+        return dict(zip(self.telemetry_names(), self.telemetry_values()))
 
 
 @dataclass
 class Magnetometer:
     """Magnetometer model based on Section 7.5.3"""
+    RATE = 10.0  # Hz (multi-rate scheduling)
+    
     state: EquipmentState = EquipmentState.OFF
     op_mode: int = 0  # 0=Init, 1=Service, 2=Operational
     
@@ -223,6 +274,7 @@ class Magnetometer:
     
     # Noise
     noise_std: float = 10.0  # nT
+    noise: NoiseStream = field(default_factory=NoiseStream, repr=False, compare=False)
     
     # Measured field
     measured_field: Vector3 = field(default_factory=Vector3)
@@ -234,24 +286,40 @@ class Magnetometer:
             return
         
         # Apply scale factor and bias
+        gauss = self.noise.gauss
         self.measured_field = Vector3(
-            true_field.x * self.scale_factor.x + self.bias.x + random.gauss(0, self.noise_std),
-            true_field.y * self.scale_factor.y + self.bias.y + random.gauss(0, self.noise_std),
-            true_field.z * self.scale_factor.z + self.bias.z + random.gauss(0, self.noise_std)
+            true_field.x * self.scale_factor.x + self.bias.x + gauss(self.noise_std),
+            true_field.y * self.scale_factor.y + self.bias.y + gauss(self.noise_std),
+            true_field.z * self.scale_factor.z + self.bias.z + gauss(self.noise_std)
+        )
+    
+    def telemetry_names(self) -> Tuple[str, ...]:
+        return (
+            'mag_x',
+            'mag_y',
+            'mag_z',
+            'mag_mode',
+        )
+    
+    def telemetry_values(self) -> Tuple[float, ...]:
+        """Current values, in telemetry_names() order"""
+        return (
+            self.measured_field.x,
+            self.measured_field.y,
+            self.measured_field.z,
+            float(self.op_mode),
         )
     
     def get_telemetry(self) -> Dict[str, float]:
-        return {
-            'mag_x': self.measured_field.x,
-            'mag_y': self.measured_field.y,
-            'mag_z': self.measured_field.z,
-            'mag_mode': float(self.op_mode),
-        }
+        """Get telemetry dictionary"""
+        return dict(zip(self.telemetry_names(), self.telemetry_values()))
 
 
 @dataclass
 class RateSensor:
     """Rate Sensor (Gyro) model based on Section 7.5.2"""
+    RATE = 80.0  # Hz (multi-rate scheduling)
+    
     state: EquipmentState = EquipmentState.OFF
     
     # Error parameters
@@ -268,18 +336,22 @@ class RateSensor:
     # Measured rate
     measured_rate: Vector3 = field(default_factory=Vector3)
     
+    noise: NoiseStream = field(default_factory=NoiseStream, repr=False, compare=False)
+    
     def update(self, true_rate: Vector3, dt: float):
         """Update rate sensor reading"""
         if self.state == EquipmentState.OFF:
             self.measured_rate = Vector3()
             return
         
+        gauss = self.noise.gauss
+        
         # Update bias drift (random walk)
         rrw_sigma = self.rrw * math.sqrt(dt) / 3600  # Convert to deg/s
         self.current_bias = Vector3(
-            self.current_bias.x + random.gauss(0, rrw_sigma),
-            self.current_bias.y + random.gauss(0, rrw_sigma),
-            self.current_bias.z + random.gauss(0, rrw_sigma)
+            self.current_bias.x + gauss(rrw_sigma),
+            self.current_bias.y + gauss(rrw_sigma),
+            self.current_bias.z + gauss(rrw_sigma)
         )
         
         # ARW noise
@@ -287,9 +359,9 @@ class RateSensor:
         
         # Apply errors
         self.measured_rate = Vector3(
-            true_rate.x * (1 + self.scale_factor_error) + self.bias.x + self.current_bias.x + random.gauss(0, arw_sigma),
-            true_rate.y * (1 + self.scale_factor_error) + self.bias.y + self.current_bias.y + random.gauss(0, arw_sigma),
-            true_rate.z * (1 + self.scale_factor_error) + self.bias.z + self.current_bias.z + random.gauss(0, arw_sigma)
+            true_rate.x * (1 + self.scale_factor_error) + self.bias.x + self.current_bias.x + gauss(arw_sigma),
+            true_rate.y * (1 + self.scale_factor_error) + self.bias.y + self.current_bias.y + gauss(arw_sigma),
+            true_rate.z * (1 + self.scale_factor_error) + self.bias.z + self.current_bias.z + gauss(arw_sigma)
         )
         
         # Quantization
@@ -299,17 +371,31 @@ class RateSensor:
             round(self.measured_rate.z / self.quantization) * self.quantization
         )
     
+    def telemetry_names(self) -> Tuple[str, ...]:
+        return (
+            'gyro_x',
+            'gyro_y',
+            'gyro_z',
+        )
+    
+    def telemetry_values(self) -> Tuple[float, ...]:
+        """Current values, in telemetry_names() order"""
+        return (
+            self.measured_rate.x,
+            self.measured_rate.y,
+            self.measured_rate.z,
+        )
+    
     def get_telemetry(self) -> Dict[str, float]:
-        return {
-            'gyro_x': self.measured_rate.x,
-            'gyro_y': self.measured_rate.y,
-            'gyro_z': self.measured_rate.z,
-        }
+        """Get telemetry dictionary"""
+        return dict(zip(self.telemetry_names(), self.telemetry_values()))
 
 
 @dataclass
 class SunSensor:
     """Sun Sensor model based on Section 7.5.1"""
+    RATE = 10.0  # Hz (multi-rate scheduling)
+    
     sensor_id: int
     state: EquipmentState = EquipmentState.OFF
     
@@ -325,6 +411,7 @@ class SunSensor:
     
     # Noise
     noise_std: float = 0.1  # degrees
+    noise: NoiseStream = field(default_factory=NoiseStream, repr=False, compare=False)
     
     def update(self, sun_direction_body: Vector3, in_eclipse: bool):
         """Update sun sensor reading"""
@@ -352,22 +439,144 @@ class SunSensor:
         self.sun_detected = True
         
         # Calculate azimuth and elevation in sensor frame (simplified)
-        self.azimuth = math.atan2(sun_norm.y, sun_norm.x) * 180 / math.pi + random.gauss(0, self.noise_std)
-        self.elevation = math.atan2(sun_norm.z, math.sqrt(sun_norm.x**2 + sun_norm.y**2)) * 180 / math.pi + random.gauss(0, self.noise_std)
-        self.intensity = max(0, cos_angle) + random.gauss(0, 0.01)
+        gauss = self.noise.gauss
+        self.azimuth = math.atan2(sun_norm.y, sun_norm.x) * 180 / math.pi + gauss(self.noise_std)
+        self.elevation = math.atan2(sun_norm.z, math.sqrt(sun_norm.x**2 + sun_norm.y**2)) * 180 / math.pi + gauss(self.noise_std)
+        self.intensity = max(0, cos_angle) + gauss(0.01)
+    
+    def telemetry_names(self) -> Tuple[str, ...]:
+        return (
+            f'ss{self.sensor_id}_detected',
+            f'ss{self.sensor_id}_azimuth',
+            f'ss{self.sensor_id}_elevation',
+            f'ss{self.sensor_id}_intensity',
+        )
+    
+    def telemetry_values(self) -> Tuple[float, ...]:
+        """Current values, in telemetry_names() order"""
+        return (
+            float(self.sun_detected),
+            self.azimuth,
+            self.elevation,
+            self.intensity,
+        )
     
     def get_telemetry(self) -> Dict[str, float]:
-        return {
-            f'ss{self.sensor_id}_detected': float(self.sun_detected),
-            f'ss{self.sensor_id}_azimuth': self.azimuth,
-            f'ss{self.sensor_id}_elevation': self.elevation,
-            f'ss{self.sensor_id}_intensity': self.intensity,
-        }
+        """Get telemetry dictionary"""
+        return dict(zip(self.telemetry_names(), self.telemetry_values()))
+
+
+class SunSensorArray:
+    """
+    All sun sensor heads evaluated together
+    
+    The ECI sun direction is rotated into the body frame with the attitude
+    once per update, and one matrix-vector product with the (N, 3)
+    boresight matrix gives the sun angle cosine of every head. Power
+    state, field of view, eclipse and noise (one stream for the array,
+    azimuth, elevation and intensity per detected head in head order)
+    are applied to arrays, so the cost per head is a few array elements.
+    Azimuth and elevation are those of the body-frame sun direction.
+    
+    Mounting, field of view, noise level and power state are taken from
+    the SunSensor heads by configure() (AOCSSimulation.configure_sensors
+    after changing them). The outputs (detected, azimuth, elevation,
+    intensity per head) are held here; store() copies them to the heads.
+    """
+    RATE = SunSensor.RATE
+    
+    def __init__(self, heads: List[SunSensor], noise: NoiseStream):
+        self.heads = heads
+        self.noise = noise
+        self.outputs = np.zeros((len(heads), 4))
+        # Telemetry covers the heads present at construction
+        self._telemetry_heads = len(heads)
+        self._names = tuple(name for head in heads for name in head.telemetry_names())
+        self.configure()
+    
+    def configure(self):
+        """Take mounting, field of view, noise and power state from the heads"""
+        heads = self.heads
+        self.boresights = np.array([(h.boresight.x, h.boresight.y, h.boresight.z) for h in heads]).reshape(-1, 3)
+        self.cos_fov = np.cos(np.radians([h.fov for h in heads]))
+        self.powered = np.array([h.state == EquipmentState.ON for h in heads], dtype=bool)
+        self.noise_scale = np.array([(h.noise_std, h.noise_std, 0.01) for h in heads]).reshape(-1, 3)
+        if len(self.outputs) != len(heads):
+            outputs = np.zeros((len(heads), 4))
+            count = min(len(heads), len(self.outputs))
+            outputs[:count] = self.outputs[:count]
+            self.outputs = outputs
+    
+    def load(self):
+        """Take the outputs from the heads (e.g. after a checkpoint restore)"""
+        self.outputs[:] = [(float(h.sun_detected), h.azimuth, h.elevation, h.intensity) for h in self.heads]
+    
+    def store(self):
+        """Copy the outputs to the heads"""
+        for head, (detected, azimuth, elevation, intensity) in zip(self.heads, self.outputs.tolist()):
+            head.sun_detected = bool(detected)
+            head.azimuth = azimuth
+            head.elevation = elevation
+            head.intensity = intensity
+    
+    @staticmethod
+    def sun_body(attitude: Sequence[float], sun_eci: Sequence[float]) -> Tuple[float, float, float]:
+        """Unit sun direction in the body frame (attitude w, x, y, z rotates body to ECI)"""
+        w, x, y, z = attitude
+        sx, sy, sz = sun_eci
+        bx = (1 - 2 * (y * y + z * z)) * sx + 2 * (x * y + w * z) * sy + 2 * (x * z - w * y) * sz
+        by = 2 * (x * y - w * z) * sx + (1 - 2 * (x * x + z * z)) * sy + 2 * (y * z + w * x) * sz
+        bz = 2 * (x * z + w * y) * sx + 2 * (y * z - w * x) * sy + (1 - 2 * (x * x + y * y)) * sz
+        norm = math.sqrt(bx * bx + by * by + bz * bz)
+        if norm > 0:
+            return bx / norm, by / norm, bz / norm
+        return 0.0, 0.0, 0.0
+    
+    def detect(self, sun_body: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Sun angle cosine per head and the indices of the powered heads seeing the sun"""
+        cos_angle = self.boresights @ sun_body
+        return cos_angle, np.flatnonzero(self.powered & (cos_angle >= self.cos_fov))
+    
+    def measure(self, sun_body: Sequence[float], cos_angle: np.ndarray, detected: np.ndarray,
+                normals: np.ndarray):
+        """Outputs of the detected heads from three standard normals each, zero for the others"""
+        outputs = self.outputs
+        outputs.fill(0.0)
+        if not detected.size:
+            return
+        sx, sy, sz = sun_body
+        values = normals.reshape(-1, 3) * self.noise_scale[detected]
+        values[:, 0] += math.atan2(sy, sx) * 180 / math.pi
+        values[:, 1] += math.atan2(sz, math.sqrt(sx * sx + sy * sy)) * 180 / math.pi
+        values[:, 2] += np.maximum(cos_angle[detected], 0.0)
+        outputs[detected, 0] = 1.0
+        outputs[detected, 1:] = values
+    
+    def update(self, sun_eci: Vector3, attitude: Quaternion, in_eclipse: bool):
+        """Update all heads for the sun direction (ECI) and attitude"""
+        if in_eclipse:
+            self.outputs.fill(0.0)
+            return
+        sun_body = self.sun_body((attitude.w, attitude.x, attitude.y, attitude.z),
+                                 (sun_eci.x, sun_eci.y, sun_eci.z))
+        cos_angle, detected = self.detect(sun_body)
+        self.measure(sun_body, cos_angle, detected, self.noise.normals(3 * detected.size))
+    
+    def telemetry_names(self) -> Tuple[str, ...]:
+        return self._names
+    
+    def telemetry_values(self) -> List[float]:
+        """Current values, in telemetry_names() order"""
+        return self.outputs[:self._telemetry_heads].ravel().tolist()
 
 
 @dataclass
 class Thruster:
     """Electric Propulsion Thruster model based on Section 7.6.2"""
+    # Update rates (Hz) with multi-rate scheduling
+    RATE = 80.0
+    THERMAL_RATE = 1.0  # cooling time constant is 10 s
+    
     thruster_id: int
     state: EquipmentState = EquipmentState.OFF
     firing: bool = False
@@ -381,32 +590,49 @@ class Thruster:
     # Errors
     thrust_error: float = 0.02  # 2% error
     misalignment: float = 0.5  # degrees
+    stuck_open: bool = False  # fires whatever the command (fault injection)
     
     # Telemetry
     temperature: float = 25.0
     propellant_flow: float = 0.0  # g/s
     
+    noise: NoiseStream = field(default_factory=NoiseStream, repr=False, compare=False)
+    
     def update(self, dt: float):
         """Update thruster state"""
+        self.update_flow()
+        self.update_thermal(dt)
+    
+    def update_flow(self):
+        """Update firing state and propellant flow"""
         if self.state == EquipmentState.OFF:
             self.firing = False
             self.propellant_flow = 0.0
             return
         
+        if self.stuck_open:
+            self.firing = True
         if self.firing:
             # Calculate flow rate: thrust = Isp * g0 * mdot
             g0 = 9.81
             self.propellant_flow = self.get_actual_thrust() / (self.isp * g0) * 1000  # g/s
-            self.temperature += 0.5 * dt  # Heat up while firing
         else:
             self.propellant_flow = 0.0
+    
+    def update_thermal(self, dt: float):
+        """Update thruster temperature"""
+        if self.state == EquipmentState.OFF:
+            return
+        if self.firing:
+            self.temperature += 0.5 * dt  # Heat up while firing
+        else:
             self.temperature -= (self.temperature - 25.0) * 0.1 * dt  # Cool down
     
     def get_actual_thrust(self) -> float:
         """Get actual thrust with errors"""
         if not self.firing or self.state == EquipmentState.OFF:
             return 0.0
-        return self.thrust_nominal * (1 + random.gauss(0, self.thrust_error))
+        return self.thrust_nominal * (1 + self.noise.gauss(self.thrust_error))
     
     def get_force_torque(self, com: Vector3) -> Tuple[Vector3, Vector3]:
         """Get force and torque on spacecraft"""
@@ -426,12 +652,24 @@ class Thruster:
         
         return force, torque
     
+    def telemetry_names(self) -> Tuple[str, ...]:
+        return (
+            f'thr{self.thruster_id}_firing',
+            f'thr{self.thruster_id}_temperature',
+            f'thr{self.thruster_id}_flow',
+        )
+    
+    def telemetry_values(self) -> Tuple[float, ...]:
+        """Current values, in telemetry_names() order"""
+        return (
+            float(self.firing),
+            self.temperature,
+            self.propellant_flow,
+        )
+    
     def get_telemetry(self) -> Dict[str, float]:
-        return {
-            f'thr{self.thruster_id}_firing': float(self.firing),
-            f'thr{self.thruster_id}_temperature': self.temperature,
-            f'thr{self.thruster_id}_flow': self.propellant_flow,
-        }
+        """Get telemetry dictionary"""
+        return dict(zip(self.telemetry_names(), self.telemetry_values()))
 
 
 @dataclass
@@ -469,16 +707,29 @@ class TorqueRod:
             m.x * magnetic_field.y - m.y * magnetic_field.x
         )
     
+    def telemetry_names(self) -> Tuple[str, ...]:
+        return (
+            f'mtr{self.rod_id}_dipole',
+            f'mtr{self.rod_id}_commanded',
+        )
+    
+    def telemetry_values(self) -> Tuple[float, ...]:
+        """Current values, in telemetry_names() order"""
+        return (
+            self.get_actual_dipole(),
+            self.commanded_dipole,
+        )
+    
     def get_telemetry(self) -> Dict[str, float]:
-        return {
-            f'mtr{self.rod_id}_dipole': self.get_actual_dipole(),
-            f'mtr{self.rod_id}_commanded': self.commanded_dipole,
-        }
+        """Get telemetry dictionary"""
+        return dict(zip(self.telemetry_names(), self.telemetry_values()))
 
 
 @dataclass
 class SADA:
     """Solar Array Driving Assembly model based on Section 7.6.4"""
+    RATE = 1.0  # Hz (multi-rate scheduling)
+    
     sada_id: int
     state: EquipmentState = EquipmentState.OFF
     deployed: bool = False
@@ -503,13 +754,26 @@ class SADA:
         rate = max(-self.max_rate, min(self.max_rate, error / dt if dt > 0 else 0))
         self.angle += rate * dt
     
+    def telemetry_names(self) -> Tuple[str, ...]:
+        return (
+            f'sada{self.sada_id}_angle',
+            f'sada{self.sada_id}_commanded',
+            f'sada{self.sada_id}_deployed',
+            f'sada{self.sada_id}_temperature',
+        )
+    
+    def telemetry_values(self) -> Tuple[float, ...]:
+        """Current values, in telemetry_names() order"""
+        return (
+            self.angle,
+            self.commanded_angle,
+            float(self.deployed),
+            self.temperature,
+        )
+    
     def get_telemetry(self) -> Dict[str, float]:
-        return {
-            f'sada{self.sada_id}_angle': self.angle,
-            f'sada{self.sada_id}_commanded': self.commanded_angle,
-            f'sada{self.sada_id}_deployed': float(self.deployed),
-            f'sada{self.sada_id}_temperature': self.temperature,
-        }
+        """Get telemetry dictionary"""
+        return dict(zip(self.telemetry_names(), self.telemetry_values()))
 
 
 @dataclass
@@ -532,34 +796,65 @@ class SpacecraftState:
     sun_direction_eci: Vector3 = field(default_factory=lambda: Vector3(1, 0, 0))
     magnetic_field_eci: Vector3 = field(default_factory=lambda: Vector3(0, 0, 30000))  # nT
     in_eclipse: bool = False
+    atmospheric_density: float = 0.0  # kg/m^3
 
 
 class AOCSSimulation:
     """Complete AOCS Simulation integrating all models"""
     
-    def __init__(self):
+    # Spacecraft-level telemetry (ahead of the equipment telemetry)
+    CORE_TELEMETRY = (
+        'sim_time', 'sim_running',
+        'att_q_w', 'att_q_x', 'att_q_y', 'att_q_z',
+        'rate_x', 'rate_y', 'rate_z',
+        'pos_x', 'pos_y', 'pos_z',
+        'in_eclipse', 'faults_active',
+    )
+    
+    def __init__(self, engine: str = 'object', seed: Optional[int] = None,
+                 integrator: str = 'euler', dt: float = 1.0 / 80.0, multirate: bool = False,
+                 orbit: Optional[OrbitalElements] = None, wheel_layout: str = 'legacy'):
+        # Constructor arguments, for building forks of this simulation
+        self.config = {'engine': engine, 'integrator': integrator, 'dt': dt, 'multirate': multirate,
+                       'orbit': orbit, 'wheel_layout': wheel_layout}
+        if wheel_layout not in WHEEL_LAYOUTS:
+            raise ValueError(f"Unknown wheel layout '{wheel_layout}'")
+        
         # Simulation parameters
-        self.dt = 1.0 / 80.0  # 80 Hz
+        self.dt = dt  # 80 Hz by default
         self.time = 0.0
         self.running = False
         
         # Spacecraft state
         self.state = SpacecraftState()
         
+        # Orbit and environment from an ephemeris table (see environment.py);
+        # without orbital elements they stay at their initial values
+        self.ephemeris = Ephemeris(orbit) if orbit is not None else None
+        self._update_environment()
+        
+        # One seeded noise stream per noise source (see sensor_noise.py);
+        # noise.seed reproduces a run started without a seed
+        self.noise = NoiseService(seed)
+        noise = self.noise.stream
+        
         # Sensors
-        self.magnetometer = Magnetometer()
-        self.rate_sensor = RateSensor()
+        self.magnetometer = Magnetometer(noise=noise('mag'))
+        self.rate_sensor = RateSensor(noise=noise('gyro'))
         self.sun_sensors = [
-            SunSensor(i, boresight=Vector3(*b)) 
+            SunSensor(i, boresight=Vector3(*b))
             for i, b in enumerate([
                 (1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)
             ])
         ]
         
         # Actuators
-        self.reaction_wheels = [ReactionWheel(i) for i in range(4)]
+        self.reaction_wheels = [
+            ReactionWheel(i, axis=Vector3(*axis), noise=noise(f'rw{i}'), measurement_noise=noise(f'rw{i}_tm'))
+            for i, axis in enumerate(WHEEL_LAYOUTS[wheel_layout])
+        ]
         self.thrusters = [
-            Thruster(i, position=Vector3(*p), direction=Vector3(*d))
+            Thruster(i, position=Vector3(*p), direction=Vector3(*d), noise=noise(f'thr{i}'))
             for i, (p, d) in enumerate([
                 ((1, 0, 0), (-1, 0, 0)),  # +X thruster
                 ((-1, 0, 0), (1, 0, 0)),  # -X thruster
@@ -575,6 +870,46 @@ class AOCSSimulation:
         
         # Initialize all equipment to ON
         self._power_on_all()
+        
+        # Actuator mounting matrices (rebuilt by configure_actuators) and
+        # the sun sensor heads as one array (configure_sensors)
+        self.configure_actuators()
+        self.sun_sensor_array = SunSensorArray(self.sun_sensors, noise('sun_sensors'))
+        
+        # Telemetry parameter table, written at most once per step when read
+        self._telemetry_models = [
+            self.magnetometer, self.rate_sensor, self.sun_sensor_array,
+            *self.reaction_wheels, *self.thrusters, *self.torque_rods, *self.sadas,
+        ]
+        self.telemetry = TelemetryTable(
+            list(self.CORE_TELEMETRY) +
+            [name for model in self._telemetry_models for name in model.telemetry_names()])
+        self._telemetry_slots = slice(0, len(self.telemetry))
+        self._telemetry_stale = True
+        
+        # Injected equipment faults, scheduled by simulated time (faults.py)
+        self.faults = FaultEngine(self)
+        
+        # Step engine: 'object' (per-model updates below) or 'numpy'
+        # (vectorized state arrays, see sim_engine.py)
+        # Attitude integrator: None keeps the legacy Euler update below
+        self.integrator = None if integrator == 'euler' else make_integrator(integrator)
+        
+        # Model tasks per step: every model every step, or each at its own
+        # rate with multirate (see scheduler.py)
+        self.scheduler = self._build_scheduler(multirate)
+        
+        if engine == 'numpy':
+            if self.integrator is not None:
+                raise ValueError("The numpy engine only supports the euler integrator")
+            if multirate:
+                raise ValueError("The numpy engine does not support multi-rate scheduling")
+            from sim_engine import VectorEngine
+            self.engine = VectorEngine(self)
+        elif engine == 'object':
+            self.engine = None
+        else:
+            raise ValueError(f"Unknown simulation engine '{engine}'")
     
     def _power_on_all(self):
         """Power on all equipment"""
@@ -599,38 +934,170 @@ class AOCSSimulation:
         """Perform one simulation step"""
         if not self.running:
             return
+        self._telemetry_stale = True
+        if self.time >= self.faults.next_event:
+            self.faults.update()
+        if self.engine is not None:
+            self._update_environment()
+            self.engine.advance(1)
+            return
         
-        # Calculate total torque from actuators
-        total_torque = Vector3()
+        self.scheduler.run_frame(self.dt)
+        self.time += self.dt
+    
+    def _build_scheduler(self, multirate: bool) -> RateScheduler:
+        """Model tasks in frame order (environment, actuators, dynamics, thermal, sensors)"""
+        scheduler = RateScheduler(self.dt)
         
-        # Reaction wheel torques
-        for rw in self.reaction_wheels:
-            rw.update(self.dt)
-            # Simplified: assume wheels aligned with body axes
-            # In reality, would use wheel orientation matrix
-            total_torque.x += rw.get_reaction_torque() * 0.5  # Wheel 0,1 contribute to X
-            total_torque.y += rw.get_reaction_torque() * 0.5  # Wheel 2,3 contribute to Y
+        def rate(model_rate: float) -> Optional[float]:
+            return model_rate if multirate else None
         
-        # Thruster torques
+        if self.ephemeris is not None:
+            scheduler.add('environment', None, self._update_environment)
+        scheduler.add('wheels', rate(ReactionWheel.RATE), self._update_wheels)
+        scheduler.add('thrusters', rate(Thruster.RATE), self._update_thrusters)
+        # Torques and attitude at the control loop rate
+        scheduler.add('rods', None, self._update_rods)
+        scheduler.add('dynamics', None, self._update_dynamics)
+        scheduler.add('quaternion', None, self._update_attitude)
+        scheduler.add('wheel_thermal', rate(ReactionWheel.THERMAL_RATE), self._update_wheel_thermal)
+        scheduler.add('thruster_thermal', rate(Thruster.THERMAL_RATE), self._update_thruster_thermal)
+        scheduler.add('magnetometer', rate(Magnetometer.RATE), self._update_magnetometer)
+        scheduler.add('rate_sensor', rate(RateSensor.RATE), self._update_rate_sensor)
+        scheduler.add('sun_sensors', rate(SunSensorArray.RATE), self._update_sun_sensors)
+        scheduler.add('sadas', rate(SADA.RATE), self._update_sadas)
+        return scheduler
+    
+    def enable_profiling(self, enabled: bool = True) -> Optional[StepProfiler]:
+        """Time every model phase of step() into histograms (object engine only)"""
+        if not enabled:
+            self.scheduler.profiler = None
+            return None
+        if self.engine is not None:
+            raise ValueError("Profiling times the object engine's model tasks")
+        if self.scheduler.profiler is None:
+            self.scheduler.profiler = StepProfiler()
+        return self.scheduler.profiler
+    
+    @property
+    def profiler(self) -> Optional[StepProfiler]:
+        """Attached step profiler, if profiling is enabled"""
+        return self.scheduler.profiler
+    
+    def _update_environment(self, dt: float = 0.0):
+        """Orbit and environment at the current time"""
+        if self.ephemeris is None:
+            return
+        position, velocity, sun, magnetic_field, density, eclipse = self.ephemeris.sample(self.time)
+        st = self.state
+        st.position = Vector3(*position)
+        st.velocity = Vector3(*velocity)
+        st.sun_direction_eci = Vector3(*sun)
+        st.magnetic_field_eci = Vector3(*magnetic_field)
+        st.atmospheric_density = density
+        st.in_eclipse = eclipse
+    
+    def _update_wheels(self, dt: float):
+        for rw in self.reaction_wheels:
+            rw.update_speed(dt)
+    
+    def _update_thrusters(self, dt: float):
         for thr in self.thrusters:
-            thr.update(self.dt)
-            _, torque = thr.get_force_torque(self.state.com)
-            total_torque = total_torque + torque
-        
-        # Torque rod torques
-        for mtr in self.torque_rods:
-            torque = mtr.get_torque(self.state.magnetic_field_eci)
-            total_torque = total_torque + torque
+            thr.update_flow()
+    
+    def _update_rods(self, dt: float):
+        """Torque rod torque in the current field"""
+        field = self.state.magnetic_field_eci
+        self._rod_torque = self.actuators.rod_torque(
+            [mtr.get_actual_dipole() for mtr in self.torque_rods], (field.x, field.y, field.z))
+    
+    def _update_dynamics(self, dt: float):
+        """Total body torque and, with the legacy update, the angular rate"""
+        # One matrix product per actuator class
+        actuators = self.actuators
+        self._body_torque = (
+            actuators.wheels @ [rw.get_reaction_torque() for rw in self.reaction_wheels]
+            + actuators.thrusters @ [thr.get_actual_thrust() for thr in self.thrusters]
+            + self._rod_torque).tolist()
+        if self.integrator is None:
+            tx, ty, tz = self._body_torque
+            self._euler_rate(Vector3(tx, ty, tz))
+    
+    def _update_attitude(self, dt: float):
+        """Attitude propagation (the integrators propagate rate and attitude together)"""
+        if self.integrator is None:
+            self._euler_quaternion()
+            return
+        q = self.state.quaternion
+        w = self.state.angular_rate
+        inertia = self.state.inertia
+        (qw, qx, qy, qz), (wx, wy, wz) = self.integrator.propagate(
+            (q.w, q.x, q.y, q.z), (w.x, w.y, w.z), (inertia.x, inertia.y, inertia.z),
+            self._body_torque, dt)
+        self.state.quaternion = Quaternion(qw, qx, qy, qz)
+        self.state.angular_rate = Vector3(wx, wy, wz)
+    
+    def configure_actuators(self):
+        """Rebuild the actuator matrices after changing the mounting or centre of mass"""
+        self.actuators = ActuatorMatrices.from_equipment(
+            self.reaction_wheels, self.thrusters, self.torque_rods, self.state.com)
+    
+    def configure_sensors(self):
+        """Rebuild the sun sensor array after changing sun sensor mounting or power state"""
+        self.sun_sensor_array.configure()
+    
+    def command_torque(self, torque: Tuple[float, float, float]):
+        """
+        Command the reaction wheels to produce a body torque (Nm)
         
-        # Update angular rate (simplified Euler dynamics)
+        Demands beyond the wheel torque limits are scaled down in the
+        same direction (see ActuatorMatrices.allocate_wheels).
+        """
+        wheels = self.reaction_wheels
+        commands = self.actuators.allocate_wheels(torque, [rw.max_torque for rw in wheels])
+        for rw, command in zip(wheels, commands.tolist()):
+            rw.commanded_torque = command
+    
+    def _update_wheel_thermal(self, dt: float):
+        for rw in self.reaction_wheels:
+            rw.update_thermal(dt)
+    
+    def _update_thruster_thermal(self, dt: float):
+        for thr in self.thrusters:
+            thr.update_thermal(dt)
+    
+    def _update_magnetometer(self, dt: float):
+        self.magnetometer.update(self.state.magnetic_field_eci)
+    
+    def _update_rate_sensor(self, dt: float):
+        self.rate_sensor.update(
+            Vector3(
+                self.state.angular_rate.x * 180 / math.pi,
+                self.state.angular_rate.y * 180 / math.pi,
+                self.state.angular_rate.z * 180 / math.pi
+            ),
+            dt
+        )
+    
+    def _update_sun_sensors(self, dt: float):
+        st = self.state
+        self.sun_sensor_array.update(st.sun_direction_eci, st.quaternion, st.in_eclipse)
+    
+    def _update_sadas(self, dt: float):
+        for sada in self.sadas:
+            sada.update(dt)
+    
+    def _euler_rate(self, total_torque: Vector3):
+        """Legacy angular rate update (simplified Euler dynamics, no gyroscopic coupling)"""
         alpha = Vector3(
             total_torque.x / self.state.inertia.x,
             total_torque.y / self.state.inertia.y,
             total_torque.z / self.state.inertia.z
         )
         self.state.angular_rate = self.state.angular_rate + alpha * self.dt
-        
-        # Update quaternion (simplified)
+    
+    def _euler_quaternion(self):
+        """Legacy quaternion update (simplified)"""
         omega = self.state.angular_rate
         q = self.state.quaternion
         dq = Quaternion(
@@ -645,69 +1112,64 @@ class AOCSSimulation:
             q.y + dq.y * self.dt,
             q.z + dq.z * self.dt
         ).normalize()
+    
+    def advance(self, steps: int):
+        """Perform a number of simulation steps with the current commands"""
+        if not self.running:
+            return
+        if self.engine is not None:
+            # Environment held constant over the batch, like the commands;
+            # batches end at fault events
+            self._telemetry_stale = True
+            faults = self.faults
+            while steps > 0:
+                if self.time >= faults.next_event:
+                    faults.update()
+                batch = faults.steps_until(steps)
+                self._update_environment()
+                self.engine.advance(batch)
+                steps -= batch
+        else:
+            for _ in range(steps):
+                self.step()
+    
+    def refresh_telemetry(self) -> np.ndarray:
+        """
+        Write the current telemetry into the table and return its values
         
-        # Update sensors
-        self.magnetometer.update(self.state.magnetic_field_eci)
-        self.rate_sensor.update(
-            Vector3(
-                self.state.angular_rate.x * 180 / math.pi,
-                self.state.angular_rate.y * 180 / math.pi,
-                self.state.angular_rate.z * 180 / math.pi
-            ),
-            self.dt
-        )
-        for ss in self.sun_sensors:
-            ss.update(self.state.sun_direction_eci, self.state.in_eclipse)
-        
-        # Update SADA
-        for sada in self.sadas:
-            sada.update(self.dt)
+        While running, the table is written once per step and further
+        reads in the same step reuse it (one noise draw per measurement).
+        When stopped it is rewritten on every read, as only commands
+        change the telemetry then.
+        """
+        table = self.telemetry
+        if self.running and not self._telemetry_stale:
+            return table.values
         
-        self.time += self.dt
+        st = self.state
+        q = st.quaternion
+        rate = st.angular_rate
+        pos = st.position
+        values = [
+            self.time, float(self.running),
+            q.w, q.x, q.y, q.z,
+            # Angular rate (deg/s)
+            rate.x * 180 / math.pi, rate.y * 180 / math.pi, rate.z * 180 / math.pi,
+            pos.x, pos.y, pos.z,
+            float(st.in_eclipse), float(len(self.faults.active)),
+        ]
+        for model in self._telemetry_models:
+            values += model.telemetry_values()
+        table.values[self._telemetry_slots] = values
+        if self.faults.outputs:
+            self.faults.apply(table.values)
+        self._telemetry_stale = False
+        return table.values
     
     def get_all_telemetry(self) -> Dict[str, float]:
         """Get all telemetry as a dictionary"""
-        tm = {
-            'sim_time': self.time,
-            'sim_running': float(self.running),
-            
-            # Attitude
-            'att_q_w': self.state.quaternion.w,
-            'att_q_x': self.state.quaternion.x,
-            'att_q_y': self.state.quaternion.y,
-            'att_q_z': self.state.quaternion.z,
-            
-            # Angular rate (deg/s)
-            'rate_x': self.state.angular_rate.x * 180 / math.pi,
-            'rate_y': self.state.angular_rate.y * 180 / math.pi,
-            'rate_z': self.state.angular_rate.z * 180 / math.pi,
-            
-            # Position
-            'pos_x': self.state.position.x,
-            'pos_y': self.state.position.y,
-            'pos_z': self.state.position.z,
-            
-            # Environment
-            'in_eclipse': float(self.state.in_eclipse),
-        }
-        
-        # Add sensor telemetry
-        tm.update(self.magnetometer.get_telemetry())
-        tm.update(self.rate_sensor.get_telemetry())
-        for ss in self.sun_sensors:
-            tm.update(ss.get_telemetry())
-        
-        # Add actuator telemetry
-        for rw in self.reaction_wheels:
-            tm.update(rw.get_telemetry())
-        for thr in self.thrusters:
-            tm.update(thr.get_telemetry())
-        for mtr in self.torque_rods:
-            tm.update(mtr.get_telemetry())
-        for sada in self.sadas:
-            tm.update(sada.get_telemetry())
-        
-        return tm
+        self.refresh_telemetry()
+        return self.telemetry.as_dict(self._telemetry_slots)
     
     def start(self):
         """Start simulation"""
@@ -721,8 +1183,48 @@ class AOCSSimulation:
         """Reset simulation to initial conditions"""
         self.time = 0.0
         self.state = SpacecraftState()
+        self._update_environment()
+        self.configure_actuators()
+        self.noise.reset()
+        self.scheduler.frame = 0
+        self.faults.clear()
+        self._telemetry_stale = True
         for rw in self.reaction_wheels:
             rw.speed = 0.0
             rw.commanded_torque = 0.0
+    
+    def checkpoint(self, extra: bytes = b'') -> Checkpoint:
+        """Binary snapshot of the complete simulation state (see checkpoint.py)"""
+        self.sun_sensor_array.store()
+        with self.faults.suspended():
+            return checkpoints.capture(self, extra)
+    
+    def restore(self, cp: Checkpoint, seed: Optional[int] = None) -> bytes:
+        """Return to a checkpoint, optionally with new noise from seed; returns its extra data"""
+        extra = checkpoints.restore(self, cp, seed)
+        self.configure_actuators()
+        self.configure_sensors()
+        self.sun_sensor_array.load()
+        self.faults.reschedule()
+        self._telemetry_stale = True
+        return extra
+    
+    def fork(self, seeds: Sequence[Optional[int]]) -> List['AOCSSimulation']:
+        """
+        Independent continuations of the current state, one per seed
+        
+        A None seed continues with this simulation's noise (the fork
+        repeats what this simulation will do), any other seed restarts
+        the noise streams from that seed. Forks get the fault schedule.
+        """
+        cp = self.checkpoint()
+        forks = []
+        for seed in seeds:
+            sim = AOCSSimulation(seed=self.noise.seed, **self.config)
+            for fault in self.faults.faults.values():
+                sim.faults.add(fault)
+            sim.restore(cp, seed)
+            forks.append(sim)
+        return forks
 
 
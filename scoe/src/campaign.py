@@ -0,0 +1,318 @@
+"""
+Campaign Runner
+Scenario sweeps of AOCSSimulation runs on a process pool
+
+A Campaign is a base Scenario plus one parameter set per run, built from
+a parameter grid (Campaign.grid) or random dispersions around the
+nominal values (Campaign.dispersed). Parameters are dotted paths into the
+simulation, e.g. 'state.inertia.x', 'rate_sensor.bias.z' or
+'reaction_wheels.2.commanded_torque', applied before the run starts.
+A scenario can also schedule faults (faults.Fault) in every run.
+
+run() submits the runs to a ProcessPoolExecutor and each worker builds
+its own simulation, so runs share nothing and the campaign scales with
+the number of cores. Workers reduce a run to a few figures of merit
+(RunResult) as it goes and only those cross the process boundary; no
+telemetry history is kept or pickled. Results are collected as they
+complete into a CampaignResult, one column per figure of merit and
+parameter, saved as a NumPy .npz (or CSV) file.
+"""
+
+import csv
+import itertools
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from aocs_simulation import AOCSSimulation
+from faults import Fault
+
+Control = Callable[[AOCSSimulation], None]
+
+
+@dataclass
+class RateDamping:
+    """
+    Torque rod rate damping from the gyro and magnetometer measurements
+
+    m = gain * (w x B) / |B|^2 gives a torque m x B = -gain * w
+    perpendicular to B (Nm per rad/s).
+    """
+    gain: float = 2.0
+
+    # Measurements as telemetered, read while output faults are active
+    MEASUREMENTS = ('gyro_x', 'gyro_y', 'gyro_z', 'mag_x', 'mag_y', 'mag_z')
+
+    def __call__(self, sim: AOCSSimulation):
+        if sim.faults.outputs:
+            wx, wy, wz, bx, by, bz = sim.refresh_telemetry()[sim.telemetry.index(self.MEASUREMENTS)].tolist()
+        else:
+            w = sim.rate_sensor.measured_rate
+            b = sim.magnetometer.measured_field
+            wx, wy, wz, bx, by, bz = w.x, w.y, w.z, b.x, b.y, b.z
+        norm = bx * bx + by * by + bz * bz
+        if norm <= 0:
+            return
+        k = self.gain * math.pi / 180 / norm  # gyro in deg/s
+        dipole = (k * (wy * bz - wz * by), k * (wz * bx - wx * bz), k * (wx * by - wy * bx))
+        for rod in sim.torque_rods:
+            rod.commanded_dipole = rod.axis.x * dipole[0] + rod.axis.y * dipole[1] + rod.axis.z * dipole[2]
+
+
+@dataclass
+class Scenario:
+    """Base definition shared by all runs of a campaign"""
+    duration: float = 600.0  # s
+    config: Dict[str, Any] = field(default_factory=dict)  # AOCSSimulation arguments
+    parameters: Dict[str, float] = field(default_factory=dict)  # applied to every run
+    faults: List[Fault] = field(default_factory=list)  # scheduled in every run (faults.py)
+    control: Optional[Control] = field(default_factory=RateDamping)  # must be picklable
+    control_every: int = 8  # steps
+    sample_every: int = 8  # steps between figure of merit samples
+    target: Tuple[float, float, float, float] = (1.0, 0.0, 0.0, 0.0)  # attitude (w, x, y, z)
+    converged_rate: float = 0.05  # deg/s
+    wheel_saturation: float = 0.95  # fraction of max speed
+
+
+@dataclass
+class Run:
+    """One campaign run: its noise seed and parameter values"""
+    index: int
+    seed: int
+    parameters: Dict[str, float]
+
+
+@dataclass
+class RunResult:
+    """Figures of merit of one run (angles in deg, rates in deg/s, times in s)"""
+    index: int
+    seed: int
+    pointing_mean: float = 0.0
+    pointing_rms: float = 0.0
+    pointing_max: float = 0.0
+    pointing_final: float = 0.0
+    rate_final: float = 0.0
+    wheel_saturation_time: float = 0.0
+    convergence_time: float = math.nan  # rate below converged_rate from then on (nan: never)
+    steps_per_s: float = 0.0
+    parameters: Dict[str, float] = field(default_factory=dict)
+
+
+def set_parameter(sim: AOCSSimulation, path: str, value: float):
+    """Set a dotted-path parameter, e.g. 'sun_sensors.3.fov', keeping its type"""
+    *parents, name = path.split('.')
+    obj: Any = sim
+    for part in parents:
+        obj = obj[int(part)] if part.isdigit() else getattr(obj, part)
+    current = getattr(obj, name)
+    if not isinstance(current, (int, float)):
+        raise TypeError(f"Parameter '{path}' is not numeric")
+    setattr(obj, name, type(current)(value))
+
+
+def get_parameter(sim: AOCSSimulation, path: str) -> float:
+    """Current value of a dotted-path parameter"""
+    obj: Any = sim
+    for part in path.split('.'):
+        obj = obj[int(part)] if part.isdigit() else getattr(obj, part)
+    return float(obj)
+
+
+def build(scenario: Scenario, run: Run) -> AOCSSimulation:
+    """Simulation for a run, parameters applied and started"""
+    sim = AOCSSimulation(seed=run.seed, **scenario.config)
+    for path, value in {**scenario.parameters, **run.parameters}.items():
+        set_parameter(sim, path, value)
+    sim.configure_actuators()  # parameters may move actuators or the centre of mass
+    sim.configure_sensors()
+    for fault in scenario.faults:
+        sim.faults.add(fault)
+    sim.start()
+    return sim
+
+
+def run_scenario(scenario: Scenario, run: Run) -> RunResult:
+    """Simulate one run and reduce it to its figures of merit"""
+    sim = build(scenario, run)
+    steps = int(round(scenario.duration / sim.dt))
+    every = math.gcd(scenario.control_every, scenario.sample_every) if scenario.control else scenario.sample_every
+    tw, tx, ty, tz = scenario.target
+    rate_limit = math.radians(scenario.converged_rate)
+    wheels = sim.reaction_wheels
+    saturation = scenario.wheel_saturation
+
+    samples = 0
+    error_sum = error_sq = error_max = error = 0.0
+    rate = 0.0
+    saturated = 0
+    last_unconverged = None
+    start_time = sim.time
+    wall = time.perf_counter()
+
+    done = 0
+    while done < steps:
+        if scenario.control is not None and done % scenario.control_every == 0:
+            scenario.control(sim)
+        batch = min(every, steps - done)
+        sim.advance(batch)
+        done += batch
+        if done % scenario.sample_every and done != steps:
+            continue
+
+        q = sim.state.quaternion
+        dot = abs(q.w * tw + q.x * tx + q.y * ty + q.z * tz)
+        error = math.degrees(2 * math.acos(min(1.0, dot)))
+        w = sim.state.angular_rate
+        rate = math.sqrt(w.x * w.x + w.y * w.y + w.z * w.z)
+        samples += 1
+        error_sum += error
+        error_sq += error * error
+        error_max = max(error_max, error)
+        if any(abs(rw.speed) >= saturation * rw.max_speed for rw in wheels):
+            saturated += 1
+        if rate >= rate_limit:
+            last_unconverged = sim.time - start_time
+
+    wall = time.perf_counter() - wall
+    period = scenario.sample_every * sim.dt
+    if rate >= rate_limit:
+        convergence = math.nan
+    else:
+        convergence = 0.0 if last_unconverged is None else last_unconverged + period
+    return RunResult(
+        index=run.index,
+        seed=run.seed,
+        pointing_mean=error_sum / samples,
+        pointing_rms=math.sqrt(error_sq / samples),
+        pointing_max=error_max,
+        pointing_final=error,
+        rate_final=math.degrees(rate),
+        wheel_saturation_time=saturated * period,
+        convergence_time=convergence,
+        steps_per_s=steps / wall if wall > 0 else 0.0,
+        parameters=run.parameters,
+    )
+
+
+@dataclass
+class CampaignResult:
+    """Columnar campaign results: one array per figure of merit and parameter"""
+    columns: Dict[str, np.ndarray]
+    wall_time: float = 0.0  # s
+
+    def __len__(self) -> int:
+        return len(self.columns['index'])
+
+    def save(self, path: Union[str, Path]):
+        """Write as .npz (one array per column) or, for a .csv path, CSV"""
+        path = Path(path)
+        if path.suffix == '.csv':
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.columns)
+                writer.writerows(zip(*(values.tolist() for values in self.columns.values())))
+        else:
+            np.savez(path, **self.columns)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'CampaignResult':
+        with np.load(path) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Mean, standard deviation, min, p95 and max of each figure of merit"""
+        out = {}
+        for name in _FIGURES:
+            values = self.columns[name]
+            values = values[~np.isnan(values)]
+            if not len(values):
+                out[name] = {'runs': 0}
+                continue
+            out[name] = {'runs': len(values), 'mean': float(values.mean()), 'std': float(values.std()),
+                         'min': float(values.min()), 'p95': float(np.percentile(values, 95)),
+                         'max': float(values.max())}
+        return out
+
+
+_FIGURES = [f.name for f in fields(RunResult) if f.name not in ('index', 'seed', 'parameters')]
+
+
+class Campaign:
+    """A base scenario and the runs sweeping its parameters"""
+
+    def __init__(self, scenario: Scenario, runs: Sequence[Run]):
+        self.scenario = scenario
+        self.runs = list(runs)
+        self.parameters = sorted({path for run in self.runs for path in run.parameters})
+        # Fail on unknown or non-numeric parameters here, not in a worker
+        template = AOCSSimulation(**scenario.config)
+        for path in {*scenario.parameters, *self.parameters}:
+            set_parameter(template, path, get_parameter(template, path))
+
+    @staticmethod
+    def _seeds(count: int, seed: Optional[int]) -> List[int]:
+        return [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(count)]
+
+    @classmethod
+    def grid(cls, scenario: Scenario, grid: Dict[str, Iterable[float]],
+             repeats: int = 1, seed: Optional[int] = None) -> 'Campaign':
+        """Every combination of the grid values, each repeated with different noise"""
+        paths = list(grid)
+        combos = [combo for combo in itertools.product(*(list(grid[p]) for p in paths))
+                  for _ in range(repeats)]
+        seeds = cls._seeds(len(combos), seed)
+        return cls(scenario, [Run(i, s, dict(zip(paths, map(float, combo))))
+                              for i, (s, combo) in enumerate(zip(seeds, combos))])
+
+    @classmethod
+    def dispersed(cls, scenario: Scenario, sigmas: Dict[str, float], runs: int,
+                  seed: Optional[int] = None) -> 'Campaign':
+        """Normal dispersions (1-sigma, absolute) around the scenario's nominal values"""
+        template = AOCSSimulation(**scenario.config)
+        for path, value in scenario.parameters.items():
+            set_parameter(template, path, value)
+        paths = list(sigmas)
+        nominal = np.array([get_parameter(template, p) for p in paths])
+        rng = np.random.default_rng(seed)
+        values = nominal + np.array([sigmas[p] for p in paths]) * rng.standard_normal((runs, len(paths)))
+        seeds = cls._seeds(runs, seed)
+        return cls(scenario, [Run(i, s, dict(zip(paths, row.tolist())))
+                              for i, (s, row) in enumerate(zip(seeds, values))])
+
+    def run(self, workers: Optional[int] = None,
+            progress: Optional[Callable[[RunResult], None]] = None) -> CampaignResult:
+        """
+        Simulate all runs on `workers` processes (all cores if None; 0 runs
+        in this process) and collect the results as they complete
+        """
+        n = len(self.runs)
+        columns = {'index': np.arange(n), 'seed': np.zeros(n, dtype=np.int64)}
+        columns.update({name: np.full(n, math.nan) for name in _FIGURES})
+        columns.update({path: np.full(n, math.nan) for path in self.parameters})
+
+        def collect(result: RunResult):
+            i = result.index
+            values = asdict(result)
+            columns['seed'][i] = result.seed
+            for name in _FIGURES:
+                columns[name][i] = values[name]
+            for path, value in result.parameters.items():
+                columns[path][i] = value
+            if progress is not None:
+                progress(result)
+
+        start = time.perf_counter()
+        if workers == 0:
+            for run in self.runs:
+                collect(run_scenario(self.scenario, run))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(run_scenario, self.scenario, run) for run in self.runs]
+                for future in as_completed(futures):
+                    collect(future.result())
+        return CampaignResult(columns, time.perf_counter() - start)
@@ -0,0 +1,195 @@
+"""
+Simulation Checkpoints
+Compact binary snapshots of the complete AOCSSimulation state
+
+A checkpoint is one immutable bytes object:
+
+    header   magic, format version, layout hash, counts, simulation time
+    values   float64 array: simulation scalars (time, running, scheduler
+             frame, adaptive integrator step) followed by every numeric
+             field of the spacecraft state and the equipment models
+    streams  per noise stream: name, generator state at the start of the
+             buffered block and the offset into it
+    extra    opaque bytes for the owner (the server stores its HK
+             structures there)
+
+The numeric fields are found by walking the dataclass fields of the
+models (Vector3/Quaternion fields are walked recursively, noise streams
+and containers are skipped), so new model fields are captured without
+changes here. Restoring requires the same equipment configuration, which
+the layout hash checks.
+
+Capture and restore take well under a millisecond plus the regeneration
+of one noise block per stream. A checkpoint holds no Python object
+graph, so any number of forked continuations, or forked worker
+processes, can share one copy-on-write.
+"""
+
+import dataclasses
+import struct
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+import numpy as np
+
+from sensor_noise import NoiseService
+
+MAGIC = b'AOCK'
+VERSION = 1
+
+# magic, version, layout hash, values, streams, simulation time, extra length
+_HEADER = struct.Struct('>4sHIIHdI')
+# name length, values used, block size, PCG64 state, increment, has_uint32, uinteger
+_STREAM = struct.Struct('>BII16s16sBI')
+
+# Simulation scalars ahead of the model fields
+_SCALARS = 4
+
+Leaf = Tuple[int, Tuple[str, ...], type]
+
+
+@lru_cache(maxsize=None)
+def _layout(root_types: Tuple[Type, ...]) -> Tuple[Tuple[Leaf, ...], int]:
+    """Numeric field paths of the roots and their layout hash"""
+    leaves: List[Leaf] = []
+
+    def walk(index: int, cls: Type, path: Tuple[str, ...]):
+        for f in dataclasses.fields(cls):
+            kind = f.type
+            if dataclasses.is_dataclass(kind):
+                walk(index, kind, path + (f.name,))
+            elif isinstance(kind, type) and issubclass(kind, (int, float)):  # incl. bool, IntEnum
+                leaves.append((index, path + (f.name,), kind))
+
+    for index, cls in enumerate(root_types):
+        walk(index, cls, ())
+    signature = repr([(i, p, k.__name__) for i, p, k in leaves]).encode()
+    return tuple(leaves), zlib.crc32(signature)
+
+
+def _roots(sim) -> List[Any]:
+    """State-carrying objects of a simulation, in layout order"""
+    return [sim.state, sim.magnetometer, sim.rate_sensor, *sim.sun_sensors,
+            *sim.reaction_wheels, *sim.thrusters, *sim.torque_rods, *sim.sadas]
+
+
+def _pack_state(state: Dict[str, Any]) -> Tuple[bytes, bytes, int, int]:
+    if state['bit_generator'] != 'PCG64':
+        raise ValueError(f"Cannot checkpoint {state['bit_generator']} noise generators")
+    inner = state['state']
+    return (inner['state'].to_bytes(16, 'big'), inner['inc'].to_bytes(16, 'big'),
+            state['has_uint32'], state['uinteger'])
+
+
+def _unpack_state(state: bytes, inc: bytes, has_uint32: int, uinteger: int) -> Dict[str, Any]:
+    return {'bit_generator': 'PCG64',
+            'state': {'state': int.from_bytes(state, 'big'), 'inc': int.from_bytes(inc, 'big')},
+            'has_uint32': has_uint32, 'uinteger': uinteger}
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """Immutable binary snapshot of an AOCSSimulation"""
+    data: bytes
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def time(self) -> float:
+        """Simulation time (s) at capture"""
+        return self._header()[5]
+
+    @property
+    def extra(self) -> bytes:
+        """Owner data stored with the checkpoint"""
+        length = self._header()[6]
+        return self.data[len(self.data) - length:] if length else b''
+
+    def save(self, path: Union[str, Path]):
+        Path(path).write_bytes(self.data)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'Checkpoint':
+        checkpoint = cls(Path(path).read_bytes())
+        checkpoint._header()
+        return checkpoint
+
+    def _header(self) -> tuple:
+        if len(self.data) < _HEADER.size:
+            raise ValueError("Checkpoint data too short")
+        header = _HEADER.unpack_from(self.data)
+        if header[0] != MAGIC or header[1] != VERSION:
+            raise ValueError("Not a version 1 simulation checkpoint")
+        return header
+
+
+def capture(sim, extra: bytes = b'') -> Checkpoint:
+    """Checkpoint of the complete simulation state"""
+    roots = _roots(sim)
+    leaves, layout_hash = _layout(tuple(type(root) for root in roots))
+
+    values = [sim.time, float(sim.running), sim.scheduler.frame,
+              getattr(sim.integrator, 'h', 0.0)]
+    for index, path, _ in leaves:
+        obj = roots[index]
+        for name in path:
+            obj = getattr(obj, name)
+        values.append(obj)
+
+    streams = sim.noise.streams
+    parts = [_HEADER.pack(MAGIC, VERSION, layout_hash, len(values), len(streams), sim.time, len(extra)),
+             np.array(values, dtype='<f8').tobytes()]
+    for name, stream in streams.items():
+        encoded = name.encode()
+        state, pos, size = stream.position()
+        parts.append(_STREAM.pack(len(encoded), pos, size, *_pack_state(state)) + encoded)
+    parts.append(extra)
+    return Checkpoint(b''.join(parts))
+
+
+def restore(sim, checkpoint: Checkpoint, seed: Optional[int] = None) -> bytes:
+    """
+    Restore a simulation from a checkpoint and return the checkpoint's extra data
+
+    With a seed the noise streams are restarted from that seed instead of
+    their checkpointed positions, giving an independent continuation.
+    """
+    data = checkpoint.data
+    _, _, layout_hash, count, stream_count, _, _ = checkpoint._header()
+    roots = _roots(sim)
+    leaves, expected = _layout(tuple(type(root) for root in roots))
+    if layout_hash != expected or count != _SCALARS + len(leaves):
+        raise ValueError("Checkpoint was taken with a different equipment configuration")
+
+    offset = _HEADER.size
+    values = np.frombuffer(data, dtype='<f8', count=count, offset=offset).tolist()
+    offset += 8 * count
+
+    time, running, frame, step = values[:_SCALARS]
+    sim.time = time
+    sim.running = bool(running)
+    sim.scheduler.frame = int(frame)
+    if hasattr(sim.integrator, 'h'):
+        sim.integrator.h = step
+    for (index, path, kind), value in zip(leaves, values[_SCALARS:]):
+        obj = roots[index]
+        for name in path[:-1]:
+            obj = getattr(obj, name)
+        setattr(obj, path[-1], value if kind is float else kind(int(value)))
+
+    noise: NoiseService = sim.noise
+    for _ in range(stream_count):
+        name_length, pos, size, *state = _STREAM.unpack_from(data, offset)
+        offset += _STREAM.size
+        name = data[offset:offset + name_length].decode()
+        offset += name_length
+        if seed is None:
+            noise.stream(name).seek(_unpack_state(*state), pos, size)
+    if seed is not None:
+        noise.reseed(seed)
+    return checkpoint.extra
+
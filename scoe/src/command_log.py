@@ -0,0 +1,176 @@
+"""
+Command Log Recording and Replay
+Deterministic re-execution of a mock AOCS session
+
+The simulation is deterministic given its configuration, its noise seed
+and the order of everything that touches it between steps. A session
+recording (CommandRecorder, enabled with MockAOCSServer(record=path))
+therefore keeps, as JSON lines:
+
+    header  simulation configuration, noise seed, MIB hash, wall time
+    tc      step count, simulation time and the raw TC packet
+    read    step count, simulation time and a digest of the simulation
+            telemetry, for every telemetry read (HK and parameter
+            reports read the wheel speed measurement noise)
+    end     final step count, telemetry digest and session wall time
+
+replay() rebuilds the simulation and a server without network, steps to
+each event and re-executes it: TCs through the server's TC handlers,
+reads as telemetry refreshes whose digest is compared with the recorded
+one. Nothing waits on the clock, so replay runs at the simulation's
+full step rate (more than 100x a real-time session).
+
+Changes made to the simulation from Python rather than by TC are not in
+the log.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from aocs_simulation import AOCSSimulation
+from environment import OrbitalElements
+from pus_protocol import PUSPacketView
+
+logger = logging.getLogger(__name__)
+
+FORMAT = 'aocs-command-log'
+VERSION = 1
+
+
+def telemetry_digest(values: np.ndarray) -> str:
+    """Digest of telemetry values (bit exact)"""
+    return hashlib.blake2b(np.ascontiguousarray(values).tobytes(), digest_size=8).hexdigest()
+
+
+def _config_to_json(config: Dict[str, Any]) -> Dict[str, Any]:
+    config = dict(config)
+    if config.get('orbit') is not None:
+        config['orbit'] = asdict(config['orbit'])
+    return config
+
+
+def _config_from_json(config: Dict[str, Any]) -> Dict[str, Any]:
+    config = dict(config)
+    if config.get('orbit') is not None:
+        config['orbit'] = OrbitalElements(**config['orbit'])
+    return config
+
+
+class CommandRecorder:
+    """Writes the TCs and telemetry reads of a session to a command log"""
+
+    def __init__(self, path: Union[str, Path], simulation: AOCSSimulation, slots: int,
+                 mib_hash: int = 0):
+        self.path = Path(path)
+        self.slots = slots  # simulation telemetry slots (ahead of the server's)
+        self.started = time.time()
+        self.events = 0
+        self._file = open(self.path, 'w')
+        self._write({'format': FORMAT, 'version': VERSION,
+                     'config': _config_to_json(simulation.config),
+                     'seed': simulation.noise.seed, 'mib_hash': mib_hash,
+                     'started': self.started})
+
+    def _write(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    def record_tc(self, step: int, sim_time: float, packet: bytes):
+        self._write({'step': step, 'time': sim_time, 'tc': packet.hex()})
+        self._file.flush()
+        self.events += 1
+
+    def record_read(self, step: int, sim_time: float, values: np.ndarray):
+        self._write({'step': step, 'time': sim_time, 'read': telemetry_digest(values[:self.slots])})
+        self.events += 1
+
+    def close(self, step: int, sim_time: float, values: np.ndarray):
+        """Write the end record and close the log"""
+        if self._file.closed:
+            return
+        self._write({'step': step, 'time': sim_time, 'end': telemetry_digest(values[:self.slots]),
+                     'wall_time': time.time() - self.started})
+        self._file.close()
+        logger.info(f"Command log {self.path}: {self.events} events, {step} steps")
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of a replay"""
+    steps: int = 0
+    tcs: int = 0
+    reads: int = 0
+    sim_time: float = 0.0
+    wall_time: float = 0.0  # s, replay
+    session_wall_time: Optional[float] = None  # s, original session (None if not closed)
+    mismatches: List[int] = field(default_factory=list)  # steps whose telemetry differs
+    telemetry: Dict[str, float] = field(default_factory=dict)  # final simulation telemetry
+
+    @property
+    def identical(self) -> bool:
+        return not self.mismatches
+
+    @property
+    def speedup(self) -> Optional[float]:
+        if not self.session_wall_time or not self.wall_time:
+            return None
+        return self.session_wall_time / self.wall_time
+
+
+def load(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """Records of a command log (header first)"""
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if not records or records[0].get('format') != FORMAT or records[0].get('version') != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} command log")
+    return records
+
+
+def replay(path: Union[str, Path], verify: bool = True) -> ReplayResult:
+    """Re-execute a command log against a fresh simulation, as fast as possible"""
+    return asyncio.run(_replay(load(path), verify))
+
+
+async def _replay(records: List[Dict[str, Any]], verify: bool) -> ReplayResult:
+    from mock_aocs_server import MockAOCSServer  # the server imports this module
+
+    header, events = records[0], records[1:]
+    simulation = AOCSSimulation(seed=header['seed'], **_config_from_json(header['config']))
+    server = MockAOCSServer(simulation=simulation)
+    server.self_test_duration = 0.0
+    slots = server._server_slots.start
+    if header.get('mib_hash') and header['mib_hash'] != server.mib.hash32:
+        logger.warning("Command log was recorded with a different MIB")
+
+    result = ReplayResult()
+    step = 0
+    start = time.perf_counter()
+    for event in events:
+        for _ in range(event['step'] - step):
+            simulation.step()
+        step = event['step']
+
+        if 'tc' in event:
+            await server._process_telecommand(PUSPacketView(bytes.fromhex(event['tc'])), None)
+            result.tcs += 1
+        elif 'read' in event or 'end' in event:
+            values = simulation.refresh_telemetry()
+            if 'read' in event:
+                result.reads += 1
+            else:
+                result.session_wall_time = event.get('wall_time')
+            if verify and telemetry_digest(values[:slots]) != event.get('read', event.get('end')):
+                result.mismatches.append(step)
+
+    result.wall_time = time.perf_counter() - start
+    result.steps = step
+    result.sim_time = simulation.time
+    result.telemetry = simulation.get_all_telemetry()
+    return result
@@ -0,0 +1,371 @@
+"""
+Ensemble Simulation
+Vectorized Monte Carlo ensemble of AOCS simulations
+
+EnsembleSimulation holds N dispersed copies of the spacecraft in arrays
+of shape (N, ...) and steps all members at once with the same equations
+as AOCSSimulation.step. Nominal values come from a template
+AOCSSimulation; Dispersions draws per-member inertia, sensor biases,
+wheel friction and initial rates around them.
+
+Commands are arrays as well (rw_cmd, rod_dipole, thr_firing,
+sada_cmd), so a control law can be written as vectorized NumPy and
+passed to run(), which calls it every `control_every` steps.
+
+Sensor outputs are only evaluated when they are read (control and
+telemetry samples): the magnetometer and sun sensor outputs and the gyro
+angular random walk are overwritten every step, and the gyro rate random
+walk accumulated over k steps is drawn as one N(0, k * sigma^2) sample,
+so the sampled telemetry has the same distribution as stepping the
+sensors every step.
+
+Telemetry is columnar: run() returns a dict of arrays with shape
+(samples, N) per telemetry name (the names of get_all_telemetry), plus
+'sim_time' with shape (samples,).
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from aocs_simulation import AOCSSimulation
+
+_G0 = 9.81
+_MU_EARTH = 3.986004418e14  # m^3/s^2
+
+
+@dataclass
+class Dispersions:
+    """Per-member dispersions (1-sigma, zero mean)"""
+    inertia: float = 0.05  # fraction of nominal, per axis
+    gyro_bias: float = 0.005  # deg/s, per axis
+    mag_bias: float = 50.0  # nT, per axis
+    wheel_friction: float = 0.2  # fraction of nominal, per wheel
+    initial_rate: float = 0.1  # deg/s, per axis
+
+
+class EnsembleSimulation:
+    """N dispersed spacecraft stepped together"""
+
+    # Steps per slow-group update (thermal, SADA, wheel noise)
+    SLOW_STEPS = 8
+
+    def __init__(self, members: int, dispersions: Optional[Dispersions] = None,
+                 template: Optional[AOCSSimulation] = None, seed: Optional[int] = None):
+        if members < 1:
+            raise ValueError("Ensemble needs at least one member")
+        sim = template or AOCSSimulation()
+        disp = dispersions or Dispersions()
+        self.rng = np.random.default_rng(seed)
+        n = self.members = members
+        rng = self.rng
+
+        self.dt = sim.dt
+        self.time = sim.time
+        self.steps = 0
+        st = sim.state
+
+        # Spacecraft state
+        q = st.quaternion
+        self.q = np.tile([q.w, q.x, q.y, q.z], (n, 1))
+        r = st.angular_rate
+        self.rate = np.array([r.x, r.y, r.z]) + np.radians(disp.initial_rate) * rng.standard_normal((n, 3))
+        inertia = np.array([st.inertia.x, st.inertia.y, st.inertia.z])
+        self.inertia = inertia * (1 + disp.inertia * rng.standard_normal((n, 3)))
+        field = st.magnetic_field_eci
+        self.mag_field = np.array([field.x, field.y, field.z])
+        s = st.sun_direction_eci.normalize()
+        self.sun_dir = np.array([s.x, s.y, s.z])
+        self.in_eclipse = st.in_eclipse
+        self.orbit_period = 2 * math.pi * math.sqrt(st.position.magnitude() ** 3 / _MU_EARTH)
+
+        # Reaction wheels (N, 4); friction opposes the wheel speed and
+        # is reacted on the body
+        wheels = sim.reaction_wheels
+        nw = len(wheels)
+        self.rw_speed = np.tile([w.speed for w in wheels], (n, 1)).astype(float)
+        self.rw_cmd = np.zeros((n, nw))
+        self.rw_temp = np.tile([w.temperature for w in wheels], (n, 1)).astype(float)
+        self.rw_current = np.zeros((n, nw))
+        self.rw_inertia = np.array([w.inertia for w in wheels])
+        self.rw_max_speed = np.array([w.max_speed for w in wheels])
+        self.rw_max_torque = np.array([w.max_torque for w in wheels])
+        self.rw_noise = np.array([w.torque_noise_std for w in wheels])
+        self.rw_speed_noise = np.array([w.speed_noise_std for w in wheels])
+        self.rw_voltage = np.array([w.voltage for w in wheels])
+        dt_rpm = self.dt * 60 / (2 * math.pi)
+        self.rw_friction = (np.array([w.friction for w in wheels]) *
+                            np.clip(1 + disp.wheel_friction * rng.standard_normal((n, nw)), 0, None))
+
+        # Thrusters (N, 4); torque per unit thrust is r x direction
+        thrusters = sim.thrusters
+        self.thr_torque_axis = sim.actuators.thrusters.T
+        self.thr_nominal = np.array([t.thrust_nominal for t in thrusters])
+        self.thr_error = np.array([t.thrust_error for t in thrusters])
+        self.thr_isp = np.array([t.isp for t in thrusters])
+        self.thr_firing = np.zeros((n, len(thrusters)), dtype=bool)
+        self.thr_temp = np.tile([t.temperature for t in thrusters], (n, 1)).astype(float)
+        self.thr_flow = np.zeros((n, len(thrusters)))
+
+        # Torque rods (N, 3)
+        rods = sim.torque_rods
+        self.rod_axes = sim.actuators.rods.T
+        self.rod_saturation = np.array([r.saturation for r in rods])
+        self.rod_dipole = np.zeros((n, len(rods)))
+
+        # Magnetometer
+        mag = sim.magnetometer
+        self.mag_scale = np.array([mag.scale_factor.x, mag.scale_factor.y, mag.scale_factor.z])
+        self.mag_bias = (np.array([mag.bias.x, mag.bias.y, mag.bias.z]) +
+                         disp.mag_bias * rng.standard_normal((n, 3)))
+        self.mag_noise = mag.noise_std
+        self.mag_mode = mag.op_mode
+        self.mag_meas = np.zeros((n, 3))
+
+        # Rate sensor
+        gyro = sim.rate_sensor
+        self.gyro_bias = (np.array([gyro.bias.x, gyro.bias.y, gyro.bias.z]) +
+                          disp.gyro_bias * rng.standard_normal((n, 3)))
+        self.gyro_drift = np.zeros((n, 3))
+        self.gyro_scale = 1 + gyro.scale_factor_error
+        self.gyro_rrw = gyro.rrw * math.sqrt(self.dt) / 3600
+        self.gyro_arw = gyro.arw * math.sqrt(1 / self.dt) / 60
+        self.gyro_quant = gyro.quantization
+        self.gyro_meas = np.zeros((n, 3))
+        self._unmeasured = 0  # steps since the last sensor evaluation
+
+        # Sun sensors (fixed body mounting, ECI sun direction constant)
+        sensors = sim.sun_sensors
+        self.ss_boresight = np.array([[s.boresight.x, s.boresight.y, s.boresight.z] for s in sensors])
+        self.ss_fov = np.array([s.fov for s in sensors])
+        self.ss_cos_fov = np.cos(np.radians(self.ss_fov))
+        self.ss_noise = np.array([s.noise_std for s in sensors])
+        self.ss_detected = np.zeros((n, len(sensors)), dtype=bool)
+        self.ss_azimuth = np.zeros((n, len(sensors)))
+        self.ss_elevation = np.zeros((n, len(sensors)))
+        self.ss_intensity = np.zeros((n, len(sensors)))
+
+        # SADAs (N, 2)
+        sadas = sim.sadas
+        self.sada_angle = np.tile([s.angle for s in sadas], (n, 1)).astype(float)
+        self.sada_cmd = self.sada_angle.copy()
+        self.sada_max_rate = np.array([s.max_rate for s in sadas])
+
+        # Constant per-step factors
+        self._rw_gain = dt_rpm / self.rw_inertia
+        self._rw_axes = sim.actuators.wheels.T  # (wheels, 3) mounting
+
+        # Work buffers
+        self._torque = np.empty((n, 3))
+        self._rw_torque = np.zeros((n, nw))  # rw_cmd clamped to the torque limits
+        self._dq = np.empty((n, 4))
+        self._slow_pending = 0
+
+    def step(self):
+        """Advance all members by one step"""
+        dt = self.dt
+
+        # Reaction wheels: commanded torque (clamped as by AOCSSimulation
+        # commands) minus friction; the body gets the same torque reversed
+        command = np.clip(self.rw_cmd, -self.rw_max_torque, self.rw_max_torque, out=self._rw_torque)
+        friction = self.rw_friction * np.sign(self.rw_speed)
+        motor = command - friction
+        motor *= self._rw_gain
+        self.rw_speed += motor
+        np.clip(self.rw_speed, -self.rw_max_speed, self.rw_max_speed, out=self.rw_speed)
+
+        # Body torque: wheels (mounting matrix, as in AOCSSimulation), thrusters, rods
+        torque = self._torque
+        np.matmul(friction - command, self._rw_axes, out=torque)
+        if self.thr_firing.any():
+            thrust = self.thr_nominal * (1 + self.thr_error * self.rng.standard_normal(self.thr_firing.shape))
+            thrust *= self.thr_firing
+            torque += thrust @ self.thr_torque_axis
+            self.thr_flow[:] = thrust / (self.thr_isp * _G0) * 1000
+        if self.rod_dipole.any():
+            dipole = np.clip(self.rod_dipole, -self.rod_saturation, self.rod_saturation)
+            torque += np.cross(dipole @ self.rod_axes, self.mag_field)
+
+        # Rigid body rates and quaternion
+        torque /= self.inertia
+        torque *= dt
+        self.rate += torque
+        w, x, y, z = self.q.T
+        wx, wy, wz = self.rate.T
+        dq = self._dq
+        dq[:, 0] = -(x * wx + y * wy + z * wz)
+        dq[:, 1] = w * wx + y * wz - z * wy
+        dq[:, 2] = w * wy + z * wx - x * wz
+        dq[:, 3] = w * wz + x * wy - y * wx
+        dq *= 0.5 * dt
+        self.q += dq
+        self.q /= np.sqrt(np.einsum('ij,ij->i', self.q, self.q))[:, None]
+
+        self.time += dt
+        self.steps += 1
+        self._unmeasured += 1
+        self._slow_pending += 1
+        if self._slow_pending >= self.SLOW_STEPS:
+            self._slow_update()
+
+    def _slow_update(self):
+        """
+        Slow-group update over the steps since the last one
+
+        Wheel torque noise is added as one N(0, k * sigma^2) sample (it
+        only drives the wheel speed), temperatures use the closed form of
+        their first-order lag and SADAs move with the rate limit over the
+        whole interval.
+        """
+        k = self._slow_pending
+        if not k:
+            return
+        self._slow_pending = 0
+        dt = self.dt
+        rng = self.rng
+
+        noise = self.rw_noise * math.sqrt(k) * rng.standard_normal(self.rw_speed.shape)
+        self.rw_speed += noise * self._rw_gain
+        np.clip(self.rw_speed, -self.rw_max_speed, self.rw_max_speed, out=self.rw_speed)
+        np.multiply(np.abs(self._rw_torque), 5.0, out=self.rw_current)
+        self.rw_current += 0.1
+        # T' = T + P * 0.001 * dt - (T - 25) * 0.01 * dt settles at 25 + 0.1 * P
+        steady = 25.0 + self.rw_current * self.rw_voltage * 0.1
+        self.rw_temp -= steady
+        self.rw_temp *= (1 - 0.01 * dt) ** k
+        self.rw_temp += steady
+
+        firing = self.thr_firing
+        cooled = 25.0 + (self.thr_temp - 25.0) * (1 - 0.1 * dt) ** k
+        self.thr_temp[:] = np.where(firing, self.thr_temp + 0.5 * dt * k, cooled)
+        if not firing.any():
+            self.thr_flow[:] = 0.0
+
+        step = self.sada_max_rate * dt * k
+        self.sada_angle += np.clip(self.sada_cmd - self.sada_angle, -step, step)
+
+    def measure(self):
+        """Evaluate the sensor outputs for the current state"""
+        self._slow_update()
+        n = self.members
+        rng = self.rng
+
+        if self._unmeasured:
+            walk = self.gyro_rrw * math.sqrt(self._unmeasured)
+            self.gyro_drift += walk * rng.standard_normal((n, 3))
+            self._unmeasured = 0
+
+        if self.mag_mode == 2:
+            self.mag_meas[:] = (self.mag_field * self.mag_scale + self.mag_bias +
+                                self.mag_noise * rng.standard_normal((n, 3)))
+        else:
+            self.mag_meas[:] = 0.0
+
+        true_rate = np.degrees(self.rate)
+        meas = (true_rate * self.gyro_scale + self.gyro_bias + self.gyro_drift +
+                self.gyro_arw * rng.standard_normal((n, 3)))
+        self.gyro_meas[:] = np.round(meas / self.gyro_quant) * self.gyro_quant
+
+        # Sun sensors see the sun direction in each member's body frame,
+        # as in AOCSSimulation (SunSensorArray)
+        w, x, y, z = self.q.T
+        sx, sy, sz = self.sun_dir
+        s = np.empty((n, 3))
+        s[:, 0] = (1 - 2 * (y * y + z * z)) * sx + 2 * (x * y + w * z) * sy + 2 * (x * z - w * y) * sz
+        s[:, 1] = 2 * (x * y - w * z) * sx + (1 - 2 * (x * x + z * z)) * sy + 2 * (y * z + w * x) * sz
+        s[:, 2] = 2 * (x * z + w * y) * sx + 2 * (y * z - w * x) * sy + (1 - 2 * (x * x + y * y)) * sz
+        s /= np.linalg.norm(s, axis=1)[:, None]
+        cos_angle = s @ self.ss_boresight.T  # (N, heads)
+        detected = (cos_angle >= self.ss_cos_fov) & (not self.in_eclipse)
+        azimuth = np.degrees(np.arctan2(s[:, 1], s[:, 0]))[:, None]
+        elevation = np.degrees(np.arctan2(s[:, 2], np.hypot(s[:, 0], s[:, 1])))[:, None]
+        noise = rng.standard_normal((3, *detected.shape))
+        self.ss_detected[:] = detected
+        self.ss_azimuth[:] = np.where(detected, azimuth + self.ss_noise * noise[0], 0.0)
+        self.ss_elevation[:] = np.where(detected, elevation + self.ss_noise * noise[1], 0.0)
+        self.ss_intensity[:] = np.where(detected, np.maximum(0, cos_angle) + 0.01 * noise[2], 0.0)
+
+    def telemetry_names(self) -> List[str]:
+        """Per-member telemetry names (as in AOCSSimulation.get_all_telemetry)"""
+        names = ['att_q_w', 'att_q_x', 'att_q_y', 'att_q_z', 'rate_x', 'rate_y', 'rate_z',
+                 'mag_x', 'mag_y', 'mag_z', 'gyro_x', 'gyro_y', 'gyro_z']
+        for i in range(len(self.ss_fov)):
+            names += [f'ss{i}_detected', f'ss{i}_azimuth', f'ss{i}_elevation', f'ss{i}_intensity']
+        for i in range(self.rw_speed.shape[1]):
+            names += [f'rw{i}_speed', f'rw{i}_temperature', f'rw{i}_current', f'rw{i}_cmd_torque']
+        for i in range(self.thr_firing.shape[1]):
+            names += [f'thr{i}_firing', f'thr{i}_temperature', f'thr{i}_flow']
+        for i in range(self.rod_dipole.shape[1]):
+            names += [f'mtr{i}_dipole', f'mtr{i}_commanded']
+        for i in range(self.sada_angle.shape[1]):
+            names += [f'sada{i}_angle', f'sada{i}_commanded']
+        return names
+
+    def telemetry(self, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Current telemetry, one (N,) array per name"""
+        self.measure()
+        rates = np.degrees(self.rate)
+        speeds = self.rw_speed + self.rw_speed_noise * self.rng.standard_normal(self.rw_speed.shape)
+        dipole = np.clip(self.rod_dipole, -self.rod_saturation, self.rod_saturation)
+        sources = {
+            'att_q': (self.q, 'wxyz'), 'rate': (rates, 'xyz'),
+            'mag': (self.mag_meas, 'xyz'), 'gyro': (self.gyro_meas, 'xyz'),
+        }
+        tm = {}
+        for prefix, (values, axes) in sources.items():
+            for k, axis in enumerate(axes):
+                tm[f'{prefix}_{axis}'] = values[:, k]
+        for i in range(self.ss_detected.shape[1]):
+            tm[f'ss{i}_detected'] = self.ss_detected[:, i].astype(float)
+            tm[f'ss{i}_azimuth'] = self.ss_azimuth[:, i]
+            tm[f'ss{i}_elevation'] = self.ss_elevation[:, i]
+            tm[f'ss{i}_intensity'] = self.ss_intensity[:, i]
+        for i in range(speeds.shape[1]):
+            tm[f'rw{i}_speed'] = speeds[:, i]
+            tm[f'rw{i}_temperature'] = self.rw_temp[:, i]
+            tm[f'rw{i}_current'] = self.rw_current[:, i]
+            tm[f'rw{i}_cmd_torque'] = self.rw_cmd[:, i]
+        for i in range(self.thr_firing.shape[1]):
+            tm[f'thr{i}_firing'] = self.thr_firing[:, i].astype(float)
+            tm[f'thr{i}_temperature'] = self.thr_temp[:, i]
+            tm[f'thr{i}_flow'] = self.thr_flow[:, i]
+        for i in range(dipole.shape[1]):
+            tm[f'mtr{i}_dipole'] = dipole[:, i]
+            tm[f'mtr{i}_commanded'] = self.rod_dipole[:, i]
+        for i in range(self.sada_angle.shape[1]):
+            tm[f'sada{i}_angle'] = self.sada_angle[:, i]
+            tm[f'sada{i}_commanded'] = self.sada_cmd[:, i]
+        if columns is None:
+            return {name: values.copy() for name, values in tm.items()}
+        return {name: tm[name].copy() for name in columns}
+
+    def run(self, steps: int, sample_every: int = 80, columns: Optional[Sequence[str]] = None,
+            control: Optional[Callable[['EnsembleSimulation'], None]] = None,
+            control_every: int = 8) -> Dict[str, np.ndarray]:
+        """
+        Step all members and sample telemetry every `sample_every` steps
+
+        control(ensemble) is called every `control_every` steps after the
+        sensors are evaluated and may set the command arrays. Returns the
+        sampled telemetry as {name: (samples, N)} plus 'sim_time'.
+        """
+        names = list(columns) if columns is not None else self.telemetry_names()
+        samples = steps // sample_every
+        record = {name: np.empty((samples, self.members)) for name in names}
+        times = np.empty(samples)
+        row = 0
+        for k in range(1, steps + 1):
+            if control is not None and (k - 1) % control_every == 0:
+                self.measure()
+                control(self)
+            self.step()
+            if k % sample_every == 0 and row < samples:
+                tm = self.telemetry(names)
+                for name in names:
+                    record[name][row] = tm[name]
+                times[row] = self.time
+                row += 1
+        record['sim_time'] = times
+        return record
@@ -0,0 +1,237 @@
+"""
+Orbit and Environment Model
+Kepler + J2 orbit propagation and a precomputed environment ephemeris
+
+The orbit is propagated analytically from mean orbital elements with the
+secular J2 drift of the node, perigee and mean anomaly. Along it the
+environment is evaluated with low-cost models:
+- sun direction: low-precision solar ephemeris (about 0.01 deg)
+- eclipse: cylindrical Earth shadow
+- magnetic field: IGRF 2020 centred dipole, rotating with the Earth
+- atmospheric density: piecewise exponential model (0-1000 km)
+
+Evaluating all of this every simulation step would cost more than the
+rest of the step, so Ephemeris evaluates it vectorized on a coarse time
+grid over the run horizon (extended in chunks as the simulation time
+passes it) and sample() interpolates between grid points: cubic Hermite
+for position and velocity, linear for the sun direction, field and
+shadow margin, log-linear for density. With the default 10 s grid the
+interpolation error is below 1 mm in position and 2 nT in field.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+MU_EARTH = 3.986004418e14  # m^3/s^2
+R_EARTH = 6378137.0  # m (equatorial)
+J2 = 1.08262668e-3
+R_IGRF = 6371200.0  # m (IGRF reference radius)
+# IGRF 2020 dipole coefficients g10, g11, h11 (nT)
+IGRF_DIPOLE = (-29404.8, -1450.9, 4652.5)
+
+# Exponential atmosphere: base altitude (km), base density (kg/m^3), scale height (km)
+_ATMOSPHERE = (
+    (0, 1.225, 7.249), (25, 3.899e-2, 6.349), (30, 1.774e-2, 6.682), (40, 3.972e-3, 7.554),
+    (50, 1.057e-3, 8.382), (60, 3.206e-4, 7.714), (70, 8.770e-5, 6.549), (80, 1.905e-5, 5.799),
+    (90, 3.396e-6, 5.382), (100, 5.297e-7, 5.877), (110, 9.661e-8, 7.263), (120, 2.438e-8, 9.473),
+    (130, 8.484e-9, 12.636), (140, 3.845e-9, 16.149), (150, 2.070e-9, 22.523),
+    (180, 5.464e-10, 29.740), (200, 2.789e-10, 37.105), (250, 7.248e-11, 45.546),
+    (300, 2.418e-11, 53.628), (350, 9.518e-12, 53.298), (400, 3.725e-12, 58.515),
+    (450, 1.585e-12, 60.828), (500, 6.967e-13, 63.822), (600, 1.454e-13, 71.835),
+    (700, 3.614e-14, 88.667), (800, 1.170e-14, 124.64), (900, 5.245e-15, 181.05),
+    (1000, 3.019e-15, 268.00),
+)
+
+# (position, velocity, sun direction, magnetic field, density, in eclipse)
+Sample = Tuple[Tuple[float, float, float], Tuple[float, float, float],
+               Tuple[float, float, float], Tuple[float, float, float], float, bool]
+
+
+@dataclass
+class OrbitalElements:
+    """Mean Keplerian elements at simulation time 0"""
+    semi_major_axis: float = R_EARTH + 700e3  # m
+    eccentricity: float = 0.001
+    inclination: float = 98.2  # deg (sun-synchronous at 700 km)
+    raan: float = 0.0  # deg
+    arg_perigee: float = 0.0  # deg
+    mean_anomaly: float = 0.0  # deg
+    epoch: float = 9575.0  # days since J2000.0 (2026-03-20)
+
+    @property
+    def period(self) -> float:
+        """Orbital period (s)"""
+        return 2 * math.pi * math.sqrt(self.semi_major_axis ** 3 / MU_EARTH)
+
+
+def propagate(elements: OrbitalElements, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """ECI position (m) and velocity (m/s), shape (len(t), 3), at times t (s)"""
+    a, e = elements.semi_major_axis, elements.eccentricity
+    inc = math.radians(elements.inclination)
+    n = math.sqrt(MU_EARTH / a ** 3)
+    p = a * (1 - e * e)
+    eta = math.sqrt(1 - e * e)
+    k = 1.5 * J2 * (R_EARTH / p) ** 2 * n
+    sin_i2 = math.sin(inc) ** 2
+
+    raan_rate = -k * math.cos(inc)
+    argp_rate = k * (2 - 2.5 * sin_i2)
+    mean_rate = n + k * eta * (1 - 1.5 * sin_i2)
+    raan = math.radians(elements.raan) + raan_rate * t
+    argp = math.radians(elements.arg_perigee) + argp_rate * t
+    mean = math.radians(elements.mean_anomaly) + mean_rate * t
+
+    # Kepler's equation by Newton iteration
+    ecc = mean + e * np.sin(mean)
+    for _ in range(8):
+        ecc -= (ecc - e * np.sin(ecc) - mean) / (1 - e * np.cos(ecc))
+    cos_e, sin_e = np.cos(ecc), np.sin(ecc)
+    xp, yp = a * (cos_e - e), a * eta * sin_e
+    # Time derivative including the drifts (consistent for interpolation)
+    scale = mean_rate * a / (1 - e * cos_e)
+    vxp, vyp = -scale * sin_e - argp_rate * yp, scale * eta * cos_e + argp_rate * xp
+
+    # Perifocal to ECI: R3(-raan) R1(-inc) R3(-argp)
+    cos_o, sin_o = np.cos(raan), np.sin(raan)
+    cos_w, sin_w = np.cos(argp), np.sin(argp)
+    cos_i, sin_i = math.cos(inc), math.sin(inc)
+    px = np.stack([cos_o * cos_w - sin_o * sin_w * cos_i,
+                   sin_o * cos_w + cos_o * sin_w * cos_i,
+                   sin_w * sin_i], axis=1)
+    qx = np.stack([-cos_o * sin_w - sin_o * cos_w * cos_i,
+                   -sin_o * sin_w + cos_o * cos_w * cos_i,
+                   cos_w * sin_i], axis=1)
+    position = xp[:, None] * px + yp[:, None] * qx
+    velocity = vxp[:, None] * px + vyp[:, None] * qx
+    velocity[:, 0] -= raan_rate * position[:, 1]
+    velocity[:, 1] += raan_rate * position[:, 0]
+    return position, velocity
+
+
+def sun_direction(days: np.ndarray) -> np.ndarray:
+    """ECI unit vectors to the sun, days since J2000.0"""
+    t = days / 36525.0
+    mean_longitude = np.radians(280.460 + 36000.771 * t)
+    anomaly = np.radians(357.5291092 + 35999.05034 * t)
+    longitude = mean_longitude + np.radians(1.914666471 * np.sin(anomaly) + 0.019994643 * np.sin(2 * anomaly))
+    obliquity = np.radians(23.439291 - 0.0130042 * t)
+    return np.stack([np.cos(longitude),
+                     np.cos(obliquity) * np.sin(longitude),
+                     np.sin(obliquity) * np.sin(longitude)], axis=1)
+
+
+def magnetic_field(position: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """ECI magnetic field (nT) of the IGRF centred dipole"""
+    g10, g11, h11 = IGRF_DIPOLE
+    gmst = np.radians(280.46061837 + 360.98564736629 * days)
+    cos_g, sin_g = np.cos(gmst), np.sin(gmst)
+    m = np.stack([g11 * cos_g - h11 * sin_g, g11 * sin_g + h11 * cos_g, np.full_like(gmst, g10)], axis=1)
+    radius = np.linalg.norm(position, axis=1, keepdims=True)
+    unit = position / radius
+    m_r = np.einsum('ij,ij->i', m, unit)[:, None]
+    return (R_IGRF / radius) ** 3 * (3 * m_r * unit - m)
+
+
+def atmospheric_density(altitude: np.ndarray) -> np.ndarray:
+    """Density (kg/m^3) at geometric altitudes (m)"""
+    km = np.clip(np.asarray(altitude) / 1000.0, 0.0, None)
+    base = np.array([row[0] for row in _ATMOSPHERE], dtype=float)
+    i = np.clip(np.searchsorted(base, km, side='right') - 1, 0, len(base) - 1)
+    rho0 = np.array([row[1] for row in _ATMOSPHERE])[i]
+    height = np.array([row[2] for row in _ATMOSPHERE])[i]
+    return rho0 * np.exp(-(km - base[i]) / height)
+
+
+def shadow_margin(position: np.ndarray, sun: np.ndarray) -> np.ndarray:
+    """Distance (m) outside the cylindrical Earth shadow (negative in eclipse)"""
+    along = np.einsum('ij,ij->i', position, sun)
+    across = np.linalg.norm(position - along[:, None] * sun, axis=1)
+    return np.where(along < 0, across - R_EARTH, across + R_EARTH)
+
+
+def evaluate(elements: OrbitalElements, t: np.ndarray) -> Dict[str, np.ndarray]:
+    """Orbit and environment at times t (s), one array per quantity"""
+    t = np.asarray(t, dtype=float)
+    days = elements.epoch + t / 86400.0
+    position, velocity = propagate(elements, t)
+    sun = sun_direction(days)
+    return {
+        'time': t,
+        'position': position,
+        'velocity': velocity,
+        'sun': sun,
+        'magnetic_field': magnetic_field(position, days),
+        'density': atmospheric_density(np.linalg.norm(position, axis=1) - R_EARTH),
+        'shadow': shadow_margin(position, sun),
+    }
+
+
+class Ephemeris:
+    """Environment table on a coarse time grid, interpolated per step"""
+
+    # Grid spacing (s) and samples per precomputed chunk
+    STEP = 10.0
+    CHUNK = 1024
+
+    def __init__(self, elements: OrbitalElements, horizon: Optional[float] = None,
+                 step: float = STEP, start: float = 0.0):
+        self.elements = elements
+        self.step = step
+        self.chunk = self.CHUNK if horizon is None else max(2, int(math.ceil(horizon / step)) + 2)
+        self.table: Dict[str, np.ndarray] = {}
+        self._compute(start)
+
+    def _compute(self, start: float):
+        """Tabulate chunk grid points from start (aligned to the grid)"""
+        first = math.floor(start / self.step)
+        self.start = first * self.step
+        self.table = table = evaluate(self.elements, self.start + self.step * np.arange(self.chunk))
+        # Rows as Python floats: interpolation is scalar arithmetic per step
+        self._pos = table['position'].tolist()
+        self._vel = table['velocity'].tolist()
+        self._sun = table['sun'].tolist()
+        self._mag = table['magnetic_field'].tolist()
+        self._log_density = np.log(table['density']).tolist()
+        self._shadow = table['shadow'].tolist()
+        self.end = self.start + self.step * (self.chunk - 1)
+
+    def sample(self, t: float) -> Sample:
+        """Interpolated environment at time t (s)"""
+        if not self.start <= t < self.end:
+            self._compute(t)
+        h = self.step
+        x = (t - self.start) / h
+        k = int(x)
+        u = x - k
+        u2 = u * u
+        u3 = u2 * u
+
+        # Cubic Hermite on position with the tabulated velocities
+        h00 = 2 * u3 - 3 * u2 + 1
+        h10 = (u3 - 2 * u2 + u) * h
+        h01 = 1 - h00
+        h11 = (u3 - u2) * h
+        d00 = (6 * u2 - 6 * u) / h
+        d10 = 3 * u2 - 4 * u + 1
+        d11 = 3 * u2 - 2 * u
+        (px0, py0, pz0), (px1, py1, pz1) = self._pos[k], self._pos[k + 1]
+        (vx0, vy0, vz0), (vx1, vy1, vz1) = self._vel[k], self._vel[k + 1]
+        position = (h00 * px0 + h10 * vx0 + h01 * px1 + h11 * vx1,
+                    h00 * py0 + h10 * vy0 + h01 * py1 + h11 * vy1,
+                    h00 * pz0 + h10 * vz0 + h01 * pz1 + h11 * vz1)
+        velocity = (d00 * (px0 - px1) + d10 * vx0 + d11 * vx1,
+                    d00 * (py0 - py1) + d10 * vy0 + d11 * vy1,
+                    d00 * (pz0 - pz1) + d10 * vz0 + d11 * vz1)
+
+        (sx0, sy0, sz0), (sx1, sy1, sz1) = self._sun[k], self._sun[k + 1]
+        (bx0, by0, bz0), (bx1, by1, bz1) = self._mag[k], self._mag[k + 1]
+        sun = (sx0 + u * (sx1 - sx0), sy0 + u * (sy1 - sy0), sz0 + u * (sz1 - sz0))
+        field = (bx0 + u * (bx1 - bx0), by0 + u * (by1 - by0), bz0 + u * (bz1 - bz0))
+        rho0, rho1 = self._log_density[k], self._log_density[k + 1]
+        density = math.exp(rho0 + u * (rho1 - rho0))
+        shadow = self._shadow[k] + u * (self._shadow[k + 1] - self._shadow[k])
+        return position, velocity, sun, field, density, shadow < 0
+
@@ -0,0 +1,356 @@
+"""
+Fault Injection
+Scheduled equipment faults for the AOCS simulation
+
+A Fault is active from its start (simulated time) for its duration, or
+until it is removed. Faults take effect in two ways.
+
+Output faults act on measured values in the telemetry table after the
+models have written them (AOCSSimulation.refresh_telemetry), so they
+work the same for both engines:
+    bias        value added
+    drift       value per second since the fault's start, added
+    stuck       output holds value (NaN: the first value read while active)
+    dropout     each read is lost (reads zero) with probability value
+The active output faults are compiled into slot and parameter arrays
+whenever the active set changes. Each refresh then applies all of them
+with a few array operations: additive offsets, then stuck values, then
+dropouts.
+
+Equipment faults change model parameters while they are active:
+    noise       noise standard deviations times value
+    friction    wheel friction torque plus value (Nm), also acting
+                while the motor drives the wheel
+    stuck_open  thruster fires whatever its command (it keeps firing
+                after the fault ends, until commanded off)
+When the active set changes, the nominal parameters are restored and
+every active equipment fault is applied again in fault order.
+
+Targets are equipment names (magnetometer, rate_sensor, sun_sensor<i>,
+rw<i>, thr<i>). Output faults also accept any simulation telemetry
+parameter name, such as 'mag_x' for one axis. An equipment name selects
+its measurements: the magnetometer and gyro axes, sun sensor azimuth
+and elevation, wheel speed or thruster flow.
+
+With nothing scheduled, a step costs one comparison against the next
+event time (infinite) and a telemetry refresh costs one flag test.
+Checkpoints hold the nominal parameters. The schedule stays with the
+simulation and is re-evaluated at the restored time.
+"""
+
+import logging
+import math
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from enum import IntEnum
+from statistics import NormalDist
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FaultKind(IntEnum):
+    """Fault types (codes of Service 8 function 0x70)"""
+    BIAS = 1
+    DRIFT = 2
+    STUCK = 3
+    DROPOUT = 4
+    NOISE = 5
+    FRICTION = 6
+    STUCK_OPEN = 7
+
+
+OUTPUT_KINDS = frozenset({FaultKind.BIAS, FaultKind.DRIFT, FaultKind.STUCK, FaultKind.DROPOUT})
+
+# Value of a fault given as NaN
+DEFAULT_VALUES = {FaultKind.STUCK: math.nan, FaultKind.DROPOUT: 1.0, FaultKind.NOISE: 1.0}
+
+# Model parameters changed by equipment faults, per equipment class
+_PARAMETERS = {
+    FaultKind.NOISE: {
+        'magnetometer': ('noise_std',),
+        'rate_sensor': ('arw', 'rrw'),
+        'sun_sensor': ('noise_std',),
+        'rw': ('speed_noise_std', 'torque_noise_std'),
+        'thr': ('thrust_error',),
+    },
+    FaultKind.FRICTION: {'rw': ('friction', 'drag')},
+    FaultKind.STUCK_OPEN: {'thr': ('stuck_open',)},
+}
+
+_INDEXED = re.compile(r'(sun_sensor|rw|thr)(\d+)')
+
+
+@dataclass
+class Fault:
+    """One injected fault: what, where and when"""
+    kind: FaultKind
+    target: str  # equipment (e.g. 'rw2', 'sun_sensor3') or telemetry parameter (e.g. 'mag_x')
+    start: float = 0.0  # s, simulated time
+    duration: float = math.inf  # s
+    value: float = math.nan  # depends on the kind (see above); NaN: DEFAULT_VALUES or 0
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'kind': self.kind.name.lower(), 'target': self.target, 'start': self.start,
+                'end': self.end, 'value': self.value}
+
+
+class FaultEngine:
+    """Schedule and effects of the faults injected into one AOCSSimulation"""
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.faults: Dict[int, Fault] = {}
+        self.active: Set[int] = set()
+        self.next_event = math.inf  # simulated time of the next activation or end
+        self.outputs = False  # output faults active (applied by refresh_telemetry)
+        self._next_id = 1
+        self._slots: Dict[int, List[int]] = {}  # output fault -> telemetry slots
+        self._nominal: Dict[Tuple[str, str], Any] = {}  # (target, parameter) -> nominal value
+        self._held: Dict[int, List[float]] = {}  # stuck fault -> held values
+        self._noise = None
+        self._compile()
+
+    def add(self, fault: Fault) -> int:
+        """Schedule a fault (active at once if due) and return its id"""
+        kind = FaultKind(fault.kind)
+        value = DEFAULT_VALUES.get(kind, 0.0) if math.isnan(fault.value) else fault.value
+        fault = replace(fault, kind=kind, value=value)
+        if kind in OUTPUT_KINDS:
+            slots = self._output_slots(fault.target)
+        else:
+            group, _ = self._equipment(fault.target)
+            if group not in _PARAMETERS[kind]:
+                raise ValueError(f"No {kind.name.lower()} fault for '{fault.target}'")
+            slots = []
+        fault_id = self._next_id
+        self._next_id += 1
+        self.faults[fault_id] = fault
+        self._slots[fault_id] = slots
+        logger.info(f"Fault {fault_id} scheduled: {kind.name.lower()} on {fault.target} "
+                    f"from t={fault.start:.3f}s for {fault.duration:g}s (value {fault.value:g})")
+        self.update()
+        return fault_id
+
+    def remove(self, fault_id: int) -> bool:
+        """Remove a fault, ending it if active"""
+        if self.faults.pop(fault_id, None) is None:
+            return False
+        del self._slots[fault_id]
+        if fault_id in self.active:
+            self.active.discard(fault_id)
+            self._changed()
+        self.update()
+        return True
+
+    def clear(self):
+        """Remove all faults and restore the nominal parameters"""
+        self.faults = {}
+        self._slots = {}
+        if self.active:
+            self.active = set()
+            self._changed()
+        self.next_event = math.inf
+
+    def reschedule(self):
+        """Re-evaluate the schedule after the parameters were restored from a checkpoint"""
+        self.active = set()
+        self._nominal = {}
+        self._changed()
+        self.update()
+
+    def update(self):
+        """Activate and end faults for the current simulated time"""
+        now = self.sim.time
+        changed = False
+        next_event = math.inf
+        for fault_id, fault in self.faults.items():
+            due = fault.start <= now < fault.end
+            if due != (fault_id in self.active):
+                changed = True
+                if due:
+                    self.active.add(fault_id)
+                else:
+                    self.active.discard(fault_id)
+                logger.info(f"Fault {fault_id} {'active' if due else 'ended'} at t={now:.3f}s")
+            if now < fault.start:
+                next_event = min(next_event, fault.start)
+            elif now < fault.end:
+                next_event = min(next_event, fault.end)
+        self.next_event = next_event
+        if changed:
+            self._changed()
+
+    def steps_until(self, steps: int) -> int:
+        """Steps to take (at most steps) before the next fault event, for batched stepping"""
+        if self.next_event == math.inf:
+            return steps
+        remaining = math.ceil((self.next_event - self.sim.time) / self.sim.dt - 1e-9)
+        return max(1, min(steps, remaining))
+
+    def apply(self, values: np.ndarray):
+        """Apply the active output faults to the telemetry values (in place)"""
+        if self._add_index.size:
+            offsets = self._add_value + self._add_rate * (self.sim.time - self._add_start)
+            if self._add_unique:
+                values[self._add_index] += offsets
+            else:
+                np.add.at(values, self._add_index, offsets)
+        if self._stuck_index.size:
+            held = self._stuck_value
+            unset = np.isnan(held)
+            if unset.any():
+                held[unset] = values[self._stuck_index[unset]]
+                for fault_id, segment in self._stuck_segments:
+                    self._held[fault_id] = held[segment].tolist()
+            values[self._stuck_index] = held
+        if self._drop_threshold.size:
+            lost = self._noise.normals(self._drop_threshold.size) > self._drop_threshold
+            values[self._drop_index[lost[self._drop_owner]]] = 0.0
+
+    @contextmanager
+    def suspended(self) -> Iterator[None]:
+        """Nominal model parameters for the duration (checkpoint capture)"""
+        faulty = {key: self._get(key) for key in self._nominal}
+        for key, value in self._nominal.items():
+            self._set(key, value)
+        try:
+            yield
+        finally:
+            for key, value in faulty.items():
+                self._set(key, value)
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Scheduled faults with their id and whether they are active"""
+        return [{'id': fault_id, 'active': fault_id in self.active, **fault.to_dict()}
+                for fault_id, fault in self.faults.items()]
+
+    def _changed(self):
+        """Effects of a new active set"""
+        self._held = {fault_id: held for fault_id, held in self._held.items() if fault_id in self.active}
+        self._apply_equipment()
+        self._compile()
+        self.sim._telemetry_stale = True
+
+    def _apply_equipment(self):
+        """Nominal model parameters with the active equipment faults applied in order"""
+        sensors = any(target.startswith('sun_sensor') for target, _ in self._nominal)
+        for key, value in self._nominal.items():
+            self._set(key, value)
+        self._nominal = {}
+        for fault_id, fault in self.faults.items():
+            if fault_id not in self.active or fault.kind in OUTPUT_KINDS:
+                continue
+            group, _ = self._equipment(fault.target)
+            for name in _PARAMETERS[fault.kind][group]:
+                key = (fault.target, name)
+                current = self._get(key)
+                self._nominal.setdefault(key, current)
+                if fault.kind == FaultKind.NOISE:
+                    self._set(key, current * fault.value)
+                elif fault.kind == FaultKind.FRICTION:
+                    self._set(key, current + fault.value)
+                else:
+                    self._set(key, True)
+            sensors = sensors or group == 'sun_sensor'
+        if sensors:
+            self.sim.configure_sensors()
+
+    def _compile(self):
+        """Slot and parameter arrays of the active output faults"""
+        add_index, add_value, add_rate, add_start = [], [], [], []
+        stuck_index, stuck_value, stuck_segments = [], [], []
+        drop_index, drop_owner, drop_threshold = [], [], []
+        for fault_id, fault in self.faults.items():
+            if fault_id not in self.active or fault.kind not in OUTPUT_KINDS:
+                continue
+            slots = self._slots[fault_id]
+            count = len(slots)
+            if fault.kind == FaultKind.BIAS or fault.kind == FaultKind.DRIFT:
+                drift = fault.kind == FaultKind.DRIFT
+                add_index += slots
+                add_value += [0.0 if drift else fault.value] * count
+                add_rate += [fault.value if drift else 0.0] * count
+                add_start += [fault.start] * count
+            elif fault.kind == FaultKind.STUCK:
+                stuck_segments.append((fault_id, slice(len(stuck_index), len(stuck_index) + count)))
+                stuck_index += slots
+                stuck_value += self._held.get(fault_id, [fault.value] * count)
+            else:
+                drop_index += slots
+                drop_owner += [len(drop_threshold)] * count
+                drop_threshold.append(self._threshold(fault.value))
+        self._add_index = np.array(add_index, dtype=np.intp)
+        self._add_unique = len(set(add_index)) == len(add_index)  # else offsets accumulate per slot
+        self._add_value = np.array(add_value)
+        self._add_rate = np.array(add_rate)
+        self._add_start = np.array(add_start)
+        self._stuck_index = np.array(stuck_index, dtype=np.intp)
+        self._stuck_value = np.array(stuck_value, dtype=float)
+        self._stuck_segments = stuck_segments
+        self._drop_index = np.array(drop_index, dtype=np.intp)
+        self._drop_owner = np.array(drop_owner, dtype=np.intp)
+        self._drop_threshold = np.array(drop_threshold)
+        if drop_threshold and self._noise is None:
+            self._noise = self.sim.noise.stream('faults')
+        self.outputs = bool(add_index or stuck_index or drop_index)
+
+    @staticmethod
+    def _threshold(probability: float) -> float:
+        """Standard normal value exceeded with the given probability"""
+        if probability >= 1.0:
+            return -math.inf
+        if probability <= 0.0:
+            return math.inf
+        return NormalDist().inv_cdf(1.0 - probability)
+
+    def _equipment(self, target: str) -> Tuple[Optional[str], Any]:
+        """Equipment class and model of a target (None, None if it is not equipment)"""
+        sim = self.sim
+        if target == 'magnetometer':
+            return target, sim.magnetometer
+        if target == 'rate_sensor':
+            return target, sim.rate_sensor
+        match = _INDEXED.fullmatch(target)
+        if match:
+            group, index = match.group(1), int(match.group(2))
+            models = {'sun_sensor': sim.sun_sensors, 'rw': sim.reaction_wheels, 'thr': sim.thrusters}[group]
+            if index < len(models):
+                return group, models[index]
+        return None, None
+
+    def _output_slots(self, target: str) -> List[int]:
+        """Simulation telemetry slots of an output fault target"""
+        group, _ = self._equipment(target)
+        if group is None:
+            names = [target]
+        else:
+            index = target[len(group):]
+            names = {
+                'magnetometer': ['mag_x', 'mag_y', 'mag_z'],
+                'rate_sensor': ['gyro_x', 'gyro_y', 'gyro_z'],
+                'sun_sensor': [f'ss{index}_azimuth', f'ss{index}_elevation'],
+                'rw': [f'rw{index}_speed'],
+                'thr': [f'thr{index}_flow'],
+            }[group]
+        table = self.sim.telemetry
+        slots = [table.slot(name) for name in names if name in table]
+        slots = [slot for slot in slots if slot < self.sim._telemetry_slots.stop]
+        if not slots:
+            raise ValueError(f"No simulation telemetry for fault target '{target}'")
+        return slots
+
+    def _get(self, key: Tuple[str, str]) -> Any:
+        target, name = key
+        return getattr(self._equipment(target)[1], name)
+
+    def _set(self, key: Tuple[str, str], value: Any):
+        target, name = key
+        setattr(self._equipment(target)[1], name, value)
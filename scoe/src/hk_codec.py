@@ -0,0 +1,130 @@
+"""
+Housekeeping Report Codec
+Compiled encoder/decoder for the TM[3,25] parameter report source data
+
+A report is the structure ID (uint16) followed by the parameter values
+in structure order. Given a structure definition, HKCodec compiles a
+single struct.Struct and a matching NumPy dtype so a whole report is
+encoded or decoded in one call. Parameters may be typed individually to
+pack structures tighter than all-float32. Integer fields saturate at
+the limits of their type and NaN is sent as zero, so an out-of-range
+value never fails a report.
+"""
+
+import struct
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib import recfunctions
+
+# Supported parameter types: name -> (struct code, NumPy type)
+PARAM_TYPES: Dict[str, Tuple[str, str]] = {
+    'uint8': ('B', '>u1'),
+    'uint16': ('H', '>u2'),
+    'int32': ('i', '>i4'),
+    'float32': ('f', '>f4'),
+    'float64': ('d', '>f8'),
+}
+
+# Raw range of the integer types
+INT_LIMITS: Dict[str, Tuple[int, int]] = {
+    'uint8': (0, 0xFF),
+    'uint16': (0, 0xFFFF),
+    'int32': (-2**31, 2**31 - 1),
+}
+
+DEFAULT_TYPE = 'float32'
+
+
+class HKCodec:
+    """Encoder/decoder for one housekeeping report structure"""
+
+    def __init__(self, structure_id: int, parameters: Sequence[str],
+                 types: Optional[Sequence[str]] = None):
+        if types is None:
+            types = [DEFAULT_TYPE] * len(parameters)
+        if len(types) != len(parameters):
+            raise ValueError("One type is required per parameter")
+        unknown = set(types) - set(PARAM_TYPES)
+        if unknown:
+            raise ValueError(f"Unsupported parameter types: {sorted(unknown)}")
+
+        self.structure_id = structure_id
+        self.parameters: Tuple[str, ...] = tuple(parameters)
+        self.types: Tuple[str, ...] = tuple(types)
+
+        # Single struct for the whole report
+        self._struct = struct.Struct('>H' + ''.join(PARAM_TYPES[t][0] for t in self.types))
+        self.size = self._struct.size
+
+        # Integer fields need explicit conversion from float telemetry
+        self._int_fields = tuple(i for i, t in enumerate(self.types)
+                                 if not t.startswith('float'))
+        self._int_limits = tuple((i,) + INT_LIMITS[self.types[i]] for i in self._int_fields)
+        self._int_low = np.array([INT_LIMITS[self.types[i]][0] for i in self._int_fields], dtype=np.float64)
+        self._int_high = np.array([INT_LIMITS[self.types[i]][1] for i in self._int_fields], dtype=np.float64)
+
+        # NumPy record layout (identical to the struct layout)
+        self.dtype = np.dtype([('structure_id', '>u2')] +
+                              [(p, PARAM_TYPES[t][1]) for p, t in zip(self.parameters, self.types)])
+
+    def __len__(self) -> int:
+        return len(self.parameters)
+
+    def encode(self, values: Sequence[float]) -> bytes:
+        """Encode parameter values (in structure order) to report data"""
+        if self._int_fields:
+            values = list(values)
+            for i, low, high in self._int_limits:
+                value = values[i]
+                if value != value:
+                    values[i] = 0
+                elif value <= low:
+                    values[i] = low
+                elif value >= high:
+                    values[i] = high
+                else:
+                    values[i] = int(round(value))
+        return self._struct.pack(self.structure_id, *values)
+
+    def encode_dict(self, params: Dict[str, float]) -> bytes:
+        """Encode a name -> value mapping, missing parameters as zero"""
+        return self.encode([params.get(name, 0.0) for name in self.parameters])
+
+    def decode(self, data: bytes) -> Tuple[float, ...]:
+        """Decode report data to parameter values (structure ID excluded)"""
+        return self._struct.unpack_from(data)[1:]
+
+    def decode_dict(self, data: bytes) -> Dict[str, float]:
+        """Decode report data to a name -> value mapping"""
+        return dict(zip(self.parameters, self.decode(data)))
+
+    def encode_array(self, values: np.ndarray) -> bytes:
+        """
+        Encode one report per row of a (reports, parameters) array
+
+        Rows are cast to the per-parameter types in one call (integer
+        fields saturated as in encode) and the result is the
+        concatenation of the encoded reports.
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        rows = np.empty((len(values), len(self.parameters) + 1))
+        rows[:, 0] = self.structure_id
+        rows[:, 1:] = values
+        if self._int_fields:
+            ints = np.asarray(self._int_fields) + 1
+            rows[:, ints] = np.rint(np.clip(np.nan_to_num(rows[:, ints], nan=0.0),
+                                            self._int_low, self._int_high))
+        return recfunctions.unstructured_to_structured(rows, dtype=self.dtype).tobytes()
+
+    def decode_array(self, data: bytes) -> np.ndarray:
+        """Decode one or more concatenated reports to a record array"""
+        count = len(data) // self.size
+        return np.frombuffer(data, dtype=self.dtype, count=count)
+
+
+@lru_cache(maxsize=None)
+def float32_codec(structure_id: int, count: int) -> HKCodec:
+    """Codec for an untyped structure of `count` float32 parameters"""
+    return HKCodec(structure_id, [f'p{i}' for i in range(count)])
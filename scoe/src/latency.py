@@ -0,0 +1,81 @@
+"""
+Latency Histogram
+Fixed-bucket latency histogram for link and command round-trip statistics
+
+Buckets are defined by upper bounds in milliseconds; a final overflow
+bucket collects everything above the last bound. Recording is O(log n)
+in the number of buckets and memory is constant, so histograms can be
+kept per traffic class for the lifetime of a connection.
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict, Sequence
+
+# Default bucket upper bounds (ms)
+DEFAULT_BOUNDS_MS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0,
+                     100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0)
+
+
+class LatencyHistogram:
+    """Latency histogram with fixed millisecond buckets"""
+
+    def __init__(self, bounds_ms: Sequence[float] = DEFAULT_BOUNDS_MS):
+        self.bounds_ms = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float):
+        """Record one latency sample given in seconds"""
+        ms = seconds * 1000.0
+        self.counts[bisect_left(self.bounds_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Add the samples of a histogram with the same buckets"""
+        if other.bounds_ms != self.bounds_ms:
+            raise ValueError("Histogram buckets differ")
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def reset(self):
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Upper bound (ms) of the bucket holding the p-th percentile, capped at the maximum"""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(self.bounds_ms[i], self.max_ms) if i < len(self.bounds_ms) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean_ms': self.mean_ms,
+            'p50_ms': self.percentile(50),
+            'p99_ms': self.percentile(99),
+            'max_ms': self.max_ms,
+            'buckets': {
+                (f'le_{b:g}' if i < len(self.bounds_ms) else 'overflow'): n
+                for i, (b, n) in enumerate(zip(self.bounds_ms + (float('inf'),), self.counts))
+            },
+        }
@@ -0,0 +1,303 @@
+"""
+Mission Information Base (MIB)
+Parameter registry shared by the mock AOCS server and the SCOE controller
+
+The MIB defines every telemetry/telecommand parameter (ID, name, type,
+unit, calibration, simulation target) and the housekeeping structures
+built from them. It is loaded from JSON, or from CSV tables, and
+compiled into lookup tables and HKCodec instances so both sides decode
+reports identically. A version hash over the canonical content lets the
+controller detect a server running a different MIB at connection test.
+
+Calibrations are polynomials in the raw (transmitted) value, lowest
+order coefficient first. Linear calibrations are also applied in
+reverse by the server when encoding engineering values.
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from hk_codec import HKCodec, PARAM_TYPES, DEFAULT_TYPE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIB_PATH = Path(__file__).resolve().parent.parent / 'config' / 'mib' / 'aocs_mib.json'
+
+# Connection report payload carrying the MIB hash
+MIB_HASH = struct.Struct('>I')
+
+
+@dataclass(frozen=True)
+class MIBParameter:
+    """Parameter definition"""
+    param_id: int
+    name: str
+    type: str = DEFAULT_TYPE
+    unit: str = ''
+    description: str = ''
+    calibration: Tuple[float, ...] = ()  # raw -> engineering polynomial
+    target: Optional[str] = None  # simulation attribute path (Service 20)
+    target_scale: float = 1.0
+
+    @property
+    def calibrated(self) -> bool:
+        return bool(self.calibration)
+
+    def to_engineering(self, raw: float) -> float:
+        """Apply the calibration polynomial to a raw value"""
+        value = 0.0
+        for coefficient in reversed(self.calibration):
+            value = value * raw + coefficient
+        return value
+
+    def to_raw(self, value: float) -> float:
+        """Invert a linear calibration"""
+        if len(self.calibration) > 2:
+            raise ValueError(f"Calibration of '{self.name}' is not linear")
+        if len(self.calibration) == 1:
+            return value - self.calibration[0]
+        offset, gain = self.calibration
+        return (value - offset) / gain
+
+    def to_dict(self) -> Dict[str, Any]:
+        d: Dict[str, Any] = {
+            'id': self.param_id,
+            'name': self.name,
+            'type': self.type,
+            'unit': self.unit,
+            'description': self.description,
+        }
+        if self.calibration:
+            d['calibration'] = list(self.calibration)
+        if self.target:
+            d['target'] = self.target
+            if self.target_scale != 1.0:
+                d['target_scale'] = self.target_scale
+        return d
+
+
+@dataclass(frozen=True)
+class MIBStructure:
+    """Housekeeping structure definition"""
+    structure_id: int
+    parameters: Tuple[str, ...]
+    interval: float = 1.0  # seconds
+    enabled: bool = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.structure_id,
+            'interval': self.interval,
+            'enabled': self.enabled,
+            'parameters': list(self.parameters),
+        }
+
+
+def _compile_setter(target: str, scale: float) -> Callable[[Any, float], None]:
+    """Compile an attribute path into a setter on the simulation object"""
+    path, _, attr = target.rpartition('.')
+    get_owner = attrgetter(path) if path else (lambda obj: obj)
+
+    def setter(root: Any, value: float):
+        setattr(get_owner(root), attr, value * scale)
+    return setter
+
+
+class MIB:
+    """Compiled Mission Information Base"""
+
+    def __init__(self, parameters: Sequence[MIBParameter],
+                 structures: Sequence[MIBStructure],
+                 name: str = '', version: str = ''):
+        self.name = name
+        self.version = version
+
+        # Lookup tables
+        self.parameters: Dict[int, MIBParameter] = {}
+        self.by_name: Dict[str, MIBParameter] = {}
+        for param in parameters:
+            if param.param_id in self.parameters:
+                raise ValueError(f"Duplicate parameter ID {param.param_id}")
+            if param.name in self.by_name:
+                raise ValueError(f"Duplicate parameter name '{param.name}'")
+            if param.type not in PARAM_TYPES:
+                raise ValueError(f"Parameter '{param.name}' has unsupported type '{param.type}'")
+            if len(param.calibration) > 2:
+                logger.warning(f"Parameter '{param.name}' has a non-linear calibration "
+                               "and cannot be encoded from engineering values")
+            self.parameters[param.param_id] = param
+            self.by_name[param.name] = param
+
+        self.structures: Dict[int, MIBStructure] = {}
+        for structure in structures:
+            if structure.structure_id in self.structures:
+                raise ValueError(f"Duplicate HK structure {structure.structure_id}")
+            unknown = [p for p in structure.parameters if p not in self.by_name]
+            if unknown:
+                raise ValueError(f"HK structure {structure.structure_id} "
+                                 f"references unknown parameters: {unknown}")
+            self.structures[structure.structure_id] = structure
+
+        # Prebuilt codecs and calibrations per structure
+        self.codecs: Dict[int, HKCodec] = {
+            sid: self.build_codec(sid, s.parameters) for sid, s in self.structures.items()
+        }
+        self._calibrations: Dict[int, Tuple[Tuple[int, MIBParameter], ...]] = {
+            sid: self.calibrations(s.parameters) for sid, s in self.structures.items()
+        }
+
+        # Service 20 setters
+        self._setters: Dict[int, Callable[[Any, float], None]] = {
+            p.param_id: _compile_setter(p.target, p.target_scale)
+            for p in self.parameters.values() if p.target
+        }
+
+        canonical = json.dumps(self.to_dict(), sort_keys=True, separators=(',', ':'))
+        self.version_hash = hashlib.sha256(canonical.encode()).hexdigest()
+        self.hash32 = int(self.version_hash[:8], 16)
+
+    def __repr__(self) -> str:
+        return (f"MIB({self.name!r}, version={self.version!r}, "
+                f"parameters={len(self.parameters)}, structures={len(self.structures)}, "
+                f"hash={self.version_hash[:8]})")
+
+    def build_codec(self, structure_id: int, parameters: Sequence[str]) -> HKCodec:
+        """Build a codec for a list of parameter names"""
+        types = [self.by_name[p].type if p in self.by_name else DEFAULT_TYPE for p in parameters]
+        return HKCodec(structure_id, parameters, types)
+
+    def calibrations(self, parameters: Sequence[str]) -> Tuple[Tuple[int, MIBParameter], ...]:
+        """(index, parameter) of every calibrated parameter in a list"""
+        by_name = self.by_name
+        return tuple((i, by_name[p]) for i, p in enumerate(parameters)
+                     if p in by_name and by_name[p].calibration)
+
+    def param_names(self, structure_id: int) -> Tuple[str, ...]:
+        """Parameter names of a structure (empty if unknown)"""
+        structure = self.structures.get(structure_id)
+        return structure.parameters if structure else ()
+
+    def decode_report(self, data: bytes) -> Optional[Tuple[int, Tuple[str, ...], List[float]]]:
+        """
+        Decode TM[3,25] report data to engineering values
+
+        Returns (structure_id, parameter names, values), or None when the
+        structure is unknown or the data is shorter than the structure.
+        """
+        if len(data) < 2:
+            return None
+        structure_id = struct.unpack_from('>H', data)[0]
+        codec = self.codecs.get(structure_id)
+        if codec is None or len(data) < codec.size:
+            return None
+        values = list(codec.decode(data))
+        for i, param in self._calibrations[structure_id]:
+            values[i] = param.to_engineering(values[i])
+        return structure_id, codec.parameters, values
+
+    def set_parameter(self, root: Any, param_id: int, value: float) -> bool:
+        """Write a parameter value to its simulation target"""
+        setter = self._setters.get(param_id)
+        if setter is None:
+            return False
+        setter(root, value)
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'version': self.version,
+            'parameters': [p.to_dict() for p in self.parameters.values()],
+            'hk_structures': [s.to_dict() for s in self.structures.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MIB':
+        parameters = [
+            MIBParameter(
+                param_id=int(p['id']),
+                name=p['name'],
+                type=p.get('type', DEFAULT_TYPE),
+                unit=p.get('unit', ''),
+                description=p.get('description', ''),
+                calibration=tuple(float(c) for c in p.get('calibration', ())),
+                target=p.get('target') or None,
+                target_scale=float(p.get('target_scale', 1.0)),
+            )
+            for p in data.get('parameters', [])
+        ]
+        structures = [
+            MIBStructure(
+                structure_id=int(s['id']),
+                parameters=tuple(s['parameters']),
+                interval=float(s.get('interval', 1.0)),
+                enabled=bool(s.get('enabled', True)),
+            )
+            for s in data.get('hk_structures', [])
+        ]
+        return cls(parameters, structures, data.get('name', ''), data.get('version', ''))
+
+    @classmethod
+    def from_csv(cls, path: Union[str, Path]) -> 'MIB':
+        """
+        Load a MIB from CSV tables
+
+        The parameter table has the columns id, name, type, unit,
+        description, calibration (space separated coefficients), target,
+        target_scale and hk_structures (';' separated structure IDs).
+        Structure membership follows row order. Structure intervals are
+        read from <stem>_structures.csv (id, interval, enabled) if present.
+        """
+        path = Path(path)
+        parameters: List[Dict[str, Any]] = []
+        members: Dict[int, List[str]] = {}
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                param = {k: v for k, v in row.items() if v not in (None, '')}
+                if 'calibration' in param:
+                    param['calibration'] = param['calibration'].split()
+                for sid in param.pop('hk_structures', '').split(';'):
+                    if sid.strip():
+                        members.setdefault(int(sid), []).append(param['name'])
+                parameters.append(param)
+
+        structures = {sid: {'id': sid, 'parameters': names} for sid, names in members.items()}
+        structures_path = path.with_name(f'{path.stem}_structures.csv')
+        if structures_path.exists():
+            with open(structures_path, newline='') as f:
+                for row in csv.DictReader(f):
+                    s = structures.setdefault(int(row['id']), {'id': int(row['id']), 'parameters': []})
+                    s['interval'] = float(row.get('interval') or 1.0)
+                    s['enabled'] = (row.get('enabled') or 'true').strip().lower() in ('1', 'true', 'yes')
+
+        return cls.from_dict({
+            'name': path.stem,
+            'parameters': parameters,
+            'hk_structures': [structures[sid] for sid in sorted(structures)],
+        })
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'MIB':
+        """Load a MIB from a .json file or a .csv parameter table"""
+        path = Path(path)
+        if path.suffix.lower() == '.csv':
+            mib = cls.from_csv(path)
+        else:
+            with open(path) as f:
+                mib = cls.from_dict(json.load(f))
+        logger.info(f"Loaded {mib!r} from {path}")
+        return mib
+
+
+@lru_cache(maxsize=None)
+def load_default_mib() -> MIB:
+    """Load the MIB shipped in config/mib"""
+    return MIB.load(DEFAULT_MIB_PATH)
@@ -7,21 +7,48 @@ Based on Section 6.2 of the Technical Proposal.
 """
 
 import asyncio
+import contextvars
+import json
+import math
 import struct
-import time
 import logging
-from typing import Dict, Optional, Callable, List
+from typing import Dict, Optional, Callable, List, Tuple
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from pus_protocol import (
-    PUSPacket, PUSPacketFactory, EDENProtocol,
+    PUSPacket, PUSPacketView, PUSPacketFactory, EDENProtocol, EDENStreamFramer,
     PUSServiceType, PUSServiceSubtype, PacketType
 )
 from aocs_simulation import AOCSSimulation, RWCommandCode
+from checkpoint import Checkpoint
+from command_log import CommandRecorder
+from faults import Fault
+from hk_codec import HKCodec
+from mib import MIB, MIBParameter, MIB_HASH, load_default_mib
+from tm_writer import TMBatchWriter, TMWriterStats, ClientChannel, Priority, DEFAULT_QUEUE_LIMITS
+from latency import LatencyHistogram
+from sim_clock import SimulationClock, ClockMode
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Server-side link telemetry (appended to the simulation telemetry table)
+SERVER_TELEMETRY = ('tm_packets_per_write', 'tm_writes_per_s',
+                    'tm_verif_latency_p99', 'tm_hk_latency_p99',
+                    'sim_step_mean_us', 'sim_step_p99_us', 'sim_step_max_us',
+                    'sim_top_phase', 'sim_top_phase_pct')
+
+# Step profiler summary while profiling is off
+NO_PROFILE = (0.0,) * 5
+
+# Simulation checkpoint slots (Service 8 functions 0x50-0x53)
+CHECKPOINT_SLOTS = 16
+
+# Set while a TC is handled (per task), its telemetry reads are not logged
+_handling_tc = contextvars.ContextVar('handling_tc', default=False)
+
 
 @dataclass
 class HKReportStructure:
@@ -30,7 +57,18 @@ class HKReportStructure:
     enabled: bool = False
     interval: float = 1.0  # seconds
     parameters: List[str] = field(default_factory=list)
+    types: Optional[List[str]] = None  # Per-parameter types, float32 if omitted
+    calibrations: Tuple[Tuple[int, MIBParameter], ...] = ()  # Encoded as raw values
     last_report_time: float = 0.0
+    indices: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # telemetry slots
+    _codec: Optional[HKCodec] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def codec(self) -> HKCodec:
+        """Compiled report codec (parameters are fixed once created)"""
+        if self._codec is None:
+            self._codec = HKCodec(self.structure_id, self.parameters, self.types)
+        return self._codec
 
 
 class MockAOCSServer:
@@ -45,24 +83,72 @@ class MockAOCSServer:
     - Service 20: Parameter Management
     """
     
-    def __init__(self, host: str = '0.0.0.0', port: int = 10025):
+    def __init__(self, host: str = '0.0.0.0', port: int = 10025,
+                 max_batch_packets: int = 64, max_batch_latency: float = 0.0,
+                 mib: Optional[MIB] = None, max_segment_data: int = 1024,
+                 priority_scheduling: bool = True,
+                 clock: Optional[SimulationClock] = None,
+                 simulation: Optional[AOCSSimulation] = None,
+                 record: Optional[str] = None):
         self.host = host
         self.port = port
         self.server: Optional[asyncio.Server] = None
         self.clients: List[asyncio.StreamWriter] = []
         
+        # Prioritised outbound queues per client, queueing latency per class
+        self.channels: Dict[asyncio.StreamWriter, ClientChannel] = {}
+        self.priority_scheduling = priority_scheduling
+        self.tm_latency: Dict[Priority, LatencyHistogram] = {p: LatencyHistogram() for p in Priority}
+        # Socket writes summed over all channels, closed ones included
+        self.tm_link = TMWriterStats()
+        
+        # Simulated mission time (pacing, HK scheduling, TM time stamps)
+        self.clock = clock or SimulationClock()
+        
         # PUS packet factory
-        self.packet_factory = PUSPacketFactory(apid=100, source_id=1)
+        self.packet_factory = PUSPacketFactory(apid=100, source_id=1,
+                                               time_source=self.clock.mission_time)
+        
+        # Bulk (segmented) reports use their own APID so their sequence
+        # counts stay contiguous while HK reports are interleaved
+        self.bulk_factory = PUSPacketFactory(apid=101, source_id=1,
+                                             time_source=self.clock.mission_time)
+        self.max_segment_data = max_segment_data
+        
+        # Batched TM writer for periodic reports (batch age in simulated
+        # time, like the HK schedule)
+        self.tm_writer = TMBatchWriter(max_packets=max_batch_packets,
+                                       max_latency=max_batch_latency, clock=self.clock.now)
         
         # AOCS Simulation
-        self.simulation = AOCSSimulation()
+        self.simulation = simulation or AOCSSimulation()
+        
+        # Telemetry table shared with the simulation, plus link telemetry
+        self.telemetry = self.simulation.telemetry
+        self._server_slots = self.telemetry.add(SERVER_TELEMETRY)
+        
+        # Mission Information Base (parameter and HK structure definitions)
+        self.mib = mib or load_default_mib()
         
         # Housekeeping structures
         self.hk_structures: Dict[int, HKReportStructure] = {}
         self._create_default_hk_structures()
         
         # Staged parameters (Service 20)
-        self.staged_parameters: Dict[str, float] = {}
+        self.staged_parameters: Dict[int, float] = {}
+        
+        # Saved simulation checkpoints by slot
+        self.checkpoints: Dict[int, Checkpoint] = {}
+        
+        # Self-test duration (s, zero in replay)
+        self.self_test_duration = 1.0
+        
+        # Simulation steps taken and optional command log of the session
+        self.steps = 0
+        self.recorder: Optional[CommandRecorder] = None
+        if record:
+            self.recorder = CommandRecorder(record, self.simulation, self._server_slots.start,
+                                            self.mib.hash32)
         
         # Running state
         self.running = False
@@ -70,74 +156,23 @@ class MockAOCSServer:
         self._hk_task: Optional[asyncio.Task] = None
     
     def _create_default_hk_structures(self):
-        """Create default housekeeping report structures"""
-        # Structure 1: Attitude telemetry
-        self.hk_structures[1] = HKReportStructure(
-            structure_id=1,
-            enabled=True,
-            interval=1.0,
-            parameters=[
-                'att_q_w', 'att_q_x', 'att_q_y', 'att_q_z',
-                'rate_x', 'rate_y', 'rate_z'
-            ]
-        )
-        
-        # Structure 2: Reaction wheel telemetry
-        self.hk_structures[2] = HKReportStructure(
-            structure_id=2,
-            enabled=True,
-            interval=0.5,
-            parameters=[
-                'rw0_speed', 'rw1_speed', 'rw2_speed', 'rw3_speed',
-                'rw0_temperature', 'rw1_temperature', 'rw2_temperature', 'rw3_temperature',
-                'rw0_cmd_torque', 'rw1_cmd_torque', 'rw2_cmd_torque', 'rw3_cmd_torque',
-            ]
-        )
-        
-        # Structure 3: Sensor telemetry
-        self.hk_structures[3] = HKReportStructure(
-            structure_id=3,
-            enabled=True,
-            interval=1.0,
-            parameters=[
-                'mag_x', 'mag_y', 'mag_z',
-                'gyro_x', 'gyro_y', 'gyro_z',
-                'ss0_detected', 'ss0_azimuth', 'ss0_elevation',
-            ]
-        )
-        
-        # Structure 4: Thruster telemetry
-        self.hk_structures[4] = HKReportStructure(
-            structure_id=4,
-            enabled=True,
-            interval=1.0,
-            parameters=[
-                'thr0_firing', 'thr1_firing', 'thr2_firing', 'thr3_firing',
-                'thr0_temperature', 'thr1_temperature', 'thr2_temperature', 'thr3_temperature',
-            ]
-        )
-        
-        # Structure 5: SADA telemetry
-        self.hk_structures[5] = HKReportStructure(
-            structure_id=5,
-            enabled=True,
-            interval=2.0,
-            parameters=[
-                'sada0_angle', 'sada1_angle',
-                'sada0_deployed', 'sada1_deployed',
-            ]
-        )
-        
-        # Structure 6: Simulation status
-        self.hk_structures[6] = HKReportStructure(
-            structure_id=6,
-            enabled=True,
-            interval=1.0,
-            parameters=[
-                'sim_time', 'sim_running',
-                'pos_x', 'pos_y', 'pos_z',
-                'in_eclipse',
-            ]
+        """Create default housekeeping report structures from the MIB"""
+        for struct_id, definition in self.mib.structures.items():
+            self.hk_structures[struct_id] = self._create_hk_structure(
+                struct_id, definition.parameters, definition.enabled, definition.interval)
+    
+    def _create_hk_structure(self, struct_id: int, parameters: List[str],
+                             enabled: bool = False, interval: float = 1.0) -> HKReportStructure:
+        """Create a housekeeping structure typed and calibrated from the MIB"""
+        parameters = list(parameters)
+        return HKReportStructure(
+            structure_id=struct_id,
+            enabled=enabled,
+            interval=interval,
+            parameters=parameters,
+            types=list(self.mib.build_codec(struct_id, parameters).types),
+            calibrations=self.mib.calibrations(parameters),
+            indices=self.telemetry.index(parameters),
         )
     
     async def start(self):
@@ -157,6 +192,7 @@ class MockAOCSServer:
         
         addr = self.server.sockets[0].getsockname()
         logger.info(f"Mock AOCS Server started on {addr}")
+        logger.info(f"Simulation noise seed {self.simulation.noise.seed}")
         
         async with self.server:
             await self.server.serve_forever()
@@ -171,6 +207,8 @@ class MockAOCSServer:
         if self.server:
             self.server.close()
             await self.server.wait_closed()
+        if self.recorder:
+            self.recorder.close(self.steps, self.simulation.time, self.simulation.refresh_telemetry())
         logger.info("Mock AOCS Server stopped")
     
     async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
@@ -178,26 +216,25 @@ class MockAOCSServer:
         addr = writer.get_extra_info('peername')
         logger.info(f"Client connected from {addr}")
         self.clients.append(writer)
+        channel = self.channels[writer] = ClientChannel(
+            writer, histograms=self.tm_latency, priorities=self.priority_scheduling, totals=self.tm_link)
+        channel.start()
         
-        buffer = b''
+        framer = EDENStreamFramer()
         try:
             while self.running:
                 data = await reader.read(4096)
                 if not data:
                     break
                 
-                buffer += data
+                framer.feed(data)
                 
                 # Process complete packets
-                while True:
-                    packet_data, buffer = EDENProtocol.find_packet(buffer)
-                    if packet_data is None:
-                        break
-                    
+                for frame in framer.frames():
                     try:
-                        pus_packet = EDENProtocol.unwrap_packet(packet_data)
-                        if pus_packet:
-                            await self._process_telecommand(pus_packet, writer)
+                        tc = EDENProtocol.unwrap_view(frame)
+                        if tc:
+                            await self._process_telecommand(tc, writer)
                     except Exception as e:
                         logger.error(f"Error processing packet: {e}")
         
@@ -207,21 +244,28 @@ class MockAOCSServer:
             logger.error(f"Client error: {e}")
         finally:
             self.clients.remove(writer)
+            del self.channels[writer]
+            await channel.close()
             writer.close()
             await writer.wait_closed()
             logger.info(f"Client disconnected from {addr}")
     
-    async def _process_telecommand(self, tc: PUSPacket, writer: asyncio.StreamWriter):
+    async def _process_telecommand(self, tc: PUSPacketView, writer: asyncio.StreamWriter):
         """Process a telecommand packet"""
-        service = tc.pus_header.service_type
-        subtype = tc.pus_header.service_subtype
+        service = tc.service_type
+        subtype = tc.service_subtype
         
         logger.info(f"Received TC[{service},{subtype}]")
         
+        # Telemetry read while handling the TC is re-read by its replay
+        if self.recorder:
+            self.recorder.record_tc(self.steps, self.simulation.time, tc.tobytes())
+        handling = _handling_tc.set(True)
+        
         # Send acceptance success
-        if tc.pus_header.ack_flags & 0x1:
-            tm = self.packet_factory.create_acceptance_success(tc)
-            await self._send_telemetry(tm, writer)
+        if tc.ack_flags & 0x1:
+            frame = self.packet_factory.encode_acceptance_success(tc)
+            await self._send_frame(frame, writer, Priority.VERIFICATION)
         
         success = True
         error_code = 0
@@ -234,7 +278,7 @@ class MockAOCSServer:
             elif service == PUSServiceType.CONNECTION_TEST:
                 success = await self._handle_connection_test(writer)
             elif service == PUSServiceType.PARAMETER_MANAGEMENT:
-                success = await self._handle_parameter_management(subtype, tc.data)
+                success = await self._handle_parameter_management(subtype, tc.data, writer)
             else:
                 logger.warning(f"Unsupported service type: {service}")
                 success = False
@@ -244,31 +288,35 @@ class MockAOCSServer:
             logger.error(f"Error handling TC: {e}")
             success = False
             error_code = 2
+        finally:
+            _handling_tc.reset(handling)
         
         # Send execution result
-        if tc.pus_header.ack_flags & 0x8:
+        if tc.ack_flags & 0x8:
             if success:
-                tm = self.packet_factory.create_execution_success(tc)
+                frame = self.packet_factory.encode_execution_success(tc)
             else:
-                tm = self.packet_factory.create_execution_failure(tc, error_code)
-            await self._send_telemetry(tm, writer)
+                frame = self.packet_factory.encode_execution_failure(tc, error_code)
+            await self._send_frame(frame, writer, Priority.VERIFICATION)
     
     async def _handle_housekeeping(self, subtype: int, data: bytes, 
                                    writer: asyncio.StreamWriter) -> bool:
         """Handle Service 3 - Housekeeping"""
         if subtype == PUSServiceSubtype.TC_CREATE_HK_REPORT:
-            # Create new HK structure
+            # Create new HK structure: structure ID, N, N parameter IDs
             if len(data) >= 2:
                 struct_id = struct.unpack('>H', data[:2])[0]
-                # Parse parameter list from remaining data
-                params = []
-                # Simplified: use predefined structures
-                self.hk_structures[struct_id] = HKReportStructure(
-                    structure_id=struct_id,
-                    enabled=False,
-                    parameters=params
-                )
-                logger.info(f"Created HK structure {struct_id}")
+                count = struct.unpack('>H', data[2:4])[0] if len(data) >= 4 else 0
+                if len(data) < 4 + 2 * count:
+                    return False
+                param_ids = struct.unpack(f'>{count}H', data[4:4 + 2 * count])
+                unknown = [pid for pid in param_ids if pid not in self.mib.parameters]
+                if unknown:
+                    logger.warning(f"HK structure {struct_id} has unknown parameters {unknown}")
+                    return False
+                params = [self.mib.parameters[pid].name for pid in param_ids]
+                self.hk_structures[struct_id] = self._create_hk_structure(struct_id, params)
+                logger.info(f"Created HK structure {struct_id} with {count} parameters")
             return True
         
         elif subtype == PUSServiceSubtype.TC_DELETE_HK_REPORT:
@@ -343,7 +391,8 @@ class MockAOCSServer:
         elif function_id == 5:  # Self-test
             logger.info("Self-test started")
             # Simulate self-test
-            await asyncio.sleep(1)
+            if self.self_test_duration:
+                await asyncio.sleep(self.self_test_duration)
             logger.info("Self-test completed")
             return True
         
@@ -380,22 +429,134 @@ class MockAOCSServer:
                 self.simulation.sadas[sada_id].commanded_angle = angle
                 logger.info(f"SADA {sada_id} angle: {angle}")
                 return True
+                
+        elif function_id >= 0x50 and function_id <= 0x53:  # Checkpoint commands
+            # Slot in data[1]; fork seed (u32) in data[2:6]
+            slot = data[1] if len(data) > 1 else 0
+            if slot >= CHECKPOINT_SLOTS:
+                return False
+            if function_id == 0x50:  # Save
+                self.save_checkpoint(slot)
+                return True
+            if slot not in self.checkpoints:
+                return False
+            if function_id == 0x51:  # Restore
+                self.restore_checkpoint(slot)
+                return True
+            if function_id == 0x52 and len(data) >= 6:  # Restore with new noise seed
+                self.restore_checkpoint(slot, struct.unpack('>I', data[2:6])[0])
+                return True
+            if function_id == 0x53:  # Delete
+                del self.checkpoints[slot]
+                logger.info(f"Deleted checkpoint {slot}")
+                return True
+        
+        elif function_id >= 0x60 and function_id <= 0x62:  # Step profiler commands
+            if self.simulation.engine is not None:
+                return False
+            if function_id == 0x60:  # Enable (data[1] = 1) or disable
+                enabled = data[1] == 1 if len(data) > 1 else True
+                self.simulation.enable_profiling(enabled)
+                logger.info(f"Step profiling {'enabled' if enabled else 'disabled'}")
+                return True
+            profiler = self.simulation.profiler
+            if profiler is None:
+                return False
+            if function_id == 0x61:  # Reset histograms
+                profiler.reset()
+                return True
+            if function_id == 0x62:  # Report histograms
+                await self._send_profile_report(writer)
+                return True
+        
+        elif function_id == 0x70 and len(data) >= 3:  # Inject a fault
+            # Kind (faults.FaultKind) in data[1], target name length in
+            # data[2], target name, then f32 start (simulated s, earlier
+            # means now), duration (s, 0 until cleared) and value
+            size = data[2]
+            if len(data) < 15 + size:
+                return False
+            target = bytes(data[3:3 + size]).decode(errors='replace')
+            start, duration, value = struct.unpack('>fff', data[3 + size:15 + size])
+            try:
+                fault_id = self.simulation.faults.add(Fault(
+                    data[1], target, max(start, self.simulation.time),
+                    duration if duration > 0 else math.inf, value))
+            except ValueError as e:
+                logger.warning(f"Fault rejected: {e}")
+                return False
+            logger.info(f"Fault {fault_id} injected on {target}")
+            return True
+        
+        elif function_id == 0x71:  # Remove the fault with id data[1:3] (u16), all without
+            if len(data) >= 3:
+                return self.simulation.faults.remove(struct.unpack('>H', data[1:3])[0])
+            self.simulation.faults.clear()
+            logger.info("All faults cleared")
+            return True
         
         return False
     
+    def save_checkpoint(self, slot: int = 0) -> Checkpoint:
+        """Checkpoint the simulation, HK structures and staged parameters into a slot"""
+        extra = json.dumps({
+            'hk': [[s.structure_id, s.enabled, s.interval, s.parameters]
+                   for s in self.hk_structures.values()],
+            'staged': list(self.staged_parameters.items()),
+        }).encode()
+        checkpoint = self.checkpoints[slot] = self.simulation.checkpoint(extra)
+        logger.info(f"Saved checkpoint {slot} at t={checkpoint.time:.3f}s ({len(checkpoint)} bytes)")
+        return checkpoint
+    
+    def restore_checkpoint(self, slot: int = 0, seed: Optional[int] = None):
+        """
+        Return to the checkpoint in a slot
+        
+        With a seed the noise continues from that seed instead (a fork of
+        the checkpointed state). HK report timing restarts at the current
+        mission time.
+        """
+        extra = json.loads(self.simulation.restore(self.checkpoints[slot], seed))
+        now = self.clock.now()
+        self.hk_structures = {}
+        for struct_id, enabled, interval, parameters in extra['hk']:
+            structure = self._create_hk_structure(struct_id, parameters, enabled, interval)
+            structure.last_report_time = now
+            self.hk_structures[struct_id] = structure
+        self.staged_parameters = {pid: value for pid, value in extra['staged']}
+        logger.info(f"Restored checkpoint {slot} (t={self.simulation.time:.3f}s"
+                    + (f", seed {seed})" if seed is not None else ")"))
+    
     async def _handle_connection_test(self, writer: asyncio.StreamWriter) -> bool:
         """Handle Service 17 - Connection Test"""
-        tm = self.packet_factory.create_connection_report()
-        await self._send_telemetry(tm, writer)
+        frame = self.packet_factory.encode_connection_report(MIB_HASH.pack(self.mib.hash32))
+        await self._send_frame(frame, writer)
         logger.info("Connection test response sent")
         return True
     
-    async def _handle_parameter_management(self, subtype: int, data: bytes) -> bool:
+    async def _handle_parameter_management(self, subtype: int, data: bytes,
+                                           writer: asyncio.StreamWriter) -> bool:
         """Handle Service 20 - Parameter Management"""
+        if subtype == PUSServiceSubtype.TC_REPORT_PARAMETERS:
+            # N, N parameter IDs (N = 0 reports every MIB parameter)
+            count = struct.unpack('>H', data[:2])[0] if len(data) >= 2 else 0
+            if len(data) < 2 + 2 * count:
+                return False
+            param_ids = struct.unpack(f'>{count}H', data[2:2 + 2 * count]) or tuple(self.mib.parameters)
+            unknown = [pid for pid in param_ids if pid not in self.mib.parameters]
+            if unknown:
+                logger.warning(f"Unknown parameters {unknown}")
+                return False
+            await self._send_parameter_report(param_ids, writer)
+            return True
+        
         if subtype == PUSServiceSubtype.TC_SET_PARAMETER:
             if len(data) >= 6:
                 param_id = struct.unpack('>H', data[:2])[0]
                 value = struct.unpack('>f', data[2:6])[0]
+                if param_id not in self.mib.parameters:
+                    logger.warning(f"Unknown parameter {param_id}")
+                    return False
                 self.staged_parameters[param_id] = value
                 logger.info(f"Staged parameter {param_id} = {value}")
             return True
@@ -404,77 +565,166 @@ class MockAOCSServer:
     def _apply_staged_parameters(self):
         """Apply staged parameters to simulation"""
         for param_id, value in self.staged_parameters.items():
-            # Map parameter IDs to simulation parameters
-            # This would be defined in the MIB
-            if param_id == 100:  # Example: Initial quaternion W
-                self.simulation.state.quaternion.w = value
-            elif param_id == 101:
-                self.simulation.state.quaternion.x = value
-            # Add more parameter mappings as needed
+            if not self.mib.set_parameter(self.simulation, param_id, value):
+                logger.warning(f"Parameter {param_id} is not settable")
         
         self.staged_parameters.clear()
     
     async def _send_telemetry(self, tm: PUSPacket, writer: Optional[asyncio.StreamWriter] = None):
         """Send telemetry packet"""
-        eden_packet = EDENProtocol.wrap_packet(tm)
-        
+        await self._send_frame(EDENProtocol.wrap_packet(tm), writer)
+    
+    async def _send_frame(self, eden_packet: bytes, writer: Optional[asyncio.StreamWriter] = None,
+                          priority: Priority = Priority.EVENT, wait: bool = False):
+        """
+        Queue an encoded EDEN frame on the client's channel
+        
+        Broadcasts to all clients when no writer is given. With wait set
+        the call waits for room in a full queue instead of dropping the
+        oldest queued item.
+        """
         if writer:
-            writer.write(eden_packet)
-            await writer.drain()
+            channels = [self.channels[writer]] if writer in self.channels else []
+            if not channels:
+                # Not a served connection (no channel), write directly
+                writer.write(eden_packet)
+                await writer.drain()
+                return
         else:
-            # Broadcast to all clients
-            for client in self.clients:
-                try:
-                    client.write(eden_packet)
-                    await client.drain()
-                except Exception as e:
-                    logger.error(f"Error sending to client: {e}")
+            channels = list(self.channels.values())
+        
+        for channel in channels:
+            if wait:
+                await channel.put_wait(eden_packet, priority)
+            else:
+                channel.put(eden_packet, priority)
+    
+    async def _send_profile_report(self, writer: Optional[asyncio.StreamWriter] = None):
+        """Send TM[8,128] step profile histograms (StepProfiler.encode), segmented"""
+        segments = self.bulk_factory.encode_tm_segments(
+            PUSServiceType.FUNCTION_MANAGEMENT, PUSServiceSubtype.TM_PROFILE_REPORT,
+            self.simulation.profiler.encode(), self.max_segment_data)
+        for frame in segments:
+            await self._send_frame(frame, writer, Priority.BULK, wait=True)
+    
+    async def _send_parameter_report(self, param_ids: Tuple[int, ...],
+                                     writer: Optional[asyncio.StreamWriter] = None):
+        """Send TM[20,2] parameter values, segmented if larger than max_segment_data"""
+        parameters = self.mib.parameters
+        values = self._read_telemetry(self.telemetry.index([parameters[pid].name for pid in param_ids]))
+        
+        data = bytearray(struct.pack('>H', len(param_ids)))
+        for pid, value in zip(param_ids, values):
+            data += struct.pack('>Hf', pid, value)
+        
+        segments = self.bulk_factory.encode_tm_segments(
+            PUSServiceType.PARAMETER_MANAGEMENT, PUSServiceSubtype.TM_PARAMETER_REPORT,
+            data, self.max_segment_data)
+        for frame in segments:
+            # Lowest priority: HK and verification reports overtake queued segments
+            await self._send_frame(frame, writer, Priority.BULK, wait=True)
+        logger.info(f"Parameter report sent ({len(param_ids)} parameters, {len(data)} bytes)")
     
     async def _send_hk_report(self, struct_id: int, writer: Optional[asyncio.StreamWriter] = None):
         """Send a housekeeping report"""
+        frame = self._encode_hk_report(struct_id)
+        if frame:
+            await self._send_frame(frame, writer, Priority.HOUSEKEEPING)
+    
+    def _encode_hk_report(self, struct_id: int) -> Optional[bytes]:
+        """Encode a housekeeping report as an EDEN frame"""
         if struct_id not in self.hk_structures:
-            return
+            return None
         
         structure = self.hk_structures[struct_id]
-        all_tm = self.simulation.get_all_telemetry()
+        if structure.indices is None:
+            structure.indices = self.telemetry.index(structure.parameters)
         
-        # Get parameter values
-        params = {}
-        for param_name in structure.parameters:
-            if param_name in all_tm:
-                params[param_name] = all_tm[param_name]
+        # Get parameter values in structure order
+        values = self._read_telemetry(structure.indices)
+        for i, param in structure.calibrations:
+            values[i] = param.to_raw(values[i])
         
-        tm = self.packet_factory.create_hk_report(struct_id, params)
-        await self._send_telemetry(tm, writer)
+        return self.packet_factory.encode_hk(structure.codec, values)
+    
+    def _read_telemetry(self, indices: np.ndarray) -> List[float]:
+        """Current values of the telemetry slots in indices"""
+        values = self.simulation.refresh_telemetry()
+        if self.recorder and not _handling_tc.get():
+            self.recorder.record_read(self.steps, self.simulation.time, values)
+        
+        # Server-side link telemetry and step profile summary (wall time,
+        # kept out of the simulation slots)
+        stats = self.tm_link
+        profiler = self.simulation.profiler
+        values[self._server_slots] = (
+            stats.packets_per_write,
+            stats.writes_per_second(),
+            self.tm_latency[Priority.VERIFICATION].percentile(99),
+            self.tm_latency[Priority.HOUSEKEEPING].percentile(99),
+            *(profiler.summary().values() if profiler else NO_PROFILE),
+        )
+        return values[indices].tolist()
+    
+    def latency_stats(self) -> Dict[str, Dict]:
+        """Outbound queueing latency histograms per traffic class"""
+        return {p.name.lower(): h.to_dict() for p, h in self.tm_latency.items()}
     
     async def _simulation_loop(self):
-        """Main simulation loop running at 80 Hz"""
-        interval = self.simulation.dt
+        """Main simulation loop running at 80 Hz simulated time"""
+        clock = self.clock
         
         while self.running:
-            start = time.time()
-            
+            # The step size may change between steps (e.g. long coast steps)
+            dt = self.simulation.dt
             self.simulation.step()
-            
-            # Sleep for remaining time
-            elapsed = time.time() - start
-            if elapsed < interval:
-                await asyncio.sleep(interval - elapsed)
+            self.steps += 1
+            clock.advance(dt)
+            await clock.pace()
     
     async def _housekeeping_loop(self):
-        """Housekeeping report generation loop"""
+        """Housekeeping report generation loop (simulated time)"""
+        tick = 0.1  # Check every 100ms
+        if self.tm_writer.max_latency > 0:
+            tick = min(tick, self.tm_writer.max_latency)
+        clock = self.clock
+        next_tick = clock.now()
+        
         while self.running:
-            current_time = time.time()
+            current_time = clock.now()
             
             for struct_id, structure in self.hk_structures.items():
                 if not structure.enabled:
                     continue
                 
-                if current_time - structure.last_report_time >= structure.interval:
-                    await self._send_hk_report(struct_id)
+                # Tolerance for the step-size rounding in simulated time
+                if current_time - structure.last_report_time >= structure.interval - 1e-6:
+                    try:
+                        frame = self._encode_hk_report(struct_id)
+                    except Exception as e:
+                        # A bad value skips this report, not all further HK
+                        logger.error(f"Error encoding HK structure {struct_id}: {e}")
+                        frame = None
+                    if frame:
+                        self.tm_writer.add(frame)
+                        if self.tm_writer.full:
+                            self.tm_writer.flush(self.channels.values())
                     structure.last_report_time = current_time
             
-            await asyncio.sleep(0.1)  # Check every 100ms
+            # One queued batch per client for everything due in this tick
+            self.tm_writer.flush_if_due(self.channels.values())
+            
+            # Faster than real time: hold simulated time until the clients
+            # have taken the HK backlog instead of dropping reports
+            if clock.mode != ClockMode.REALTIME:
+                limit = DEFAULT_QUEUE_LIMITS[Priority.HOUSEKEEPING] // 2
+                with clock.hold():
+                    for channel in list(self.channels.values()):
+                        await channel.wait_below(limit)
+            
+            # Fixed tick grid so report intervals do not drift
+            next_tick = max(next_tick + tick, current_time)
+            await clock.sleep_until(next_tick)
 
 
 async def main():
@@ -0,0 +1,183 @@
+"""
+Simulation Step Profiler
+Per-phase execution time histograms of the object engine step
+
+When a StepProfiler is attached (AOCSSimulation.enable_profiling), the
+rate scheduler times every model task it runs and the whole frame with
+time.perf_counter_ns. Each phase (scheduler task: wheels, thrusters,
+rods, dynamics, quaternion, thermal models, sensors, SADAs) and the step
+itself keep a histogram with power-of-two nanosecond buckets, so
+recording is one integer bit_length and an add. Without a profiler the
+scheduler runs its unprofiled loop and nothing is recorded.
+
+report() prints a flame-style breakdown (time per step and share of the
+step for each phase, scheduling overhead as 'other'); encode()/decode()
+carry the histograms in the Service 8 profile report.
+"""
+
+import struct
+from typing import Any, Dict, List, Optional
+
+# Phases in frame order; HK summary reports the costliest as 1-based index
+PHASES = ('environment', 'wheels', 'thrusters', 'rods', 'dynamics', 'quaternion',
+          'wheel_thermal', 'thruster_thermal', 'magnetometer', 'rate_sensor',
+          'sun_sensors', 'sadas')
+
+BUCKETS = 40  # bucket i: durations below 2**i ns (the last also collects longer ones)
+
+_RECORD = struct.Struct('>IQQB')  # count, total ns, max ns, bucket count
+
+
+class PhaseHistogram:
+    """Execution times (ns) in power-of-two buckets"""
+
+    __slots__ = ('counts', 'count', 'total_ns', 'max_ns')
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int):
+        self.counts[min(ns.bit_length(), BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Upper bound (ns) of the bucket holding the p-th percentile, capped at the maximum"""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return float(min(2 ** i, self.max_ns))
+        return float(self.max_ns)
+
+    def to_dict(self) -> Dict[str, Any]:
+        last = max((i for i, n in enumerate(self.counts) if n), default=-1)
+        return {
+            'count': self.count,
+            'total_us': self.total_ns / 1e3,
+            'mean_us': self.mean_ns / 1e3,
+            'p50_us': self.percentile(50) / 1e3,
+            'p99_us': self.percentile(99) / 1e3,
+            'max_us': self.max_ns / 1e3,
+            'buckets': {f'lt_{2 ** i}ns': n for i, n in enumerate(self.counts[:last + 1])},
+        }
+
+
+class StepProfiler:
+    """Step and per-phase execution time histograms"""
+
+    def __init__(self):
+        self.step = PhaseHistogram()
+        self.phases: Dict[str, PhaseHistogram] = {}
+
+    def phase(self, name: str) -> PhaseHistogram:
+        histogram = self.phases.get(name)
+        if histogram is None:
+            histogram = self.phases[name] = PhaseHistogram()
+        return histogram
+
+    def reset(self):
+        self.step = PhaseHistogram()
+        self.phases = {name: PhaseHistogram() for name in self.phases}
+
+    @property
+    def steps(self) -> int:
+        return self.step.count
+
+    def breakdown(self) -> List[Dict[str, Any]]:
+        """Time per step (us) and share of the step per phase, plus 'other'"""
+        steps = self.step.count
+        if not steps:
+            return []
+        total = self.step.total_ns
+        rows = [{'phase': name, 'us_per_step': h.total_ns / steps / 1e3,
+                 'share': h.total_ns / total if total else 0.0,
+                 'runs': h.count, 'p99_us': h.percentile(99) / 1e3}
+                for name, h in self.phases.items()]
+        other = total - sum(h.total_ns for h in self.phases.values())
+        rows.append({'phase': 'other', 'us_per_step': other / steps / 1e3,
+                     'share': other / total if total else 0.0, 'runs': steps, 'p99_us': None})
+        return rows
+
+    def top_phase(self) -> Optional[str]:
+        """Phase with the most time"""
+        if not self.phases:
+            return None
+        return max(self.phases.items(), key=lambda item: item[1].total_ns)[0]
+
+    def summary(self) -> Dict[str, float]:
+        """Step mean/p99/max (us) and the costliest phase for HK"""
+        top = self.top_phase()
+        step = self.step
+        return {
+            'step_mean_us': step.mean_ns / 1e3,
+            'step_p99_us': step.percentile(99) / 1e3,
+            'step_max_us': step.max_ns / 1e3,
+            'top_phase': float(PHASES.index(top) + 1 if top in PHASES else 0),
+            'top_phase_pct': (self.phases[top].total_ns / step.total_ns * 100
+                              if top and step.total_ns else 0.0),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'step': self.step.to_dict(),
+                'phases': {name: h.to_dict() for name, h in self.phases.items()}}
+
+    def report(self, width: int = 40) -> str:
+        """Flame-style breakdown: one bar per phase, scaled to the step"""
+        step = self.step
+        lines = [f"{'phase':<20} {'us/step':>9} {'share':>7} {'p99 us':>8}",
+                 f"{'step':<20} {step.total_ns / max(step.count, 1) / 1e3:>9.2f} {100.0:>6.1f}% "
+                 f"{step.percentile(99) / 1e3:>8.2f} {'#' * width}"]
+        rows = self.breakdown()
+        for i, row in enumerate(rows):
+            branch = '`-' if i == len(rows) - 1 else '|-'
+            bar = '#' * round(max(row['share'], 0.0) * width)
+            p99 = f"{row['p99_us']:>8.2f}" if row['p99_us'] is not None else f"{'':>8}"
+            lines.append(f"{branch} {row['phase']:<17} {row['us_per_step']:>9.2f} "
+                         f"{row['share'] * 100:>6.1f}% {p99} {bar}")
+        return '\n'.join(lines)
+
+    def encode(self) -> bytes:
+        """Histograms as report data: N, then per histogram (step first) name and buckets"""
+        histograms = [('step', self.step)] + list(self.phases.items())
+        data = bytearray(struct.pack('>H', len(histograms)))
+        for name, h in histograms:
+            last = max((i for i, n in enumerate(h.counts) if n), default=-1)
+            encoded = name.encode()
+            data += struct.pack('>B', len(encoded)) + encoded
+            data += _RECORD.pack(h.count, h.total_ns, h.max_ns, last + 1)
+            data += struct.pack(f'>{last + 1}I', *h.counts[:last + 1])
+        return bytes(data)
+
+    @classmethod
+    def decode(cls, data: bytes) -> 'StepProfiler':
+        """Profiler holding the histograms of encode() data"""
+        profiler = cls()
+        count, = struct.unpack_from('>H', data)
+        offset = 2
+        for _ in range(count):
+            size = data[offset]
+            name = bytes(data[offset + 1:offset + 1 + size]).decode()
+            offset += 1 + size
+            h = PhaseHistogram()
+            h.count, h.total_ns, h.max_ns, buckets = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            h.counts[:buckets] = struct.unpack_from(f'>{buckets}I', data, offset)
+            offset += 4 * buckets
+            if name == 'step':
+                profiler.step = h
+            else:
+                profiler.phases[name] = h
+        return profiler
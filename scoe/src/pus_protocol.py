@@ -14,9 +14,12 @@ import struct
 import time
 from dataclasses import dataclass, field
 from enum import IntEnum
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Iterator, Tuple, Union
 import hashlib
 
+from crc16 import crc16, verify_spans
+from hk_codec import HKCodec, float32_codec
+
 
 class PUSServiceType(IntEnum):
     """PUS Service Types supported by AOCS SCOE"""
@@ -46,12 +49,15 @@ class PUSServiceSubtype(IntEnum):
     
     # Service 8 - Function Management
     TC_PERFORM_FUNCTION = 1
+    TM_PROFILE_REPORT = 128  # Mission specific: step profile histograms
     
     # Service 17 - Connection Test
     TC_CONNECTION_TEST = 1
     TM_CONNECTION_REPORT = 2
     
     # Service 20 - Parameter Management
+    TC_REPORT_PARAMETERS = 1
+    TM_PARAMETER_REPORT = 2
     TC_SET_PARAMETER = 3
 
 
@@ -61,6 +67,14 @@ class PacketType(IntEnum):
     TC = 1  # Telecommand
 
 
+class SequenceFlags(IntEnum):
+    """CCSDS Sequence Flags (packet segmentation)"""
+    CONTINUATION = 0
+    FIRST = 1
+    LAST = 2
+    STANDALONE = 3
+
+
 @dataclass
 class CCSDSHeader:
     """CCSDS Space Packet Primary Header (6 bytes)"""
@@ -161,6 +175,22 @@ class PUSPacket:
     data: bytes = b''
     crc: int = 0
     
+    @property
+    def sequence_count(self) -> int:
+        return self.ccsds_header.sequence_count
+    
+    @property
+    def service_type(self) -> int:
+        return self.pus_header.service_type
+    
+    @property
+    def service_subtype(self) -> int:
+        return self.pus_header.service_subtype
+    
+    @property
+    def ack_flags(self) -> int:
+        return self.pus_header.ack_flags
+    
     def pack(self) -> bytes:
         """Pack complete packet to bytes"""
         is_tm = self.ccsds_header.packet_type == PacketType.TM
@@ -202,25 +232,172 @@ class PUSPacket:
     @staticmethod
     def _calculate_crc(data: bytes) -> int:
         """Calculate CRC-16-CCITT"""
-        crc = 0xFFFF
-        for byte in data:
-            crc ^= byte << 8
-            for _ in range(8):
-                if crc & 0x8000:
-                    crc = (crc << 1) ^ 0x1021
-                else:
-                    crc <<= 1
-                crc &= 0xFFFF
-        return crc
+        return crc16(data)
+    
+    @staticmethod
+    def packet_spans(buffer: bytes) -> List[Tuple[int, int]]:
+        """Locate back-to-back CCSDS packets in a buffer, return [start, end) spans"""
+        spans = []
+        offset = 0
+        size = len(buffer)
+        while offset + 6 <= size:
+            data_length = (buffer[offset + 4] << 8) | buffer[offset + 5]
+            end = offset + 6 + data_length + 1
+            if end > size:
+                break
+            spans.append((offset, end))
+            offset = end
+        return spans
+    
+    @staticmethod
+    def verify_crcs(buffer: bytes) -> List[bool]:
+        """Verify the CRC of every back-to-back CCSDS packet in a buffer"""
+        return verify_spans(buffer, PUSPacket.packet_spans(buffer))
+
+
+class PUSPacketView:
+    """
+    Zero-copy view of an encoded PUS packet
+    
+    Wraps a memoryview of the packet bytes and decodes header fields only
+    when they are accessed. Exposes the same flat accessors as PUSPacket
+    (sequence_count, service_type, service_subtype, ack_flags, data) so
+    handlers can route either without building the header dataclasses.
+    
+    The view does not own the bytes: it is only valid as long as the
+    underlying buffer is not modified.
+    """
+    
+    __slots__ = ('_buf',)
+    
+    TM_HEADER_LEN = 15  # Primary (6) + TM secondary (9)
+    TC_HEADER_LEN = 11  # Primary (6) + TC secondary (5)
+    
+    def __init__(self, buffer: bytes):
+        self._buf = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+    
+    def __len__(self) -> int:
+        return len(self._buf)
+    
+    # CCSDS primary header
+    @property
+    def packet_type(self) -> int:
+        return (self._buf[0] >> 4) & 0x1
+    
+    @property
+    def is_tm(self) -> bool:
+        return not (self._buf[0] & 0x10)
+    
+    @property
+    def apid(self) -> int:
+        buf = self._buf
+        return ((buf[0] & 0x7) << 8) | buf[1]
+    
+    @property
+    def sequence_flags(self) -> int:
+        return self._buf[2] >> 6
+    
+    @property
+    def sequence_count(self) -> int:
+        buf = self._buf
+        return ((buf[2] & 0x3F) << 8) | buf[3]
+    
+    @property
+    def data_length(self) -> int:
+        buf = self._buf
+        return (buf[4] << 8) | buf[5]
+    
+    # PUS secondary header
+    @property
+    def pus_version(self) -> int:
+        return self._buf[6] >> 4
+    
+    @property
+    def ack_flags(self) -> int:
+        return self._buf[6] & 0xF
+    
+    @property
+    def service_type(self) -> int:
+        return self._buf[7]
+    
+    @property
+    def service_subtype(self) -> int:
+        return self._buf[8]
+    
+    @property
+    def source_id(self) -> int:
+        buf = self._buf
+        return (buf[9] << 8) | buf[10]
+    
+    @property
+    def time_stamp(self) -> int:
+        """Mission time (TM only, 0 for TC)"""
+        if self._buf[0] & 0x10:
+            return 0
+        return struct.unpack_from('>I', self._buf, 11)[0]
+    
+    # Application data and error control
+    @property
+    def data(self) -> memoryview:
+        """Application data as a memoryview slice (no copy)"""
+        buf = self._buf
+        start = self.TC_HEADER_LEN if buf[0] & 0x10 else self.TM_HEADER_LEN
+        end = 6 + ((buf[4] << 8) | buf[5]) + 1 - 2
+        return buf[start:end]
+    
+    @property
+    def crc(self) -> int:
+        buf = self._buf
+        end = 6 + ((buf[4] << 8) | buf[5]) + 1
+        return (buf[end - 2] << 8) | buf[end - 1]
+    
+    def verify_crc(self) -> bool:
+        """Check the Packet Error Control field"""
+        end = 6 + self.data_length + 1
+        return end <= len(self._buf) and crc16(self._buf[:end]) == 0
+    
+    def to_packet(self) -> PUSPacket:
+        """Decode into a full PUSPacket (copies the data)"""
+        return PUSPacket.unpack(self._buf.tobytes())
+    
+    def tobytes(self) -> bytes:
+        """Copy of the encoded packet"""
+        return self._buf.tobytes()
+    
+    def release(self):
+        """Release the underlying buffer export"""
+        self._buf.release()
 
 
 class PUSPacketFactory:
     """Factory for creating PUS packets"""
     
-    def __init__(self, apid: int = 100, source_id: int = 1):
+    # Precompiled encoders for the pack_into fast path
+    _TM_FRAME_HEADER = struct.Struct('>2sHHHHBBBHI')  # EDEN + primary + TM secondary
+    _TC_FRAME_HEADER = struct.Struct('>2sHHHHBBBH')  # EDEN + primary + TC secondary
+    _CRC = struct.Struct('>H')
+    
+    TM_FRAME_HEADER_LEN = 19
+    TC_FRAME_HEADER_LEN = 15
+    INITIAL_BUFFER_SIZE = 1024
+    
+    # Largest TM data field that fits the 16-bit EDEN length
+    MAX_TM_DATA = 0xFFFF - (TM_FRAME_HEADER_LEN - 4) - 2
+    
+    def __init__(self, apid: int = 100, source_id: int = 1,
+                 time_source: Callable[[], float] = time.time):
         self.apid = apid
         self.source_id = source_id
         self.sequence_counter = 0
+        self.time_source = time_source  # mission time (s), e.g. SimulationClock.mission_time
+        
+        # Constant header fields keyed by (packet type, APID); the APID
+        # may be changed after construction
+        self._templates: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        
+        # Reusable encode buffer
+        self._buffer = bytearray(self.INITIAL_BUFFER_SIZE)
+        self._view = memoryview(self._buffer)
     
     def _next_sequence(self) -> int:
         """Get next sequence counter"""
@@ -230,7 +407,7 @@ class PUSPacketFactory:
     
     def _mission_time(self) -> int:
         """Get current mission time (seconds since epoch)"""
-        return int(time.time())
+        return int(self.time_source()) & 0xFFFFFFFF
     
     def create_tm(self, service_type: int, service_subtype: int, 
                   data: bytes = b'') -> PUSPacket:
@@ -264,38 +441,174 @@ class PUSPacketFactory:
         )
         return PUSPacket(ccsds_header=ccsds, pus_header=pus, data=data)
     
+    def encode_tm(self, service_type: int, service_subtype: int,
+                  data: bytes = b'',
+                  sequence_flags: int = SequenceFlags.STANDALONE) -> bytes:
+        """
+        Encode a telemetry packet directly into an EDEN frame
+        
+        Fast path equivalent to EDENProtocol.wrap_packet(create_tm(...)):
+        the constant header fields come from a cached template and the
+        frame is written into a reusable buffer with pack_into, patching
+        only sequence count, lengths, time stamp and CRC.
+        """
+        template = self._templates.get((0, self.apid))
+        if template is None:
+            template = self._build_template(0)
+        word1, byte1 = template
+        
+        seq = self.sequence_counter
+        self.sequence_counter = (seq + 1) & 0x3FFF
+        
+        header_end = self.TM_FRAME_HEADER_LEN
+        data_end = header_end + len(data)
+        buf = self._reserve(data_end + 2)
+        self._TM_FRAME_HEADER.pack_into(
+            buf, 0, EDENProtocol.SYNC_MARKER, data_end - 2,
+            word1, (sequence_flags << 14) | seq, data_end - 9,
+            byte1, service_type, service_subtype, self.source_id,
+            self._mission_time())
+        buf[header_end:data_end] = data
+        view = self._view
+        self._CRC.pack_into(buf, data_end, crc16(view[4:data_end]))
+        return bytes(view[:data_end + 2])
+    
+    def encode_tm_segments(self, service_type: int, service_subtype: int,
+                           data: bytes, segment_size: int = MAX_TM_DATA) -> Iterator[bytes]:
+        """
+        Encode telemetry data of any size as a sequence of EDEN frames
+        
+        Data up to segment_size bytes is sent as one standalone packet,
+        larger data as first/continuation/last segments with consecutive
+        sequence counts. Every segment carries the PUS secondary header.
+        Frames are produced lazily so the caller can interleave other
+        traffic (on other APIDs) between segments.
+        """
+        if not 0 < segment_size <= self.MAX_TM_DATA:
+            raise ValueError(f"Segment size must be 1..{self.MAX_TM_DATA} bytes")
+        if len(data) <= segment_size:
+            yield self.encode_tm(service_type, service_subtype, data)
+            return
+        
+        view = memoryview(data)
+        last = len(data) - segment_size
+        for offset in range(0, len(data), segment_size):
+            if offset == 0:
+                flags = SequenceFlags.FIRST
+            elif offset >= last:
+                flags = SequenceFlags.LAST
+            else:
+                flags = SequenceFlags.CONTINUATION
+            yield self.encode_tm(service_type, service_subtype,
+                                 view[offset:offset + segment_size], flags)
+    
+    def encode_tc(self, service_type: int, service_subtype: int,
+                  data: bytes = b'', ack_flags: int = 0xF) -> Tuple[int, bytes]:
+        """
+        Encode a telecommand packet directly into an EDEN frame
+        
+        Returns (sequence count, frame) so the caller can track the
+        verification reports for the command.
+        """
+        template = self._templates.get((1, self.apid))
+        if template is None:
+            template = self._build_template(1)
+        word1, byte1 = template
+        
+        seq = self.sequence_counter
+        self.sequence_counter = (seq + 1) & 0x3FFF
+        
+        header_end = self.TC_FRAME_HEADER_LEN
+        data_end = header_end + len(data)
+        buf = self._reserve(data_end + 2)
+        self._TC_FRAME_HEADER.pack_into(
+            buf, 0, EDENProtocol.SYNC_MARKER, data_end - 2,
+            word1, 0xC000 | seq, data_end - 9,
+            byte1 | (ack_flags & 0xF), service_type, service_subtype, self.source_id)
+        buf[header_end:data_end] = data
+        view = self._view
+        self._CRC.pack_into(buf, data_end, crc16(view[4:data_end]))
+        return seq, bytes(view[:data_end + 2])
+    
+    def _build_template(self, packet_type: int) -> Tuple[int, int]:
+        """Compute the constant header fields for a packet type"""
+        word1 = ((packet_type & 0x1) << 12) | (1 << 11) | (self.apid & 0x7FF)
+        byte1 = 2 << 4  # PUS-C, ack flags patched per packet for TC
+        template = (word1, byte1)
+        self._templates[(packet_type, self.apid)] = template
+        return template
+    
+    def _reserve(self, size: int) -> bytearray:
+        """Make sure the encode buffer can hold size bytes"""
+        if size > len(self._buffer):
+            self._buffer = bytearray(max(size, 2 * len(self._buffer)))
+            self._view = memoryview(self._buffer)
+        return self._buffer
+    
     # Service 1 - Request Verification
-    def create_acceptance_success(self, tc_packet: PUSPacket) -> PUSPacket:
+    def create_acceptance_success(self, tc_packet: Union[PUSPacket, 'PUSPacketView']) -> PUSPacket:
         """TM[1,1] - Acceptance success"""
-        return self.create_tm(1, 1, struct.pack('>H', tc_packet.ccsds_header.sequence_count))
+        return self.create_tm(1, 1, struct.pack('>H', tc_packet.sequence_count))
     
-    def create_acceptance_failure(self, tc_packet: PUSPacket, error_code: int) -> PUSPacket:
+    def create_acceptance_failure(self, tc_packet: Union[PUSPacket, 'PUSPacketView'], error_code: int) -> PUSPacket:
         """TM[1,2] - Acceptance failure"""
-        data = struct.pack('>HI', tc_packet.ccsds_header.sequence_count, error_code)
+        data = struct.pack('>HI', tc_packet.sequence_count, error_code)
         return self.create_tm(1, 2, data)
     
-    def create_execution_success(self, tc_packet: PUSPacket) -> PUSPacket:
+    def create_execution_success(self, tc_packet: Union[PUSPacket, 'PUSPacketView']) -> PUSPacket:
         """TM[1,7] - Execution success"""
-        return self.create_tm(1, 7, struct.pack('>H', tc_packet.ccsds_header.sequence_count))
+        return self.create_tm(1, 7, struct.pack('>H', tc_packet.sequence_count))
     
-    def create_execution_failure(self, tc_packet: PUSPacket, error_code: int) -> PUSPacket:
+    def create_execution_failure(self, tc_packet: Union[PUSPacket, 'PUSPacketView'], error_code: int) -> PUSPacket:
         """TM[1,8] - Execution failure"""
-        data = struct.pack('>HI', tc_packet.ccsds_header.sequence_count, error_code)
+        data = struct.pack('>HI', tc_packet.sequence_count, error_code)
         return self.create_tm(1, 8, data)
     
     # Service 3 - Housekeeping
     def create_hk_report(self, structure_id: int, params: Dict[str, float]) -> PUSPacket:
         """TM[3,25] - Housekeeping parameter report"""
-        # Pack structure ID + parameter values
-        data = struct.pack('>H', structure_id)
-        for value in params.values():
-            data += struct.pack('>f', value)
-        return self.create_tm(3, 25, data)
+        return self.create_tm(3, 25, self._hk_report_data(structure_id, params))
+    
+    @staticmethod
+    def _hk_report_data(structure_id: int, params: Dict[str, float]) -> bytes:
+        """Pack structure ID + parameter values (all float32)"""
+        return float32_codec(structure_id, len(params)).encode(list(params.values()))
     
     # Service 17 - Connection Test
-    def create_connection_report(self) -> PUSPacket:
+    def create_connection_report(self, data: bytes = b'') -> PUSPacket:
+        """TM[17,2] - Connection report"""
+        return self.create_tm(17, 2, data)
+    
+    # Encoded EDEN frames (fast path)
+    def encode_acceptance_success(self, tc_packet: Union[PUSPacket, 'PUSPacketView']) -> bytes:
+        """TM[1,1] - Acceptance success"""
+        return self.encode_tm(1, 1, struct.pack('>H', tc_packet.sequence_count))
+    
+    def encode_acceptance_failure(self, tc_packet: Union[PUSPacket, 'PUSPacketView'],
+                                  error_code: int) -> bytes:
+        """TM[1,2] - Acceptance failure"""
+        return self.encode_tm(1, 2, struct.pack('>HI', tc_packet.sequence_count, error_code))
+    
+    def encode_execution_success(self, tc_packet: Union[PUSPacket, 'PUSPacketView']) -> bytes:
+        """TM[1,7] - Execution success"""
+        return self.encode_tm(1, 7, struct.pack('>H', tc_packet.sequence_count))
+    
+    def encode_execution_failure(self, tc_packet: Union[PUSPacket, 'PUSPacketView'],
+                                 error_code: int) -> bytes:
+        """TM[1,8] - Execution failure"""
+        return self.encode_tm(1, 8, struct.pack('>HI', tc_packet.sequence_count, error_code))
+    
+    def encode_hk_report(self, structure_id: int, params: Dict[str, float]) -> bytes:
+        """TM[3,25] - Housekeeping parameter report"""
+        return self.encode_tm(3, 25, self._hk_report_data(structure_id, params))
+    
+    def encode_hk(self, codec: HKCodec, values: List[float]) -> bytes:
+        """TM[3,25] - Housekeeping report encoded with a compiled structure codec"""
+        return self.encode_tm(3, 25, codec.encode(values))
+    
+    def encode_connection_report(self, data: bytes = b'') -> bytes:
         """TM[17,2] - Connection report"""
-        return self.create_tm(17, 2)
+        return self.encode_tm(17, 2, data)
 
 
 # EDEN Protocol wrapper (simplified)
@@ -320,6 +633,15 @@ class EDENProtocol:
         pus_data = data[4:4 + length]
         return PUSPacket.unpack(pus_data)
     
+    @staticmethod
+    def unwrap_view(frame: bytes) -> Optional[PUSPacketView]:
+        """Unwrap EDEN frame to a zero-copy PUS packet view"""
+        view = frame if isinstance(frame, memoryview) else memoryview(frame)
+        if len(view) < 4 or view[0] != 0xEB or view[1] != 0x90:
+            return None
+        length = (view[2] << 8) | view[3]
+        return PUSPacketView(view[4:4 + length])
+    
     @staticmethod
     def find_packet(buffer: bytes) -> tuple[Optional[bytes], bytes]:
         """Find complete packet in buffer, return (packet, remaining)"""
@@ -339,5 +661,147 @@ class EDENProtocol:
         packet = buffer[idx:idx + total_len]
         remaining = buffer[idx + total_len:]
         return packet, remaining
+    
+    @staticmethod
+    def frame_spans(buffer: bytes) -> List[Tuple[int, int]]:
+        """Locate back-to-back EDEN frames in a buffer, return PUS packet spans"""
+        spans = []
+        offset = 0
+        size = len(buffer)
+        sync = EDENProtocol.SYNC_MARKER
+        while offset + 4 <= size:
+            if buffer[offset:offset + 2] != sync:
+                break
+            length = (buffer[offset + 2] << 8) | buffer[offset + 3]
+            end = offset + 4 + length
+            if end > size:
+                break
+            spans.append((offset + 4, end))
+            offset = end
+        return spans
+    
+    @staticmethod
+    def verify_crcs(buffer: bytes) -> List[bool]:
+        """Verify the CRC of every PUS packet in a buffer of EDEN frames"""
+        return verify_spans(buffer, EDENProtocol.frame_spans(buffer))
 
 
+class EDENStreamFramer:
+    """
+    Incremental EDEN frame extractor for a TCP byte stream
+    
+    Received data is appended to a growable bytearray and frames are
+    consumed by advancing a read offset, so a burst of N frames costs
+    O(N) rather than O(N^2) copying. Consumed bytes are compacted away on
+    the next feed().
+    
+    Frames are yielded as memoryviews into the internal buffer. If a
+    consumer still holds a frame when new data arrives, the unconsumed
+    tail is moved to a fresh buffer so the held frame stays valid.
+    
+    On a missing sync marker or an implausible length the framer skips
+    forward to the next sync marker, discarding only the bytes in between.
+    """
+    
+    HEADER_LEN = 4  # Sync marker (2) + length (2)
+    _HEADER = struct.Struct('>HH4xH')  # Marker, length, CCSDS data length
+    MIN_PACKET_LEN = 13  # CCSDS primary (6) + TC secondary (5) + CRC (2)
+    
+    def __init__(self, max_packet_len: int = 0xFFFF):
+        self.max_packet_len = max_packet_len
+        self._buf = bytearray()
+        self._pos = 0
+        
+        # Statistics
+        self.frames_extracted = 0
+        self.resyncs = 0
+        self.bytes_discarded = 0
+    
+    def __len__(self) -> int:
+        """Number of buffered, not yet consumed bytes"""
+        return len(self._buf) - self._pos
+    
+    def feed(self, data: bytes):
+        """Append received data to the stream buffer"""
+        if self._pos:
+            self._compact()
+        try:
+            self._buf += data
+        except BufferError:
+            # A previously yielded frame is still exported
+            self._buf = self._buf + data
+    
+    def frames(self):
+        """Yield every complete frame in the buffer as a memoryview"""
+        buf = self._buf
+        view = memoryview(buf)
+        header = self._HEADER
+        sync = EDENProtocol.SYNC_MARKER
+        min_len = self.MIN_PACKET_LEN
+        max_len = self.max_packet_len
+        hunting = False
+        
+        while True:
+            pos = self._pos
+            available = len(buf) - pos
+            if available >= self.HEADER_LEN + 6:
+                marker, length, data_length = header.unpack_from(buf, pos)
+            elif buf.startswith(sync[:available], pos):
+                # Wait for the EDEN header and CCSDS primary header
+                break
+            else:
+                marker = 0
+            
+            # Sync marker
+            if marker != 0xEB90:
+                idx = buf.find(sync, pos)
+                if idx == -1:
+                    # Keep a trailing byte that may start the next marker
+                    idx = len(buf) - 1 if buf[-1] == 0xEB else len(buf)
+                if not hunting:
+                    self.resyncs += 1
+                    hunting = True
+                self.bytes_discarded += idx - pos
+                self._pos = idx
+                continue
+            
+            # Length plausibility: the CCSDS data length must agree with
+            # the EDEN length
+            if length < min_len or length > max_len or data_length + 7 != length:
+                if not hunting:
+                    self.resyncs += 1
+                    hunting = True
+                self.bytes_discarded += 1
+                self._pos = pos + 1
+                continue
+            
+            end = pos + self.HEADER_LEN + length
+            if end > len(buf):
+                break
+            
+            hunting = False
+            self._pos = end
+            self.frames_extracted += 1
+            yield view[pos:end]
+    
+    def stats(self) -> Dict[str, int]:
+        """Get framer statistics"""
+        return {
+            'frames': self.frames_extracted,
+            'resyncs': self.resyncs,
+            'bytes_discarded': self.bytes_discarded,
+            'buffered': len(self),
+        }
+    
+    def reset(self):
+        """Drop all buffered data"""
+        self._buf = bytearray()
+        self._pos = 0
+    
+    def _compact(self):
+        """Discard consumed bytes from the front of the buffer"""
+        try:
+            del self._buf[:self._pos]
+        except BufferError:
+            self._buf = self._buf[self._pos:]
+        self._pos = 0
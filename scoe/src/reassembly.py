@@ -0,0 +1,219 @@
+"""
+CCSDS Segment Reassembly
+Bounded reassembler for segmented (first/continuation/last) PUS packets
+
+Segments are collected per APID, so a bulk transfer on one APID does not
+hold back standalone traffic (such as HK reports) on other APIDs. The
+total amount of buffered segment data is capped by a memory budget:
+when a new segment would exceed it, the least recently updated transfers
+are evicted. Transfers that see no segment within the timeout are
+dropped, as are transfers with a sequence count gap.
+
+Standalone packets are passed through unchanged. Completed transfers are
+returned as a ReassembledPacket whose data is a single memoryview over
+the concatenated segment data fields.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Union
+
+from pus_protocol import PUSPacketView, SequenceFlags
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReassembledPacket:
+    """Completed segmented packet (same routing fields as PUSPacketView)"""
+    apid: int
+    service_type: int
+    service_subtype: int
+    sequence_count: int  # of the first segment
+    segments: int
+    data: memoryview
+    ack_flags: int = 0
+
+    @property
+    def is_tm(self) -> bool:
+        return True
+
+
+@dataclass
+class _Transfer:
+    """Segmented packet in progress"""
+    apid: int
+    service_type: int
+    service_subtype: int
+    first_sequence: int
+    next_sequence: int
+    buffer: bytearray
+    segments: int
+    updated: float
+
+
+class SegmentReassembler:
+    """Reassembles segmented packets keyed by APID"""
+
+    def __init__(self, memory_budget: int = 1 << 20, timeout: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.memory_budget = memory_budget  # bytes of buffered segment data
+        self.timeout = timeout  # seconds between segments
+        self._clock = clock
+
+        # In-progress transfers in least recently updated order
+        self._transfers: Dict[int, _Transfer] = {}
+        self._buffered = 0
+
+        # Statistics
+        self.completed = 0
+        self.aborted = 0  # restarted by a new first segment
+        self.gaps = 0  # sequence count gap or service mismatch
+        self.orphans = 0  # continuation/last without a first segment
+        self.timed_out = 0
+        self.evicted = 0
+        self.oversize = 0  # single transfer larger than the budget
+
+    @property
+    def buffered(self) -> int:
+        """Bytes of segment data currently held"""
+        return self._buffered
+
+    def __len__(self) -> int:
+        """Number of transfers in progress"""
+        return len(self._transfers)
+
+    def add(self, packet: PUSPacketView,
+            now: Optional[float] = None) -> Optional[Union[PUSPacketView, ReassembledPacket]]:
+        """
+        Add a received packet
+
+        Returns the packet itself if it is standalone, the reassembled
+        packet when this was the last segment, and None otherwise.
+        """
+        flags = packet.sequence_flags
+        if flags == SequenceFlags.STANDALONE:
+            return packet
+
+        if now is None:
+            now = self._clock()
+        self.expire(now)
+
+        apid = packet.apid
+        data = packet.data
+
+        if flags == SequenceFlags.FIRST:
+            if apid in self._transfers:
+                self.aborted += 1
+                self._drop(apid)
+            if not self._reserve(len(data), apid):
+                return None
+            self._transfers[apid] = _Transfer(
+                apid=apid,
+                service_type=packet.service_type,
+                service_subtype=packet.service_subtype,
+                first_sequence=packet.sequence_count,
+                next_sequence=(packet.sequence_count + 1) & 0x3FFF,
+                buffer=bytearray(data),
+                segments=1,
+                updated=now,
+            )
+            self._buffered += len(data)
+            return None
+
+        transfer = self._transfers.get(apid)
+        if transfer is None:
+            self.orphans += 1
+            return None
+
+        if (packet.sequence_count != transfer.next_sequence or
+                packet.service_type != transfer.service_type or
+                packet.service_subtype != transfer.service_subtype):
+            logger.warning(f"APID {apid}: segment {packet.sequence_count} out of sequence "
+                           f"(expected {transfer.next_sequence}), transfer dropped")
+            self.gaps += 1
+            self._drop(apid)
+            return None
+
+        if not self._reserve(len(data), apid):
+            return None
+
+        transfer.buffer += data
+        transfer.segments += 1
+        transfer.next_sequence = (transfer.next_sequence + 1) & 0x3FFF
+        transfer.updated = now
+        self._buffered += len(data)
+
+        # Keep least recently updated order
+        del self._transfers[apid]
+        if flags == SequenceFlags.CONTINUATION:
+            self._transfers[apid] = transfer
+            return None
+
+        self._buffered -= len(transfer.buffer)
+        self.completed += 1
+        return ReassembledPacket(
+            apid=apid,
+            service_type=transfer.service_type,
+            service_subtype=transfer.service_subtype,
+            sequence_count=transfer.first_sequence,
+            segments=transfer.segments,
+            data=memoryview(transfer.buffer),
+        )
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop transfers idle for longer than the timeout"""
+        if now is None:
+            now = self._clock()
+        expired = [apid for apid, t in self._transfers.items() if now - t.updated > self.timeout]
+        for apid in expired:
+            logger.warning(f"APID {apid}: segmented transfer timed out")
+            self._drop(apid)
+        self.timed_out += len(expired)
+        return len(expired)
+
+    def reset(self):
+        """Drop all transfers in progress"""
+        self._transfers.clear()
+        self._buffered = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get reassembly statistics"""
+        return {
+            'in_progress': len(self._transfers),
+            'buffered': self._buffered,
+            'completed': self.completed,
+            'aborted': self.aborted,
+            'gaps': self.gaps,
+            'orphans': self.orphans,
+            'timed_out': self.timed_out,
+            'evicted': self.evicted,
+            'oversize': self.oversize,
+        }
+
+    def _reserve(self, size: int, apid: int) -> bool:
+        """Make room for size more bytes for apid, evicting other transfers"""
+        transfer = self._transfers.get(apid)
+        own = len(transfer.buffer) if transfer else 0
+        if own + size > self.memory_budget:
+            logger.warning(f"APID {apid}: segmented transfer exceeds the "
+                           f"{self.memory_budget} byte budget, dropped")
+            self.oversize += 1
+            if transfer:
+                self._drop(apid)
+            return False
+
+        # Evict least recently updated transfers of other APIDs
+        for other in list(self._transfers):
+            if self._buffered + size <= self.memory_budget:
+                break
+            if other != apid:
+                logger.warning(f"APID {other}: segmented transfer evicted")
+                self.evicted += 1
+                self._drop(other)
+        return True
+
+    def _drop(self, apid: int):
+        transfer = self._transfers.pop(apid)
+        self._buffered -= len(transfer.buffer)
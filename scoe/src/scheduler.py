@@ -0,0 +1,135 @@
+"""
+Multi-Rate Model Scheduler
+Rate groups for the simulation models within one base-rate frame
+
+AOCSSimulation.step is one frame at the base (control loop) rate. Models
+register tasks at their own rate; a task runs every
+divider = round(base rate / rate) frames, on the frames where
+frame % divider == 0, and receives its own period (divider * dt) as time
+step, so a slow model integrates over the time since its last run. Due
+tasks run in registration order, which keeps the order within a frame
+deterministic (actuators, then dynamics, then sensors).
+
+Tasks with the same divider form a rate group. The execution time of a
+group within a frame is measured against the group's budget (one base
+frame period unless set) and overruns are counted per group.
+
+With a StepProfiler attached (profiler.py) each task and the whole frame
+are also timed into per-phase histograms; without one the frame runs the
+unprofiled loop.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from profiler import StepProfiler
+
+Task = Callable[[float], None]
+
+
+@dataclass(eq=False)
+class RateGroup:
+    """Tasks sharing one rate, with execution time statistics"""
+    divider: int  # base frames per execution
+    rate: float  # Hz
+    budget: float  # seconds per execution
+    tasks: List[str] = field(default_factory=list)
+
+    executions: int = 0
+    overruns: int = 0
+    last_time: float = 0.0  # seconds
+    max_time: float = 0.0
+    total_time: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rate_hz': self.rate,
+            'tasks': list(self.tasks),
+            'budget_us': self.budget * 1e6,
+            'executions': self.executions,
+            'overruns': self.overruns,
+            'last_us': self.last_time * 1e6,
+            'max_us': self.max_time * 1e6,
+            'mean_us': self.total_time / self.executions * 1e6 if self.executions else 0.0,
+        }
+
+
+class RateScheduler:
+    """Runs registered tasks at their rate group's divider of the base rate"""
+
+    def __init__(self, dt: float, timer: Callable[[], float] = time.perf_counter):
+        self.dt = dt  # base frame period (dividers are fixed from it)
+        self.frame = 0
+        self.groups: Dict[int, RateGroup] = {}
+        self._tasks: List[Tuple[str, Task, RateGroup]] = []
+        self._timer = timer
+        self.profiler: Optional[StepProfiler] = None
+
+    def add(self, name: str, rate: Optional[float], task: Task) -> RateGroup:
+        """Register task(dt) at rate Hz (every frame if None or above the base rate)"""
+        divider = max(1, round(1.0 / (rate * self.dt))) if rate else 1
+        group = self.groups.get(divider)
+        if group is None:
+            group = self.groups[divider] = RateGroup(divider, 1.0 / (divider * self.dt), self.dt)
+        group.tasks.append(name)
+        self._tasks.append((name, task, group))
+        return group
+
+    def group(self, rate: float) -> RateGroup:
+        """Rate group a task at rate Hz belongs to (e.g. to set its budget)"""
+        return self.groups[max(1, round(1.0 / (rate * self.dt)))]
+
+    def run_frame(self, dt: Optional[float] = None):
+        """Run the tasks due in this frame and advance the frame counter"""
+        dt = self.dt if dt is None else dt
+        if self.profiler is not None:
+            self._run_profiled(dt)
+            return
+        frame = self.frame
+        timer = self._timer
+        spent: Dict[RateGroup, float] = {}
+        for _, task, group in self._tasks:
+            divider = group.divider
+            if frame % divider:
+                continue
+            start = timer()
+            task(divider * dt)
+            spent[group] = spent.get(group, 0.0) + (timer() - start)
+        self._account(spent)
+
+    def _run_profiled(self, dt: float):
+        """run_frame timing each task and the frame into the profiler"""
+        profiler = self.profiler
+        frame = self.frame
+        clock = time.perf_counter_ns
+        spent: Dict[RateGroup, float] = {}
+        frame_start = clock()
+        for name, task, group in self._tasks:
+            divider = group.divider
+            if frame % divider:
+                continue
+            start = clock()
+            task(divider * dt)
+            elapsed = clock() - start
+            profiler.phase(name).record(elapsed)
+            spent[group] = spent.get(group, 0.0) + elapsed * 1e-9
+        self._account(spent)
+        profiler.step.record(clock() - frame_start)
+
+    def _account(self, spent: Dict[RateGroup, float]):
+        """Rate group statistics for this frame and advance the frame counter"""
+        for group, elapsed in spent.items():
+            group.executions += 1
+            group.last_time = elapsed
+            group.total_time += elapsed
+            if elapsed > group.max_time:
+                group.max_time = elapsed
+            if elapsed > group.budget:
+                group.overruns += 1
+        self.frame += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics per rate group, fastest first"""
+        return {f'{group.rate:g}Hz': group.to_dict()
+                for _, group in sorted(self.groups.items())}
@@ -9,10 +9,11 @@ Based on Section 6.2 of the Technical Proposal:
 """
 
 import asyncio
+import math
 import struct
 import time
 import logging
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Sequence, Union
 from dataclasses import dataclass
 from datetime import datetime
 import json
@@ -22,9 +23,14 @@ from influxdb_client import InfluxDBClient, Point
 from influxdb_client.client.write_api import SYNCHRONOUS
 
 from pus_protocol import (
-    PUSPacket, PUSPacketFactory, EDENProtocol,
+    PUSPacket, PUSPacketView, PUSPacketFactory, EDENProtocol, EDENStreamFramer,
     PUSServiceType, PUSServiceSubtype, PacketType
 )
+from mib import MIB, MIB_HASH, load_default_mib
+from reassembly import SegmentReassembler, ReassembledPacket
+from latency import LatencyHistogram
+from profiler import StepProfiler
+from faults import FaultKind
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -57,9 +63,13 @@ class SCOEController:
     SCOE Controller implementing EDEN/PUS client and REST API
     """
     
-    def __init__(self, config: SCOEConfig):
+    def __init__(self, config: SCOEConfig, mib: Optional[MIB] = None):
         self.config = config
         
+        # Mission Information Base (must match the AOCS server)
+        self.mib = mib or load_default_mib()
+        self.mib_match: Optional[bool] = None  # set by connection test
+        
         # Connection state
         self.reader: Optional[asyncio.StreamReader] = None
         self.writer: Optional[asyncio.StreamWriter] = None
@@ -75,13 +85,24 @@ class SCOEController:
         # Latest telemetry cache
         self.telemetry_cache: Dict[str, float] = {}
         self.last_update = time.time()
+        self.mission_time = 0  # AOCS (simulated) time stamp of the latest HK report
         
         # WebSocket clients
         self.ws_clients: List[web.WebSocketResponse] = []
         
+        # EDEN stream framer and segment reassembler for the current connection
+        self.framer: Optional[EDENStreamFramer] = None
+        self.reassembler: Optional[SegmentReassembler] = None
+        
         # Command response tracking
         self.pending_commands: Dict[int, asyncio.Future] = {}
         
+        # TC round-trip time (send to execution report)
+        self.tc_latency = LatencyHistogram()
+        
+        # Latest simulation step profile (TM[8,128])
+        self.step_profile: Optional[Dict] = None
+        
         # Running state
         self.running = False
         self._recv_task: Optional[asyncio.Task] = None
@@ -171,7 +192,8 @@ class SCOEController:
     
     async def _receive_loop(self):
         """Receive and process telemetry from AOCS"""
-        buffer = b''
+        framer = self.framer = EDENStreamFramer()
+        reassembler = self.reassembler = SegmentReassembler()
         
         try:
             while self.connected and self.running:
@@ -179,18 +201,16 @@ class SCOEController:
                 if not data:
                     break
                 
-                buffer += data
+                framer.feed(data)
                 
                 # Process complete packets
-                while True:
-                    packet_data, buffer = EDENProtocol.find_packet(buffer)
-                    if packet_data is None:
-                        break
-                    
+                for frame in framer.frames():
                     try:
-                        pus_packet = EDENProtocol.unwrap_packet(packet_data)
-                        if pus_packet:
-                            await self._process_telemetry(pus_packet)
+                        tm = EDENProtocol.unwrap_view(frame)
+                        if tm:
+                            packet = reassembler.add(tm)
+                            if packet:
+                                await self._process_telemetry(packet)
                     except Exception as e:
                         logger.error(f"Error processing packet: {e}")
         
@@ -202,10 +222,10 @@ class SCOEController:
             self.connected = False
             logger.info("Disconnected from AOCS server")
     
-    async def _process_telemetry(self, tm: PUSPacket):
+    async def _process_telemetry(self, tm: Union[PUSPacketView, ReassembledPacket]):
         """Process a telemetry packet"""
-        service = tm.pus_header.service_type
-        subtype = tm.pus_header.service_subtype
+        service = tm.service_type
+        subtype = tm.service_subtype
         
         if service == PUSServiceType.REQUEST_VERIFICATION:
             await self._handle_verification(tm)
@@ -214,14 +234,38 @@ class SCOEController:
             await self._handle_hk_report(tm)
         
         elif service == PUSServiceType.CONNECTION_TEST and subtype == PUSServiceSubtype.TM_CONNECTION_REPORT:
+            self._handle_connection_report(tm)
             logger.info("Connection test successful")
+        
+        elif service == PUSServiceType.PARAMETER_MANAGEMENT and subtype == PUSServiceSubtype.TM_PARAMETER_REPORT:
+            await self._handle_parameter_report(tm)
+        
+        elif service == PUSServiceType.FUNCTION_MANAGEMENT and subtype == PUSServiceSubtype.TM_PROFILE_REPORT:
+            profiler = StepProfiler.decode(tm.data)
+            self.step_profile = {'breakdown': profiler.breakdown(), **profiler.to_dict()}
+            logger.info(f"Step profile received ({profiler.steps} steps)")
+    
+    def _handle_connection_report(self, tm: PUSPacketView):
+        """Check the server MIB hash carried by the connection report"""
+        data = tm.data
+        if len(data) < MIB_HASH.size:
+            logger.warning("Connection report carries no MIB hash, MIB compatibility unknown")
+            self.mib_match = None
+            return
+        
+        server_hash = MIB_HASH.unpack_from(data)[0]
+        self.mib_match = server_hash == self.mib.hash32
+        if not self.mib_match:
+            logger.error(f"MIB mismatch: server {server_hash:08x}, controller {self.mib.hash32:08x} "
+                         f"({self.mib.name} {self.mib.version}), HK reports will be decoded incorrectly")
     
-    async def _handle_verification(self, tm: PUSPacket):
+    async def _handle_verification(self, tm: PUSPacketView):
         """Handle verification telemetry"""
-        subtype = tm.pus_header.service_subtype
+        subtype = tm.service_subtype
+        data = tm.data
         
-        if len(tm.data) >= 2:
-            seq_count = struct.unpack('>H', tm.data[:2])[0]
+        if len(data) >= 2:
+            seq_count = struct.unpack_from('>H', data)[0]
             
             if seq_count in self.pending_commands:
                 future = self.pending_commands.pop(seq_count)
@@ -229,34 +273,33 @@ class SCOEController:
                 if subtype in [1, 7]:  # Success
                     future.set_result(True)
                 else:  # Failure
-                    error_code = struct.unpack('>I', tm.data[2:6])[0] if len(tm.data) >= 6 else 0
+                    error_code = struct.unpack_from('>I', data, 2)[0] if len(data) >= 6 else 0
                     future.set_result(False)
     
-    async def _handle_hk_report(self, tm: PUSPacket):
+    async def _handle_hk_report(self, tm: PUSPacketView):
         """Handle housekeeping report"""
-        if len(tm.data) < 2:
+        data = tm.data
+        if len(data) < 2:
             return
         
-        struct_id = struct.unpack('>H', tm.data[:2])[0]
+        struct_id = struct.unpack_from('>H', data)[0]
         
-        # Parse parameter values (floats)
-        values = []
-        offset = 2
-        while offset + 4 <= len(tm.data):
-            value = struct.unpack('>f', tm.data[offset:offset + 4])[0]
-            values.append(value)
-            offset += 4
+        codec = self.mib.codecs.get(struct_id)
+        if codec is None:
+            return
+        if len(data) < codec.size:
+            logger.warning(f"HK structure {struct_id} report too short: {len(data)} < {codec.size} bytes")
+            return
         
-        # Get parameter names for this structure (from cached mapping)
-        param_names = self._get_hk_param_names(struct_id)
+        # Decode and calibrate all parameter values
+        _, param_names, values = self.mib.decode_report(data)
         
         # Update telemetry cache
         timestamp = datetime.utcnow()
-        for i, name in enumerate(param_names):
-            if i < len(values):
-                self.telemetry_cache[name] = values[i]
+        self.telemetry_cache.update(zip(param_names, values))
         
         self.last_update = time.time()
+        self.mission_time = tm.time_stamp
         
         # Write to InfluxDB
         await self._write_to_influxdb(struct_id, param_names, values, timestamp)
@@ -264,25 +307,32 @@ class SCOEController:
         # Notify WebSocket clients
         await self._notify_ws_clients()
     
-    def _get_hk_param_names(self, struct_id: int) -> List[str]:
-        """Get parameter names for HK structure"""
-        # This should match the structure definitions in mock_aocs_server
-        structures = {
-            1: ['att_q_w', 'att_q_x', 'att_q_y', 'att_q_z', 'rate_x', 'rate_y', 'rate_z'],
-            2: ['rw0_speed', 'rw1_speed', 'rw2_speed', 'rw3_speed',
-                'rw0_temperature', 'rw1_temperature', 'rw2_temperature', 'rw3_temperature',
-                'rw0_cmd_torque', 'rw1_cmd_torque', 'rw2_cmd_torque', 'rw3_cmd_torque'],
-            3: ['mag_x', 'mag_y', 'mag_z', 'gyro_x', 'gyro_y', 'gyro_z',
-                'ss0_detected', 'ss0_azimuth', 'ss0_elevation'],
-            4: ['thr0_firing', 'thr1_firing', 'thr2_firing', 'thr3_firing',
-                'thr0_temperature', 'thr1_temperature', 'thr2_temperature', 'thr3_temperature'],
-            5: ['sada0_angle', 'sada1_angle', 'sada0_deployed', 'sada1_deployed'],
-            6: ['sim_time', 'sim_running', 'pos_x', 'pos_y', 'pos_z', 'in_eclipse'],
-        }
-        return structures.get(struct_id, [])
+    async def _handle_parameter_report(self, tm: Union[PUSPacketView, ReassembledPacket]):
+        """Handle TM[20,2] parameter value report (possibly reassembled)"""
+        data = tm.data
+        if len(data) < 2:
+            return
+        
+        count = struct.unpack_from('>H', data)[0]
+        if len(data) < 2 + 6 * count:
+            logger.warning(f"Parameter report too short for {count} parameters")
+            return
+        
+        parameters = self.mib.parameters
+        report = {}
+        for param_id, value in struct.iter_unpack('>Hf', data[2:2 + 6 * count]):
+            param = parameters.get(param_id)
+            if param:
+                report[param.name] = value
+        
+        self.telemetry_cache.update(report)
+        self.last_update = time.time()
+        logger.info(f"Parameter report received ({count} parameters)")
+        
+        await self._notify_ws_clients()
     
-    async def _write_to_influxdb(self, struct_id: int, param_names: List[str],
-                                  values: List[float], timestamp: datetime):
+    async def _write_to_influxdb(self, struct_id: int, param_names: Sequence[str],
+                                  values: Sequence[float], timestamp: datetime):
         """Write telemetry to InfluxDB"""
         if not self.write_api:
             return
@@ -294,7 +344,7 @@ class SCOEController:
                     point = Point("telemetry") \
                         .tag("structure_id", str(struct_id)) \
                         .tag("parameter", name) \
-                        .field("value", values[i]) \
+                        .field("value", float(values[i])) \
                         .time(timestamp)
                     points.append(point)
             
@@ -329,14 +379,14 @@ class SCOEController:
         if not self.connected:
             raise Exception("Not connected to AOCS")
         
-        tc = self.packet_factory.create_tc(service, subtype, data)
+        seq_count, eden_packet = self.packet_factory.encode_tc(service, subtype, data)
         
         # Track command for response
         future = asyncio.get_event_loop().create_future()
-        self.pending_commands[tc.ccsds_header.sequence_count] = future
+        self.pending_commands[seq_count] = future
         
         # Send command
-        eden_packet = EDENProtocol.wrap_packet(tc)
+        sent = time.monotonic()
         self.writer.write(eden_packet)
         await self.writer.drain()
         
@@ -344,9 +394,10 @@ class SCOEController:
         
         try:
             result = await asyncio.wait_for(future, timeout=5.0)
+            self.tc_latency.record(time.monotonic() - sent)
             return result
         except asyncio.TimeoutError:
-            self.pending_commands.pop(tc.ccsds_header.sequence_count, None)
+            self.pending_commands.pop(seq_count, None)
             return False
     
     async def send_connection_test(self) -> bool:
@@ -386,6 +437,31 @@ class SCOEController:
         data = bytes([0x40 + sada_id]) + struct.pack('>f', angle)
         return await self.send_telecommand(8, 1, data)
     
+    async def set_profiling(self, enabled: bool) -> bool:
+        """Enable or disable (and drop) the simulation step profiler"""
+        return await self.send_telecommand(8, 1, bytes([0x60, 1 if enabled else 0]))
+    
+    async def request_profile(self) -> bool:
+        """Request the step profile report (TM[8,128])"""
+        return await self.send_telecommand(8, 1, bytes([0x62]))
+    
+    async def inject_fault(self, kind: FaultKind, target: str, start: float = 0.0,
+                           duration: float = 0.0, value: float = math.nan) -> bool:
+        """Inject a simulation fault from start (simulated s) for duration (0: until cleared)"""
+        encoded = target.encode()
+        data = bytes([0x70, kind, len(encoded)]) + encoded + struct.pack('>fff', start, duration, value)
+        return await self.send_telecommand(8, 1, data)
+    
+    async def clear_faults(self, fault_id: Optional[int] = None) -> bool:
+        """Remove one injected fault by id, or all of them"""
+        data = bytes([0x71]) + (struct.pack('>H', fault_id) if fault_id is not None else b'')
+        return await self.send_telecommand(8, 1, data)
+    
+    async def request_parameters(self, param_ids: Sequence[int] = ()) -> bool:
+        """Request a parameter value report (all MIB parameters if empty)"""
+        data = struct.pack(f'>H{len(param_ids)}H', len(param_ids), *param_ids)
+        return await self.send_telecommand(20, 1, data)
+    
     async def enable_hk_report(self, struct_id: int) -> bool:
         """Enable housekeeping report"""
         data = struct.pack('>H', struct_id)
@@ -481,7 +557,15 @@ class SCOEController:
         status = {
             'connected': self.connected,
             'last_update': self.last_update,
+            'mission_time': self.mission_time,
             'telemetry_count': len(self.telemetry_cache),
+            'link': self.framer.stats() if self.framer else None,
+            'mib_version': self.mib.version,
+            'mib_hash': self.mib.version_hash,
+            'mib_match': self.mib_match,
+            'reassembly': self.reassembler.stats() if self.reassembler else None,
+            'tc_latency': self.tc_latency.to_dict(),
+            'step_profile': self.step_profile,
         }
         return web.json_response(status)
     
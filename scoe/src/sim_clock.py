@@ -0,0 +1,121 @@
+"""
+Simulation Clock
+Mission time source for the mock AOCS server
+
+The simulation loop advances the clock by one step at a time and then
+calls pace(), which holds simulated time to wall time (REALTIME), to a
+multiple of it (ACCELERATED) or only yields to the event loop (AFAP, as
+fast as possible). Everything else in the server reads time from the
+clock: HK reports are scheduled with clock.sleep() in simulated seconds
+and TM time stamps carry the simulated mission time, so a scenario
+produces the same telemetry in every mode, only faster. A consumer that
+must not fall behind (the HK sender waiting for slow clients) can hold
+simulated time with hold().
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+from enum import Enum
+from typing import Callable, Iterator, List, Optional, Tuple
+
+
+class ClockMode(Enum):
+    REALTIME = 'realtime'
+    ACCELERATED = 'accelerated'
+    AFAP = 'afap'
+
+
+class SimulationClock:
+    """Simulated mission time with real-time, accelerated or free-running pacing"""
+
+    # Fall-behind (wall seconds) after which pacing restarts from now
+    # instead of catching up in a burst
+    MAX_LAG = 1.0
+
+    # Deadlines within this many seconds count as reached (step rounding)
+    RESOLUTION = 1e-9
+
+    def __init__(self, mode: ClockMode = ClockMode.REALTIME, rate: float = 1.0,
+                 epoch: Optional[float] = None,
+                 wall: Callable[[], float] = time.monotonic):
+        if mode == ClockMode.ACCELERATED and rate <= 0:
+            raise ValueError("Accelerated clock needs a positive rate")
+        self.mode = mode
+        self.rate = {ClockMode.REALTIME: 1.0, ClockMode.AFAP: float('inf')}.get(mode, rate)
+        self.epoch = time.time() if epoch is None else epoch  # mission time at start (s)
+        self.elapsed = 0.0  # simulated seconds since start
+
+        self._wall = wall
+        self._wall_start: Optional[float] = None
+        self._paced_from = 0.0  # simulated time at _wall_start
+
+        # Sleepers as (deadline, order, future)
+        self._timers: List[Tuple[float, int, asyncio.Future]] = []
+        self._order = itertools.count()
+
+        # Consumers holding simulated time (see hold())
+        self._holds = 0
+        self._released = asyncio.Event()
+        self._released.set()
+
+    @property
+    def paced(self) -> bool:
+        """Whether simulated time is held to wall time"""
+        return self.mode != ClockMode.AFAP
+
+    def now(self) -> float:
+        """Simulated seconds since start"""
+        return self.elapsed
+
+    def mission_time(self) -> float:
+        """Simulated mission time (seconds since the Unix epoch)"""
+        return self.epoch + self.elapsed
+
+    def advance(self, dt: float):
+        """Advance simulated time and wake the sleepers that are due"""
+        self.elapsed += dt
+        timers = self._timers
+        while timers and timers[0][0] <= self.elapsed + self.RESOLUTION:
+            _, _, future = heapq.heappop(timers)
+            if not future.done():
+                future.set_result(None)
+
+    async def sleep(self, seconds: float):
+        """Sleep for simulated seconds"""
+        await self.sleep_until(self.elapsed + seconds)
+
+    async def sleep_until(self, deadline: float):
+        """Sleep until simulated time reaches deadline (seconds since start)"""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._timers, (deadline, next(self._order), future))
+        await future
+
+    @contextlib.contextmanager
+    def hold(self) -> Iterator[None]:
+        """Keep simulated time from advancing while a consumer catches up"""
+        self._holds += 1
+        self._released.clear()
+        try:
+            yield
+        finally:
+            self._holds -= 1
+            if not self._holds:
+                self._released.set()
+
+    async def pace(self):
+        """Wait until wall time catches up with simulated time (always yields)"""
+        await self._released.wait()
+        if not self.paced:
+            await asyncio.sleep(0)
+            return
+        now = self._wall()
+        if self._wall_start is None:
+            self._wall_start, self._paced_from = now, self.elapsed
+        delay = self._wall_start + (self.elapsed - self._paced_from) / self.rate - now
+        if delay < -self.MAX_LAG:
+            self._wall_start, self._paced_from = now, self.elapsed
+            delay = 0.0
+        await asyncio.sleep(max(0.0, delay))
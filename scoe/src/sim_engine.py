@@ -0,0 +1,433 @@
+"""
+Vectorized AOCS Simulation Engine
+NumPy state-vector implementation of AOCSSimulation.step
+
+The object engine (AOCSSimulation.step) updates one equipment dataclass
+at a time and allocates new Vector3/Quaternion instances for every
+intermediate result. VectorEngine loads the simulation state into
+preallocated NumPy arrays, advances it with vectorized math and writes
+the result back to the equipment objects, so commands, MIB setters and
+get_all_telemetry work unchanged.
+
+Commands are constant within one advance() call, which lets the engine
+process a whole batch of steps at once:
+- noise for all steps is taken as one block from each model's noise
+  stream (sensor_noise.NoiseStream), the values the object engine would
+  draw one at a time
+- wheel speeds, body rates, gyro bias random walk and time are
+  cumulative sums (identical to the sequential updates)
+- the quaternion is propagated by a pairwise product of the per-step
+  first-order transition matrices and normalized once per batch
+- temperatures use the closed form of their first-order lag
+- sensor outputs are only computed for the last step of a batch (the
+  earlier ones are overwritten within the call anyway)
+
+Both engines therefore produce the same telemetry for the same seed (to
+floating point rounding).
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from sensor_noise import NoiseStream
+
+# Equipment enums are plain ints here to avoid importing aocs_simulation
+_ON = 1
+_OPERATE = 1
+_MAG_OPERATIONAL = 2
+_G0 = 9.81
+
+
+def _chain(matrices: np.ndarray) -> np.ndarray:
+    """Product M[n-1] @ ... @ M[1] @ M[0] by pairwise reduction"""
+    while len(matrices) > 1:
+        odd = matrices[-1:] if len(matrices) % 2 else None
+        if odd is not None:
+            matrices = matrices[:-1]
+        matrices = matrices[1::2] @ matrices[0::2]
+        if odd is not None:
+            matrices = np.concatenate([matrices, odd])
+    return matrices[0]
+
+
+class VectorEngine:
+    """Batched NumPy engine for one AOCSSimulation"""
+
+    # Steps per vectorized batch (bounds the work buffers)
+    MAX_BATCH = 1024
+
+    def __init__(self, sim):
+        self.sim = sim
+
+        nw = len(sim.reaction_wheels)
+        nt = len(sim.thrusters)
+        nr = len(sim.torque_rods)
+
+        # Spacecraft state
+        self.q = np.zeros(4)
+        self.rate = np.zeros(3)  # rad/s
+        self.inertia = np.zeros(3)
+        self.mag_field = np.zeros(3)
+
+        # Reaction wheels
+        self.rw_speed = np.zeros(nw)
+        self.rw_cmd = np.zeros(nw)
+        self.rw_inertia = np.zeros(nw)
+        self.rw_max_speed = np.zeros(nw)
+        self.rw_max_torque = np.zeros(nw)
+        self.rw_noise = np.zeros(nw)
+        self.rw_temp = np.zeros(nw)
+        self.rw_current = np.zeros(nw)
+        self.rw_voltage = np.zeros(nw)
+        self.rw_coast_friction = np.zeros(nw)
+        self.rw_drag = np.zeros(nw)
+
+        # Thrusters
+        self.thr_temp = np.zeros(nt)
+        self.thr_flow = np.zeros(nt)
+        self.thr_nominal = np.zeros(nt)
+        self.thr_error = np.zeros(nt)
+        self.thr_isp = np.zeros(nt)
+
+        # Torque rods (body torque is constant within a batch)
+        self.rod_torque = np.zeros(3)
+
+        # Sensors
+        self.mag_meas = np.zeros(3)
+        self.mag_base = np.zeros(3)  # field * scale + bias
+        self.gyro_bias = np.zeros(3)
+        self.gyro_drift = np.zeros(3)  # current (random walk) bias
+        self.gyro_meas = np.zeros(3)
+        self.ss_detected = np.zeros(0, dtype=np.intp)  # heads seeing the sun
+
+        # SADAs
+        self.sada_angle = [0.0] * len(sim.sadas)
+
+    def advance(self, steps: int):
+        """Advance the simulation by `steps` steps"""
+        if steps <= 0:
+            return
+        self._load()
+        while steps > 0:
+            batch = min(steps, self.MAX_BATCH)
+            self._advance(batch)
+            steps -= batch
+        self._store()
+
+    def _load(self):
+        """Load state and (constant) commands from the simulation objects"""
+        sim = self.sim
+        st = sim.state
+        dt = sim.dt
+        q = st.quaternion
+        self.q[:] = (q.w, q.x, q.y, q.z)
+        r = st.angular_rate
+        self.rate[:] = (r.x, r.y, r.z)
+        self.inertia[:] = (st.inertia.x, st.inertia.y, st.inertia.z)
+        field = st.magnetic_field_eci
+        self.mag_field[:] = (field.x, field.y, field.z)
+        self.time = sim.time
+
+        # Reaction wheels: operating, friction spin-down or idle
+        wheels = sim.reaction_wheels
+        self.rw_speed[:] = [w.speed for w in wheels]
+        self.rw_cmd[:] = [w.commanded_torque for w in wheels]
+        self.rw_inertia[:] = [w.inertia for w in wheels]
+        self.rw_max_speed[:] = [w.max_speed for w in wheels]
+        self.rw_max_torque[:] = [w.max_torque for w in wheels]
+        self.rw_noise[:] = [w.torque_noise_std for w in wheels]
+        self.rw_temp[:] = [w.temperature for w in wheels]
+        self.rw_current[:] = [w.current for w in wheels]
+        self.rw_voltage[:] = [w.voltage for w in wheels]
+        self.rw_coast_friction[:] = [w.friction for w in wheels]
+        self.rw_drag[:] = [w.drag for w in wheels]
+        powered = [w.state == _ON and w.motor_enabled for w in wheels]
+        self.rw_active = [i for i, w in enumerate(wheels) if powered[i] and w.mode == _OPERATE]
+        self.rw_friction = [i for i in range(len(wheels)) if not powered[i]]
+
+        # Constant body torque from wheels (mounting matrix, as the object engine)
+        actuators = sim.actuators
+        self.rw_torque = actuators.wheels @ [w.get_reaction_torque() for w in wheels]
+
+        # Thrusters: switched-off thrusters stop firing, stuck-open ones fire
+        thrusters = sim.thrusters
+        for t in thrusters:
+            if t.state != _ON:
+                t.firing = False
+            elif t.stuck_open:
+                t.firing = True
+        self.thr_temp[:] = [t.temperature for t in thrusters]
+        self.thr_flow[:] = [t.propellant_flow for t in thrusters]
+        self.thr_nominal[:] = [t.thrust_nominal for t in thrusters]
+        self.thr_error[:] = [t.thrust_error for t in thrusters]
+        self.thr_isp[:] = [t.isp for t in thrusters]
+        self.thr_torque = actuators.thrusters.T  # body torque per N, per thruster
+        self.thr_on = [i for i, t in enumerate(thrusters) if t.state == _ON]
+        self.thr_firing = [i for i in self.thr_on if thrusters[i].firing]
+
+        # Torque rods: T = (rods @ dipoles) x B
+        self.rod_torque[:] = actuators.rod_torque([rod.get_actual_dipole() for rod in sim.torque_rods],
+                                                  (field.x, field.y, field.z))
+
+        # Magnetometer
+        mag = sim.magnetometer
+        self.mag_active = mag.state == _ON and mag.op_mode == _MAG_OPERATIONAL
+        self.mag_base[:] = (field.x * mag.scale_factor.x + mag.bias.x,
+                            field.y * mag.scale_factor.y + mag.bias.y,
+                            field.z * mag.scale_factor.z + mag.bias.z)
+        self.mag_noise = mag.noise_std
+
+        # Rate sensor
+        gyro = sim.rate_sensor
+        self.gyro_active = gyro.state == _ON
+        self.gyro_bias[:] = (gyro.bias.x, gyro.bias.y, gyro.bias.z)
+        self.gyro_drift[:] = (gyro.current_bias.x, gyro.current_bias.y, gyro.current_bias.z)
+        self.gyro_rrw = gyro.rrw * math.sqrt(dt) / 3600
+        self.gyro_arw = gyro.arw * math.sqrt(1 / dt) / 60
+        self.gyro_scale = 1 + gyro.scale_factor_error
+        self.gyro_quant = gyro.quantization
+
+        # Sun sensors: which heads see the sun (and draw noise) is taken
+        # from the attitude at the start of the call; the outputs of the
+        # last step use the final attitude (SunSensorArray)
+        ss = sim.sun_sensor_array
+        s = st.sun_direction_eci
+        self.sun_eci = (s.x, s.y, s.z)
+        self.in_eclipse = st.in_eclipse
+        if self.in_eclipse:
+            self.ss_detected = np.zeros(0, dtype=np.intp)
+        else:
+            self.ss_detected = ss.detect(ss.sun_body(self.q.tolist(), self.sun_eci))[1]
+
+        # SADAs moving towards their commanded angle
+        self.sada_angle = [sada.angle for sada in sim.sadas]
+        self.sada_active = [i for i, sada in enumerate(sim.sadas) if sada.state == _ON and sada.deployed]
+
+        # Noise streams and values per step, in column order
+        self.noise_sources: List[Tuple[NoiseStream, int]] = (
+            [(wheels[i].noise, 1) for i in self.rw_active] +
+            [(thrusters[i].noise, 2) for i in self.thr_firing] +
+            [(mag.noise, 3)] * self.mag_active +
+            [(gyro.noise, 6)] * self.gyro_active +
+            [(ss.noise, 3 * len(self.ss_detected))] * bool(len(self.ss_detected)))
+
+        # Noise block layout (columns per step)
+        col = 0
+        self.col_rw = slice(col, col + len(self.rw_active))
+        col += len(self.rw_active)
+        self.col_thr = slice(col, col + 2 * len(self.thr_firing))
+        col += 2 * len(self.thr_firing)
+        self.col_mag = slice(col, col + 3 * self.mag_active)
+        col += 3 * self.mag_active
+        self.col_gyro = slice(col, col + 6 * self.gyro_active)
+        col += 6 * self.gyro_active
+        self.col_ss = slice(col, col + 3 * len(self.ss_detected))
+        col += 3 * len(self.ss_detected)
+        self.draws = col
+
+    def _advance(self, n: int):
+        """Advance n steps with constant commands"""
+        dt = self.sim.dt
+        z = self._noise(n)
+
+        self._advance_wheels(n, dt, z[:, self.col_rw])
+
+        # Body torque per step: wheels + firing thrusters + rods
+        torque = np.broadcast_to(self.rw_torque, (n, 3))
+        thr_z = z[:, self.col_thr]
+        if self.thr_firing:
+            firing = self.thr_firing
+            thrust = self.thr_nominal[firing] * (1 + self.thr_error[firing] * thr_z[:, 1::2])
+            torque = torque + thrust @ self.thr_torque[firing]
+        torque = torque + self.rod_torque
+
+        # Body rates: cumulative sum of alpha * dt
+        increments = np.empty((n + 1, 3))
+        increments[0] = self.rate
+        np.multiply(torque / self.inertia, dt, out=increments[1:])
+        rates = np.cumsum(increments, axis=0)[1:]
+        self.rate[:] = rates[-1]
+
+        # Quaternion: q_n ~ M_n ... M_1 q_0 with M_k = I + dt/2 * Omega(w_k)
+        h = rates * (0.5 * dt)
+        m = np.zeros((n, 4, 4))
+        m[:, 0, 0] = m[:, 1, 1] = m[:, 2, 2] = m[:, 3, 3] = 1.0
+        m[:, 1, 0] = m[:, 2, 3] = h[:, 0]
+        m[:, 0, 1] = m[:, 3, 2] = -h[:, 0]
+        m[:, 2, 0] = m[:, 3, 1] = h[:, 1]
+        m[:, 0, 2] = m[:, 1, 3] = -h[:, 1]
+        m[:, 3, 0] = m[:, 1, 2] = h[:, 2]
+        m[:, 0, 3] = m[:, 2, 1] = -h[:, 2]
+        q = _chain(m) @ self.q
+        norm = math.sqrt(q @ q)
+        if norm > 0:
+            self.q[:] = q / norm
+        else:
+            self.q[:] = (1.0, 0.0, 0.0, 0.0)
+
+        self._advance_thrusters(n, dt, thr_z[-1] if len(thr_z) else None)
+
+        # Magnetometer (last step)
+        if self.mag_active:
+            self.mag_meas[:] = self.mag_base + self.mag_noise * z[-1, self.col_mag]
+        else:
+            self.mag_meas[:] = 0.0
+
+        # Rate sensor: bias random walk over all steps, output of the last
+        if self.gyro_active:
+            gz = z[:, self.col_gyro]
+            walk = np.empty((n + 1, 3))
+            walk[0] = self.gyro_drift
+            np.multiply(gz[:, :3], self.gyro_rrw, out=walk[1:])
+            self.gyro_drift[:] = np.cumsum(walk, axis=0)[-1]
+            true_rate = self.rate * 180 / math.pi
+            meas = (true_rate * self.gyro_scale + self.gyro_bias + self.gyro_drift +
+                    gz[-1, 3:] * self.gyro_arw)
+            self.gyro_meas[:] = np.round(meas / self.gyro_quant) * self.gyro_quant
+        else:
+            self.gyro_meas[:] = 0.0
+
+        # Sun sensors (last step)
+        ss = self.sim.sun_sensor_array
+        if self.in_eclipse:
+            ss.outputs.fill(0.0)
+        else:
+            sun_body = ss.sun_body(self.q.tolist(), self.sun_eci)
+            cos_angle = ss.boresights @ sun_body
+            ss.measure(sun_body, cos_angle, self.ss_detected, z[-1, self.col_ss])
+
+        self._advance_sadas(n, dt)
+
+        t = self.time
+        for _ in range(n):
+            t += dt
+        self.time = t
+
+    def _noise(self, n: int) -> np.ndarray:
+        """(n, draws) block of standard normals from the models' streams"""
+        if not self.noise_sources:
+            return np.empty((n, 0))
+        return np.hstack([stream.normals(n * k).reshape(n, k) for stream, k in self.noise_sources])
+
+    def _advance_wheels(self, n: int, dt: float, z: np.ndarray):
+        """Wheel speeds, currents and temperatures"""
+        two_pi = 2 * math.pi
+        for k, i in enumerate(self.rw_active):
+            max_torque = self.rw_max_torque[i]
+            max_speed = self.rw_max_speed[i]
+            torque = np.clip(self.rw_cmd[i] + z[:, k] * self.rw_noise[i], -max_torque, max_torque)
+            increments = np.empty(n + 1)
+            increments[0] = self.rw_speed[i]
+            increments[1:] = torque / self.rw_inertia[i] * dt * 60 / two_pi
+            speeds = np.cumsum(increments)
+            drag = self.rw_drag[i]
+            if drag:
+                # Drag against the direction of rotation: sequential update
+                speed = float(self.rw_speed[i])
+                inertia = self.rw_inertia[i]
+                for t in torque.tolist():
+                    if speed:
+                        t -= math.copysign(drag, speed)
+                    speed = max(-max_speed, min(max_speed, speed + t / inertia * dt * 60 / two_pi))
+                self.rw_speed[i] = speed
+            elif np.abs(speeds).max() <= max_speed:
+                self.rw_speed[i] = speeds[-1]
+            else:
+                # Saturation: sequential update
+                speed = float(self.rw_speed[i])
+                for inc in increments[1:].tolist():
+                    speed = max(-max_speed, min(max_speed, speed + inc))
+                self.rw_speed[i] = speed
+
+            current = abs(self.rw_cmd[i]) * 5.0 + 0.1
+            self.rw_current[i] = current
+            power = current * self.rw_voltage[i]
+            self.rw_temp[i] = self._lag(self.rw_temp[i], 25.0, 0.01 * dt, power * 0.001 * dt, n)
+
+        for i in self.rw_friction:
+            speed = float(self.rw_speed[i])
+            if speed == 0:
+                continue
+            friction = self.rw_coast_friction[i]
+            step = (friction * math.copysign(1.0, speed) / self.rw_inertia[i]) * dt * 60 / two_pi
+            increments = np.full(n + 1, -step)
+            increments[0] = speed
+            speeds = np.cumsum(increments)[1:]
+            self.rw_speed[i] = 0.0 if (np.abs(speeds) < 1).any() else speeds[-1]
+
+    def _advance_thrusters(self, n: int, dt: float, last_z: Optional[np.ndarray]):
+        """Thruster flow and temperature"""
+        firing = set(self.thr_firing)
+        for k, i in enumerate(self.thr_firing):
+            thrust = self.thr_nominal[i] * (1 + self.thr_error[i] * last_z[2 * k])
+            self.thr_flow[i] = thrust / (self.thr_isp[i] * _G0) * 1000
+            self.thr_temp[i] += n * 0.5 * dt
+        for i in self.thr_on:
+            if i not in firing:
+                self.thr_flow[i] = 0.0
+                self.thr_temp[i] = self._lag(self.thr_temp[i], 25.0, 0.1 * dt, 0.0, n)
+        for i in range(len(self.thr_flow)):
+            if i not in self.thr_on:
+                self.thr_flow[i] = 0.0
+
+    def _advance_sadas(self, n: int, dt: float):
+        """SADA angles (sequential until the commanded angle is reached)"""
+        sadas = self.sim.sadas
+        for i in self.sada_active:
+            sada = sadas[i]
+            angle = self.sada_angle[i]
+            commanded = sada.commanded_angle
+            max_rate = sada.max_rate
+            for _ in range(n):
+                error = commanded - angle
+                rate = max(-max_rate, min(max_rate, error / dt if dt > 0 else 0))
+                new = angle + rate * dt
+                if new == angle:
+                    break
+                angle = new
+            self.sada_angle[i] = angle
+
+    @staticmethod
+    def _lag(value: float, ambient: float, decay: float, heat: float, n: int) -> float:
+        """n steps of x += heat - (x - ambient) * decay (closed form)"""
+        a = 1.0 - decay
+        if decay == 0:
+            return value + n * heat
+        steady = ambient + heat / decay
+        return steady + (value - steady) * a ** n
+
+    def _store(self):
+        """Write the state back to the simulation objects"""
+        sim = self.sim
+        st = sim.state
+        w, x, y, z = self.q.tolist()
+        q = st.quaternion
+        q.w, q.x, q.y, q.z = w, x, y, z
+        r = st.angular_rate
+        r.x, r.y, r.z = self.rate.tolist()
+        sim.time = self.time
+
+        for wheel, speed, temp, current in zip(sim.reaction_wheels, self.rw_speed.tolist(),
+                                               self.rw_temp.tolist(), self.rw_current.tolist()):
+            wheel.speed = speed
+            wheel.temperature = temp
+            wheel.current = current
+
+        for thr, temp, flow in zip(sim.thrusters, self.thr_temp.tolist(), self.thr_flow.tolist()):
+            thr.temperature = temp
+            thr.propellant_flow = flow
+
+        m = sim.magnetometer.measured_field
+        m.x, m.y, m.z = self.mag_meas.tolist()
+
+        gyro = sim.rate_sensor
+        if self.gyro_active:
+            b = gyro.current_bias
+            b.x, b.y, b.z = self.gyro_drift.tolist()
+        g = gyro.measured_rate
+        g.x, g.y, g.z = self.gyro_meas.tolist()
+
+        for sada, angle in zip(sim.sadas, self.sada_angle):
+            sada.angle = angle
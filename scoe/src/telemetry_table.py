@@ -0,0 +1,73 @@
+"""
+Telemetry Parameter Table
+Current telemetry values in fixed slots of one float64 array
+
+Every telemetry parameter gets a slot when it is added to the table.
+Producers write the array in place; consumers resolve their parameter
+names to slots once (index()) and read with fancy indexing, so an HK
+report costs one array gather instead of a dict of every parameter, and
+a snapshot of all telemetry is one array copy.
+
+Names that are not in the table resolve to a trailing slot that always
+reads zero, like the 0.0 default of a dict lookup.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Index of the always-zero slot (the last element, whatever the size)
+MISSING = -1
+
+
+class TelemetryTable:
+    """Named float64 slots for telemetry parameters"""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = []
+        self.slots: Dict[str, int] = {}
+        self.values = np.zeros(1)  # parameters plus the zero slot
+        self.add(names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.slots
+
+    def add(self, names: Iterable[str]) -> slice:
+        """Append parameters (zero-initialised) and return their slots"""
+        names = list(names)
+        seen = set(self.slots)
+        duplicates = [name for name in names if name in seen or seen.add(name)]
+        if duplicates:
+            raise ValueError(f"Duplicate telemetry parameters: {duplicates}")
+        start = len(self.names)
+        for name in names:
+            self.slots[name] = len(self.names)
+            self.names.append(name)
+        values = np.zeros(len(self.names) + 1)
+        values[:start] = self.values[:start]
+        self.values = values
+        return slice(start, len(self.names))
+
+    def slot(self, name: str) -> int:
+        """Slot of a parameter (MISSING if unknown)"""
+        return self.slots.get(name, MISSING)
+
+    def index(self, names: Sequence[str]) -> np.ndarray:
+        """Slots of parameters, for reading with read()"""
+        return np.array([self.slots.get(name, MISSING) for name in names], dtype=np.intp)
+
+    def read(self, index: np.ndarray) -> np.ndarray:
+        """Current values at the slots of an index()"""
+        return self.values[index]
+
+    def snapshot(self) -> np.ndarray:
+        """Copy of all parameter values, in slot order"""
+        return self.values[:-1].copy()
+
+    def as_dict(self, slots: Optional[slice] = None) -> Dict[str, float]:
+        """Name -> value mapping of all (or a range of) parameters"""
+        slots = slots or slice(0, len(self.names))
+        return dict(zip(self.names[slots], self.values[slots].tolist()))
@@ -0,0 +1,296 @@
+"""
+Batched TM Frame Writer
+Coalesces outgoing EDEN frames into one contiguous buffer per flush
+
+The mock AOCS server adds every TM frame due in a housekeeping tick to
+the batch and hands it to every client as a single item instead of one
+item per packet. A batch is flushed when it reaches the packet or byte
+limit, or when its oldest frame has waited max_latency seconds on the
+writer's clock (the server passes its simulated clock, so the limit
+holds in accelerated and as-fast-as-possible modes too).
+
+Each client connection has a ClientChannel with one bounded queue per
+priority class (verification, event/connection, housekeeping, bulk). Its
+sender task drains the queues highest priority first, coalescing up to
+max_bytes per write, so a housekeeping backlog never delays the
+verification reports a controller is waiting on. Queueing latency is
+recorded per class, and socket writes are counted per channel and,
+optionally, in totals shared by all channels of a server.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from latency import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Outbound traffic classes, highest priority first"""
+    VERIFICATION = 0  # TM[1,x]
+    EVENT = 1  # events, connection test
+    HOUSEKEEPING = 2  # TM[3,25]
+    BULK = 3  # segmented reports
+
+
+# Default per-class queue bounds (items)
+DEFAULT_QUEUE_LIMITS = {
+    Priority.VERIFICATION: 1024,
+    Priority.EVENT: 256,
+    Priority.HOUSEKEEPING: 64,
+    Priority.BULK: 64,
+}
+
+
+@dataclass
+class TMWriterStats:
+    """Write statistics (per client write, or per channel item for TMBatchWriter)"""
+    writes: int = 0
+    packets: int = 0
+    bytes: int = 0
+
+    # Rate window
+    window: float = 1.0  # seconds
+    window_start: float = field(default_factory=time.monotonic)
+    window_writes: int = 0
+    write_rate: float = 0.0
+
+    @property
+    def packets_per_write(self) -> float:
+        return self.packets / self.writes if self.writes else 0.0
+
+    def writes_per_second(self) -> float:
+        """Writes (send syscalls) per second over the last complete window"""
+        now = time.monotonic()
+        elapsed = now - self.window_start
+        if elapsed >= self.window:
+            self.write_rate = (self.writes - self.window_writes) / elapsed
+            self.window_start = now
+            self.window_writes = self.writes
+        return self.write_rate
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'writes': self.writes,
+            'packets': self.packets,
+            'bytes': self.bytes,
+            'packets_per_write': self.packets_per_write,
+            'writes_per_second': self.write_rate,
+        }
+
+
+class ClientChannel:
+    """
+    Prioritised outbound queues and sender task for one client
+    
+    put() never blocks: when a class queue is full its oldest item is
+    dropped (stale housekeeping is superseded by newer reports). put_wait()
+    waits for room instead, for traffic that must not be lost such as
+    segments of a bulk transfer. With priorities disabled every class
+    shares one FIFO queue (for comparison).
+    """
+    
+    def __init__(self, writer: asyncio.StreamWriter, max_bytes: int = 4096,
+                 queue_limits: Optional[Dict[Priority, int]] = None,
+                 histograms: Optional[Dict[Priority, LatencyHistogram]] = None,
+                 priorities: bool = True, totals: Optional[TMWriterStats] = None):
+        self.writer = writer
+        self.max_bytes = max_bytes
+        self.priorities = priorities
+        
+        limits = dict(DEFAULT_QUEUE_LIMITS, **(queue_limits or {}))
+        if priorities:
+            self._limits = [limits[p] for p in Priority]
+        else:
+            self._limits = [sum(limits.values())]
+        # Items are (frame, priority, packets, enqueue time)
+        self._queues: List[Deque[Tuple[bytes, Priority, int, float]]] = [deque() for _ in self._limits]
+        
+        self.latency = histograms if histograms is not None else {p: LatencyHistogram() for p in Priority}
+        self.dropped = {p: 0 for p in Priority}
+        self.stats = TMWriterStats()
+        self.totals = totals  # shared across channels, outlives this one
+        
+        self._wakeup = asyncio.Event()
+        self._room = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+        
+        # Keep the backlog in the priority queues rather than the transport
+        transport = writer.transport
+        if transport is not None:
+            transport.set_write_buffer_limits(high=max_bytes)
+    
+    def __len__(self) -> int:
+        """Number of queued items"""
+        return sum(len(q) for q in self._queues)
+    
+    def start(self):
+        """Start the sender task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def close(self):
+        """Stop the sender task and drop queued items"""
+        self.closed = True
+        self._wakeup.set()
+        self._room.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for q in self._queues:
+            q.clear()
+    
+    def put(self, frame: bytes, priority: Priority = Priority.EVENT, packets: int = 1) -> bool:
+        """Queue a frame (or batch of frames), dropping the oldest item of a full queue"""
+        if self.closed:
+            return False
+        index = priority if self.priorities else 0
+        queue = self._queues[index]
+        dropped = False
+        if len(queue) >= self._limits[index]:
+            old = queue.popleft()
+            self.dropped[old[1]] += 1
+            dropped = True
+        queue.append((frame, priority, packets, time.monotonic()))
+        self._wakeup.set()
+        return not dropped
+    
+    async def put_wait(self, frame: bytes, priority: Priority = Priority.BULK, packets: int = 1) -> bool:
+        """Queue a frame, waiting while its queue is full"""
+        index = priority if self.priorities else 0
+        while not self.closed and len(self._queues[index]) >= self._limits[index]:
+            self._room.clear()
+            await self._room.wait()
+        return self.put(frame, priority, packets)
+    
+    async def wait_below(self, items: int):
+        """Wait until fewer than items are queued (backpressure for a free-running producer)"""
+        while not self.closed and len(self) >= items:
+            self._room.clear()
+            await self._room.wait()
+    
+    def _take(self) -> Tuple[bytearray, List[Tuple[Priority, int, float]]]:
+        """Dequeue up to max_bytes, highest priority first"""
+        chunk = bytearray()
+        taken = []
+        for queue in self._queues:
+            while queue and (not chunk or len(chunk) + len(queue[0][0]) <= self.max_bytes):
+                frame, priority, packets, queued = queue.popleft()
+                chunk += frame
+                taken.append((priority, packets, queued))
+            if len(chunk) >= self.max_bytes:
+                break
+        return chunk, taken
+    
+    async def _run(self):
+        writer = self.writer
+        while not self.closed:
+            if not len(self):
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            
+            chunk, taken = self._take()
+            self._room.set()
+            try:
+                writer.write(bytes(chunk))
+            except Exception as e:
+                logger.error(f"Error sending to client: {e}")
+                self.closed = True
+                break
+            
+            now = time.monotonic()
+            latency = self.latency
+            count = 0
+            for priority, packets, queued in taken:
+                latency[priority].record(now - queued)
+                count += packets
+            for stats in (self.stats, self.totals):
+                if stats is not None:
+                    stats.writes += 1
+                    stats.packets += count
+                    stats.bytes += len(chunk)
+            
+            try:
+                await writer.drain()
+            except Exception as e:
+                logger.error(f"Error draining client: {e}")
+                self.closed = True
+                break
+
+
+class TMBatchWriter:
+    """Collects EDEN frames and hands them to all clients as one item"""
+
+    def __init__(self, max_packets: int = 64, max_bytes: int = 65536,
+                 max_latency: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self.max_packets = max_packets
+        self.max_bytes = max_bytes
+        self.max_latency = max_latency  # seconds of clock(), 0 = flush every tick
+        self.clock = clock
+
+        self._buffer = bytearray()
+        self._count = 0
+        self._oldest = 0.0
+
+        self.stats = TMWriterStats()
+
+    def __len__(self) -> int:
+        """Number of queued frames"""
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        return self._count >= self.max_packets or len(self._buffer) >= self.max_bytes
+
+    def add(self, frame: bytes):
+        """Queue an encoded frame"""
+        if not self._count:
+            self._oldest = self.clock()
+        self._buffer += frame
+        self._count += 1
+
+    def due(self) -> bool:
+        """Check whether the batch has to be written now"""
+        if not self._count:
+            return False
+        # Tolerance for the step-size rounding of a simulated clock
+        return self.full or self.clock() - self._oldest >= self.max_latency - 1e-6
+
+    def flush(self, channels: Iterable[ClientChannel]):
+        """
+        Queue the batched frames on every client channel as one item
+        
+        stats counts the items queued; the socket writes they end up in
+        are counted by the channels.
+        """
+        if not self._count:
+            return
+        
+        # Shared by all channels, so hand them an immutable copy
+        data = bytes(self._buffer)
+        count = self._count
+        self._buffer.clear()
+        self._count = 0
+        
+        for channel in channels:
+            channel.put(data, Priority.HOUSEKEEPING, count)
+            self.stats.writes += 1
+            self.stats.packets += count
+            self.stats.bytes += len(data)
+    
+    def flush_if_due(self, channels: Iterable[ClientChannel]):
+        """Flush when the size or latency limit has been reached"""
+        if self.due():
+            self.flush(channels)